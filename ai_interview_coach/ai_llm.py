@@ -1,10 +1,25 @@
 # ai_llm.py
+import asyncio
+import hashlib
+import json
+import logging
+import random
+import re
+import threading
+import time
+import weakref
+import httpx
 import requests
-from typing import List, Dict
+import urllib3
+from collections import OrderedDict
+from functools import lru_cache
+from requests.adapters import HTTPAdapter
+from typing import List, Dict, Iterator, AsyncIterator, Optional
 import os
 
 # Default model
 MODEL_NAME = os.getenv("MODEL_NAME", "llama3.2:3b")
+OLLAMA_URL = os.getenv("OLLAMA_URL", "http://127.0.0.1:11434")
 
 SYSTEM_PROMPT = """You are an AI Interview Coach.
 - Ask one interview question at a time.
@@ -15,30 +30,418 @@ SYSTEM_PROMPT = """You are an AI Interview Coach.
 - Stop after ~5–8 questions or when asked to stop.
 """
 
+logger = logging.getLogger(__name__)
+
+
+# --------------------------
+# LLM client
+# --------------------------
+class LLMDeadlineExceeded(requests.exceptions.Timeout):
+    """The call ran past its LLM_REQUEST_DEADLINE budget."""
+
+
+def _setting(name, default):
+    """Read an LLM_* value from Django settings, falling back when run standalone."""
+    try:
+        from django.conf import settings
+        return getattr(settings, name, default)
+    except Exception:
+        return default
+
+
+class _LLMClientBase:
+    """
+    Timeout/retry policy shared by the sync and async clients.
+    Anything not passed in comes from the LLM_* settings.
+    """
+
+    def __init__(self, base_url: Optional[str] = None, connect_timeout: Optional[float] = None,
+                 read_timeout: Optional[float] = None, max_retries: Optional[int] = None,
+                 retry_backoff: Optional[float] = None, deadline: Optional[float] = None,
+                 pool_size: Optional[int] = None):
+        self.base_url = (base_url or OLLAMA_URL).rstrip("/")
+        self.connect_timeout = connect_timeout if connect_timeout is not None else _setting("LLM_CONNECT_TIMEOUT", 3.05)
+        self.read_timeout = read_timeout if read_timeout is not None else _setting("LLM_READ_TIMEOUT", 120)
+        self.max_retries = max_retries if max_retries is not None else _setting("LLM_MAX_RETRIES", 2)
+        self.retry_backoff = retry_backoff if retry_backoff is not None else _setting("LLM_RETRY_BACKOFF", 0.5)
+        self.deadline = deadline if deadline is not None else _setting("LLM_REQUEST_DEADLINE", 180)
+        self.pool_size = pool_size if pool_size is not None else _setting("LLM_MAX_CONNECTIONS", 512)
+
+    def _backoff_delay(self, attempt: int) -> float:
+        # "Full jitter": uniform over [0, base * 2^attempt]
+        return random.uniform(0, self.retry_backoff * (2 ** attempt))
+
+
+def _connect_failed(exc: requests.exceptions.ConnectionError) -> bool:
+    """
+    True when the request never reached the server, so it is safe to send
+    again. A connection dropped after sending (reset, closed without a
+    reply) may already have been processed; see _connection_dropped.
+    """
+    if isinstance(exc, requests.exceptions.ConnectTimeout):
+        return True
+    reason = getattr(exc.args[0] if exc.args else None, "reason", None)
+    return isinstance(reason, (urllib3.exceptions.NewConnectionError, urllib3.exceptions.ConnectTimeoutError))
+
+
+def _connection_dropped(exc: requests.exceptions.ConnectionError) -> bool:
+    """
+    True when the connection was reset or closed before any reply, which is
+    how a pooled keep-alive socket the server already closed fails. Only
+    non-streaming calls retry it: nothing of the reply has been read, and
+    generating it again has no side effects.
+    """
+    error = exc.args[0] if exc.args else None
+    if isinstance(error, urllib3.exceptions.ProtocolError) and len(error.args) > 1:
+        error = error.args[1]
+    # http.client.RemoteDisconnected is a ConnectionResetError
+    return isinstance(error, (ConnectionResetError, BrokenPipeError))
+
+
+class LLMClient(_LLMClientBase):
+    """
+    Reusable Ollama client: a keep-alive connection pool, separate connect and
+    read timeouts, bounded jittered retries when the connection can't be
+    opened (or, for non-streaming calls, is dropped before the reply), and a
+    hard per-call deadline.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def _post(self, path: str, payload: Dict, stream: bool):
+        deadline = time.monotonic() + self.deadline
+        attempt = 0
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise LLMDeadlineExceeded(f"LLM call exceeded its {self.deadline}s deadline")
+            try:
+                response = self.session.post(
+                    self.base_url + path,
+                    json=payload,
+                    stream=stream,
+                    timeout=(min(self.connect_timeout, remaining), min(self.read_timeout, remaining)),
+                )
+            except requests.exceptions.ConnectionError as e:
+                delay = self._backoff_delay(attempt)
+                retryable = _connect_failed(e) or (not stream and _connection_dropped(e))
+                if not retryable or attempt >= self.max_retries or time.monotonic() + delay >= deadline:
+                    raise
+                time.sleep(delay)
+                attempt += 1
+                continue
+
+            if not response.ok:
+                # A streamed response holds its connection until closed
+                response.close()
+            response.raise_for_status()
+            return response, deadline
+
+    def request_json(self, path: str, payload: Dict) -> Dict:
+        """POST a non-streaming request and return the decoded JSON body."""
+        response, _ = self._post(path, dict(payload, stream=False), stream=False)
+        return response.json()
+
+    def stream_json(self, path: str, payload: Dict) -> Iterator[Dict]:
+        """POST a streaming request and yield each NDJSON chunk."""
+        response, deadline = self._post(path, dict(payload, stream=True), stream=True)
+        with response:
+            lines = response.iter_lines()
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise LLMDeadlineExceeded(f"LLM stream exceeded its {self.deadline}s deadline")
+                # The read timeout was set when the call started; a read that
+                # blocks now must still end by the deadline
+                sock = getattr(response.raw.connection, "sock", None)
+                if sock is not None:
+                    sock.settimeout(min(self.read_timeout, remaining))
+                try:
+                    line = next(lines, None)
+                except requests.exceptions.ConnectionError as e:
+                    if time.monotonic() >= deadline:
+                        raise LLMDeadlineExceeded(f"LLM stream exceeded its {self.deadline}s deadline") from e
+                    raise
+                if line is None:
+                    return
+                if line:
+                    yield json.loads(line)
+
+
+class AsyncLLMClient(_LLMClientBase):
+    """Async counterpart of LLMClient on a pooled httpx.AsyncClient."""
+
+    # httpx errors raised before the server could have seen the whole request.
+    # Read errors and dropped connections may come after the call ran, so only
+    # non-streaming calls retry them (see _connection_dropped).
+    CONNECTION_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.WriteError)
+    DROPPED_ERRORS = (httpx.RemoteProtocolError, httpx.ReadError)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.http = httpx.AsyncClient(
+            base_url=self.base_url,
+            timeout=httpx.Timeout(self.read_timeout, connect=self.connect_timeout),
+            limits=httpx.Limits(max_connections=self.pool_size, max_keepalive_connections=self.pool_size),
+        )
+
+    @property
+    def is_closed(self) -> bool:
+        return self.http.is_closed
+
+    async def aclose(self):
+        await self.http.aclose()
+
+    async def _send(self, path: str, payload: Dict, stream: bool):
+        deadline = asyncio.get_running_loop().time() + self.deadline
+        attempt = 0
+        while True:
+            try:
+                async with asyncio.timeout_at(deadline):
+                    request = self.http.build_request("POST", path, json=payload)
+                    response = await self.http.send(request, stream=stream)
+            except TimeoutError:
+                raise LLMDeadlineExceeded(f"LLM call exceeded its {self.deadline}s deadline") from None
+            except self.CONNECTION_ERRORS + self.DROPPED_ERRORS as e:
+                delay = self._backoff_delay(attempt)
+                retryable = isinstance(e, self.CONNECTION_ERRORS) or not stream
+                if not retryable or attempt >= self.max_retries or asyncio.get_running_loop().time() + delay >= deadline:
+                    raise
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+
+            if response.is_error:
+                await response.aread()
+                await response.aclose()
+            response.raise_for_status()
+            return response, deadline
+
+    async def request_json(self, path: str, payload: Dict) -> Dict:
+        """POST a non-streaming request and return the decoded JSON body."""
+        response, _ = await self._send(path, dict(payload, stream=False), stream=False)
+        return response.json()
+
+    async def stream_json(self, path: str, payload: Dict) -> AsyncIterator[Dict]:
+        """POST a streaming request and yield each NDJSON chunk."""
+        response, deadline = await self._send(path, dict(payload, stream=True), stream=True)
+        lines = response.aiter_lines()
+        try:
+            while True:
+                try:
+                    async with asyncio.timeout_at(deadline):
+                        line = await anext(lines, None)
+                except TimeoutError:
+                    raise LLMDeadlineExceeded(f"LLM stream exceeded its {self.deadline}s deadline") from None
+                if line is None:
+                    return
+                if line:
+                    yield json.loads(line)
+        finally:
+            await response.aclose()
+
+
+_client: Optional[LLMClient] = None
+_client_lock = threading.Lock()
+
+# One client per event loop: an httpx.AsyncClient can't be shared across
+# loops, and under ASGI there is normally exactly one.
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncLLMClient]" = weakref.WeakKeyDictionary()
+
+
+def get_llm_client() -> LLMClient:
+    """Return the process-wide LLMClient."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = LLMClient()
+    return _client
+
+
+def get_async_client() -> AsyncLLMClient:
+    """Return the shared AsyncLLMClient for the running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None or client.is_closed:
+        client = AsyncLLMClient()
+        _async_clients[loop] = client
+    return client
+
+
+def _payload(**fields) -> Dict:
+    """
+    Request body for an Ollama call. keep_alive keeps the model (and its KV
+    cache) resident between turns instead of Ollama's 5 minute default.
+    """
+    return {"model": MODEL_NAME, "keep_alive": _setting("LLM_KEEP_ALIVE", "30m"), **fields}
+
+
+_DURATION_FIELDS = ("prompt_eval_duration", "eval_duration", "load_duration", "total_duration")
+
+
+def eval_metrics(data: Dict) -> Dict[str, float]:
+    """
+    Ollama's counters from a final response chunk: prompt_eval_count is the
+    number of prompt tokens actually evaluated, so it drops when the KV cache
+    prefix is reused. Durations are converted from ns to ms.
+    """
+    metrics = {key: data[key] for key in ("prompt_eval_count", "eval_count") if key in data}
+    for key in _DURATION_FIELDS:
+        if key in data:
+            metrics[key.replace("_duration", "_ms")] = round(data[key] / 1e6, 1)
+    if metrics:
+        logger.debug("ollama call: %s", metrics)
+    return metrics
+
+
+# --------------------------
+# Response cache
+# --------------------------
+class LLMResponseCache:
+    """
+    In-process LRU cache of chat replies with a TTL.
+
+    With variants > 1 lookups miss until that many replies have been stored
+    for the key (so fresh replies get generated and added), then serve a
+    random one of the distinct replies, so cached questions don't always
+    repeat. A model that answers the same every time fills the entry too.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl: float = 3600, variants: int = 1):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.variants = max(1, variants)
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, list]" = OrderedDict()  # key -> [created_at, [replies], puts]
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(model: str, system_prompt: str, history: List[Dict[str, str]], user_msg: str) -> str:
+        history_digest = hashlib.sha256(
+            json.dumps(history, sort_keys=True, ensure_ascii=False).encode("utf-8")
+        ).hexdigest()
+        raw = "\x1f".join([model, system_prompt, history_digest, user_msg])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[0] > self.ttl:
+                del self._entries[key]
+                entry = None
+            if entry is None or entry[2] < self.variants:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return random.choice(entry[1])
+
+    def put(self, key: str, reply: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.monotonic() - entry[0] > self.ttl:
+                entry = [time.monotonic(), [], 0]
+                self._entries[key] = entry
+            if reply not in entry[1] and len(entry[1]) < self.variants:
+                entry[1].append(reply)
+            entry[2] += 1
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": len(self._entries),
+            }
+
+
+_response_cache: Optional[LLMResponseCache] = None
+
+
+def get_response_cache() -> LLMResponseCache:
+    """Return the process-wide response cache, sized from the LLM_CACHE_* settings."""
+    global _response_cache
+    if _response_cache is None:
+        with _client_lock:
+            if _response_cache is None:
+                _response_cache = LLMResponseCache(
+                    max_entries=_setting("LLM_CACHE_MAX_ENTRIES", 1024),
+                    ttl=_setting("LLM_CACHE_TTL", 3600),
+                    variants=_setting("LLM_CACHE_VARIANTS", 1),
+                )
+    return _response_cache
+
+
+def _cache_key(messages: List[Dict[str, str]]) -> Optional[str]:
+    """Cache key for a chat turn, or None when the turn shouldn't be cached."""
+    history = messages[1:-1]
+    if not _setting("LLM_CACHE_ENABLED", True) or len(history) > _setting("LLM_CACHE_MAX_HISTORY", 0):
+        return None
+    return LLMResponseCache.make_key(MODEL_NAME, messages[0]["content"], history, messages[-1]["content"])
+
+
+# --------------------------
+# Chat
+# --------------------------
+@lru_cache(maxsize=256)
+def system_prompt(field: str = "General", difficulty: str = "Any", tag: str = "") -> str:
+    """
+    The system prompt for (field, difficulty, tag). It must stay byte-identical
+    across the turns of a session so Ollama can reuse the KV cache for it.
+    """
+    return SYSTEM_PROMPT.format(field=field, difficulty=difficulty, tag=tag)
+
+
+def _build_messages(history: List[Dict[str, str]], user_msg: str,
+                    field: str, difficulty: str, tag: str) -> List[Dict[str, str]]:
+    field = (field or "").strip() or "General"
+    difficulty = (difficulty or "").strip() or "Any"
+    sys_msg = {"role": "system", "content": system_prompt(field, difficulty, (tag or "").strip())}
+    return [sys_msg] + history + [{"role": "user", "content": user_msg}]
+
+
 def chat_with_model(history: List[Dict[str, str]], user_msg: str,
-                   field: str = "General", difficulty: str = "Any", tag: str = "") -> str:
+                   field: str = "General", difficulty: str = "Any", tag: str = "",
+                   metrics: Optional[Dict] = None) -> str:
     """
     Interactive chat mode with AI coach.
     The AI will ask questions according to the selected difficulty: easy, medium, hard.
+    If a `metrics` dict is passed it is filled with the call's eval_metrics.
     """
-    sys_msg = {
-        "role": "system",
-        "content": SYSTEM_PROMPT.format(field=field, difficulty=difficulty, tag=tag)
-    }
-
-    messages = [sys_msg] + history + [{"role": "user", "content": user_msg}]
+    messages = _build_messages(history, user_msg, field, difficulty, tag)
+    cache_key = _cache_key(messages)
+    if cache_key and (cached := get_response_cache().get(cache_key)) is not None:
+        if metrics is not None:
+            metrics["cached"] = True
+        return cached
 
     try:
-        response = requests.post(
-            "http://127.0.0.1:11434/api/chat",
-            json={"model": MODEL_NAME, "messages": messages, "stream": False},
-            timeout=600
-        )
-        response.raise_for_status()
-        data = response.json()
+        data = get_llm_client().request_json("/api/chat", _payload(messages=messages))
 
         if "message" in data and "content" in data["message"]:
-            return data["message"]["content"].strip()
+            reply = data["message"]["content"].strip()
+            if metrics is not None:
+                metrics.update(eval_metrics(data))
+            if cache_key:
+                get_response_cache().put(cache_key, reply)
+            return reply
         else:
             return f"Coach: Unexpected response format: {data}"
 
@@ -46,13 +449,142 @@ def chat_with_model(history: List[Dict[str, str]], user_msg: str,
         return f"Coach: Error contacting AI coach: {e}"
 
 
+def stream_chat_with_model(history: List[Dict[str, str]], user_msg: str,
+                           field: str = "General", difficulty: str = "Any", tag: str = "",
+                           metrics: Optional[Dict] = None) -> Iterator[str]:
+    """
+    Streaming variant of chat_with_model.
+    Yields the reply piece by piece as Ollama emits its NDJSON chunks.
+    """
+    messages = _build_messages(history, user_msg, field, difficulty, tag)
+    cache_key = _cache_key(messages)
+    if cache_key and (cached := get_response_cache().get(cache_key)) is not None:
+        if metrics is not None:
+            metrics["cached"] = True
+        yield cached
+        return
+
+    try:
+        parts = []
+        for chunk in get_llm_client().stream_json("/api/chat", _payload(messages=messages)):
+            if "error" in chunk:
+                yield f"Coach: Error from AI coach: {chunk['error']}"
+                return
+            token = chunk.get("message", {}).get("content", "")
+            if token:
+                parts.append(token)
+                yield token
+            if chunk.get("done"):
+                if metrics is not None:
+                    metrics.update(eval_metrics(chunk))
+                if cache_key:
+                    get_response_cache().put(cache_key, "".join(parts).strip())
+                return
+
+    except (requests.exceptions.RequestException, ValueError) as e:
+        yield f"Coach: Error contacting AI coach: {e}"
+
+
+async def achat_with_model(history: List[Dict[str, str]], user_msg: str,
+                           field: str = "General", difficulty: str = "Any", tag: str = "",
+                           metrics: Optional[Dict] = None) -> str:
+    """Async variant of chat_with_model; awaits the reply without holding a thread."""
+    messages = _build_messages(history, user_msg, field, difficulty, tag)
+    cache_key = _cache_key(messages)
+    if cache_key and (cached := get_response_cache().get(cache_key)) is not None:
+        if metrics is not None:
+            metrics["cached"] = True
+        return cached
+
+    try:
+        data = await get_async_client().request_json("/api/chat", _payload(messages=messages))
+
+        if "message" in data and "content" in data["message"]:
+            reply = data["message"]["content"].strip()
+            if metrics is not None:
+                metrics.update(eval_metrics(data))
+            if cache_key:
+                get_response_cache().put(cache_key, reply)
+            return reply
+        else:
+            return f"Coach: Unexpected response format: {data}"
+
+    except (httpx.HTTPError, LLMDeadlineExceeded) as e:
+        return f"Coach: Error contacting AI coach: {e}"
+
+
+async def astream_chat_with_model(history: List[Dict[str, str]], user_msg: str,
+                                  field: str = "General", difficulty: str = "Any",
+                                  tag: str = "", metrics: Optional[Dict] = None) -> AsyncIterator[str]:
+    """Async variant of stream_chat_with_model."""
+    messages = _build_messages(history, user_msg, field, difficulty, tag)
+    cache_key = _cache_key(messages)
+    if cache_key and (cached := get_response_cache().get(cache_key)) is not None:
+        if metrics is not None:
+            metrics["cached"] = True
+        yield cached
+        return
 
+    try:
+        parts = []
+        async for chunk in get_async_client().stream_json("/api/chat", _payload(messages=messages)):
+            if "error" in chunk:
+                yield f"Coach: Error from AI coach: {chunk['error']}"
+                return
+            token = chunk.get("message", {}).get("content", "")
+            if token:
+                parts.append(token)
+                yield token
+            if chunk.get("done"):
+                if metrics is not None:
+                    metrics.update(eval_metrics(chunk))
+                if cache_key:
+                    get_response_cache().put(cache_key, "".join(parts).strip())
+                return
+
+    except (httpx.HTTPError, LLMDeadlineExceeded, ValueError) as e:
+        yield f"Coach: Error contacting AI coach: {e}"
+
+
+# --------------------------
+# Generate with carried context
+# --------------------------
+def generate_with_context(prompt: str, context: Optional[List[int]] = None, system: str = "",
+                          options: Optional[Dict] = None) -> Dict:
+    """
+    One /api/generate call that continues from an earlier call's `context`
+    (the token state Ollama returns), so only `prompt` itself is evaluated.
+    Returns {"response", "context", "metrics"}; on failure the response is
+    "" and the context passed in is handed back unchanged.
+    """
+    payload = _payload(prompt=prompt)
+    if context:
+        payload["context"] = context
+    if system:
+        payload["system"] = system
+    if options:
+        payload["options"] = options
+
+    try:
+        data = get_llm_client().request_json("/api/generate", payload)
+    except requests.exceptions.RequestException:
+        return {"response": "", "context": context or [], "metrics": {}}
+
+    return {
+        "response": data.get("response", "").strip(),
+        "context": data.get("context") or context or [],
+        "metrics": eval_metrics(data),
+    }
+
+
+# --------------------------
+# Resume questions
+# --------------------------
 # 🚀 New function for structured questions (resume-based)
 def generate_resume_questions(summary: str, field: str = "General") -> Dict[str, List[str]]:
     """
     Generate HR, Technical, and Project-specific questions from a resume summary.
     """
-
     prompt = f"""
 You are an AI interview coach.
 The candidate's field is **{field}**.
@@ -76,16 +608,8 @@ Return the output in **JSON format** like this:
     """
 
     try:
-        response = requests.post(
-            "http://127.0.0.1:11434/api/generate",
-            json={"model": MODEL_NAME, "prompt": prompt, "stream": False},
-            timeout=600
-        )
-        response.raise_for_status()
-        data = response.json()
-
+        data = get_llm_client().request_json("/api/generate", _payload(prompt=prompt))
         if "response" in data:
-            import json
             try:
                 return json.loads(data["response"])
             except Exception:
@@ -96,3 +620,192 @@ Return the output in **JSON format** like this:
 
     except requests.exceptions.RequestException as e:
         return {"error": f"Error contacting AI coach: {e}"}
+
+
+# --------------------------
+# Question batches (mock interview / question pool)
+# --------------------------
+QUESTION_BATCH_PROMPT = """You are an expert interviewer.
+Write {count} distinct interview questions for a candidate in the field: {field}.
+Difficulty: {difficulty}. Focus tag/keyword: {tag}.
+Each question must be a single concise sentence and must not repeat another.
+
+Return JSON only, in this shape:
+{{"questions": ["q1", "q2", ...]}}
+"""
+
+
+def question_batch_schema(count: int) -> Dict:
+    """JSON schema for Ollama structured output: {"questions": [count strings]}."""
+    return {
+        "type": "object",
+        "properties": {
+            "questions": {
+                "type": "array",
+                "items": {"type": "string"},
+                "minItems": count,
+                "maxItems": count,
+            },
+        },
+        "required": ["questions"],
+    }
+
+
+def _question_fingerprint(text: str) -> str:
+    return " ".join(re.findall(r"[a-z0-9]+", text.lower()))
+
+
+def clean_questions(questions, count: Optional[int] = None) -> List[str]:
+    """Keep non-empty string questions, drop near-duplicates, cap at `count`."""
+    seen = set()
+    cleaned = []
+    for q in questions:
+        if not isinstance(q, str) or not q.strip():
+            continue
+        fingerprint = _question_fingerprint(q)
+        if fingerprint in seen:
+            continue
+        seen.add(fingerprint)
+        cleaned.append(q.strip())
+        if count is not None and len(cleaned) >= count:
+            break
+    return cleaned
+
+
+class JSONStringArrayScanner:
+    """
+    Incremental parser for streamed text like {"questions": ["a", "b", ...]}.
+    feed() returns the array's string elements completed by the new text.
+    """
+
+    def __init__(self, key: str = "questions"):
+        self.key = f'"{key}"'
+        self.buffer = ""
+        self.pos = None  # index just inside the array once found
+        self.closed = False
+
+    def feed(self, text: str) -> List[str]:
+        self.buffer += text
+        items = []
+        if self.pos is None:
+            key_at = self.buffer.find(self.key)
+            if key_at < 0:
+                return items
+            bracket = self.buffer.find("[", key_at + len(self.key))
+            if bracket < 0:
+                return items
+            self.pos = bracket + 1
+
+        while not self.closed:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in " \t\r\n,":
+                self.pos += 1
+            if self.pos >= len(self.buffer):
+                break
+            ch = self.buffer[self.pos]
+            if ch == "]":
+                self.closed = True
+                break
+            if ch != '"':
+                # not a string element; the schema doesn't allow it, so stop
+                self.closed = True
+                break
+            end = self.pos + 1
+            while end < len(self.buffer):
+                if self.buffer[end] == "\\":
+                    end += 2
+                    continue
+                if self.buffer[end] == '"':
+                    break
+                end += 1
+            if end >= len(self.buffer):
+                break  # string not complete yet
+            items.append(json.loads(self.buffer[self.pos:end + 1]))
+            self.pos = end + 1
+        return items
+
+
+def generate_question_batch(field: str = "General", difficulty: str = "Any", tag: str = "",
+                            count: int = 5) -> List[str]:
+    """
+    Generate `count` interview questions in a single structured-output call.
+    The result is validated and de-duplicated, so it may hold fewer than
+    `count`; it is empty if the model can't be reached or returns bad JSON.
+    """
+    prompt = QUESTION_BATCH_PROMPT.format(count=count, field=field, difficulty=difficulty, tag=tag or "none")
+
+    try:
+        data = get_llm_client().request_json(
+            "/api/generate",
+            _payload(prompt=prompt, format=question_batch_schema(count)),
+        )
+        questions = json.loads(data.get("response", "")).get("questions", [])
+    except (requests.exceptions.RequestException, ValueError, AttributeError):
+        return []
+
+    return clean_questions(questions if isinstance(questions, list) else [], count)
+
+
+def stream_question_batch(field: str = "General", difficulty: str = "Any", tag: str = "",
+                          count: int = 5) -> Iterator[str]:
+    """
+    Streaming variant of generate_question_batch: yields each question as
+    soon as its array element is complete in the model output.
+    """
+    prompt = QUESTION_BATCH_PROMPT.format(count=count, field=field, difficulty=difficulty, tag=tag or "none")
+    scanner = JSONStringArrayScanner("questions")
+    seen = set()
+
+    try:
+        for chunk in get_llm_client().stream_json(
+            "/api/generate",
+            _payload(prompt=prompt, format=question_batch_schema(count)),
+        ):
+            for question in clean_questions(scanner.feed(chunk.get("response", ""))):
+                fingerprint = _question_fingerprint(question)
+                if fingerprint in seen:
+                    continue
+                seen.add(fingerprint)
+                yield question
+                if len(seen) >= count:
+                    return
+            if chunk.get("done") or scanner.closed:
+                return
+    except (requests.exceptions.RequestException, ValueError):
+        return
+
+
+# --------------------------
+# Conversation summary (rolling memory)
+# --------------------------
+SUMMARY_PROMPT = """You maintain a running summary of a mock job interview between an AI coach and a candidate.
+Update the summary with the new exchanges below. Keep the questions asked, the key points and
+quality of the candidate's answers, and the feedback given. Be factual and compact: at most
+{max_words} words, plain prose, no preamble.
+
+Current summary:
+{summary}
+
+New exchanges:
+{turns}
+
+Updated summary:"""
+
+
+def summarize_conversation(summary: str, turns: List[Dict[str, str]], max_tokens: int = 250) -> str:
+    """
+    Fold `turns` into the running `summary`. Returns the new summary, or ""
+    if the model couldn't be reached (callers then keep the old one).
+    """
+    transcript = "\n".join(
+        f"{'Candidate' if t['role'] == 'user' else 'Coach'}: {t['content']}" for t in turns
+    )
+    prompt = SUMMARY_PROMPT.format(max_words=int(max_tokens * 0.75), summary=summary or "(none yet)", turns=transcript)
+
+    try:
+        data = get_llm_client().request_json(
+            "/api/generate",
+            _payload(prompt=prompt, options={"num_predict": max_tokens}),
+        )
+        return data.get("response", "").strip()
+    except requests.exceptions.RequestException:
+        return ""
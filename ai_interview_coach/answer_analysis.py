@@ -0,0 +1,139 @@
+# ai_interview_coach/answer_analysis.py
+"""
+CPU-bound analysis of a candidate's answers (sentiment + spelling).
+
+Kept free of Django imports so it can run in the worker processes of
+core.analysis_pool; warm_up() is the pool initializer and loads the
+TextBlob sentiment lexicon and the spelling index once per process.
+
+Each answer is tokenized once, with the tokenizer TextBlob's sentiment
+uses, and the tokens feed both the lexicon sentiment and the spell
+checker. analyze_batch() also looks up each distinct token only once
+across all answers of a mock interview.
+"""
+from typing import Dict, List, Optional, Sequence
+
+from textblob.en import parser, sentiment
+
+from .spellcheck import get_spell_checker
+
+# What app.js submits when the mock interview timer runs out
+NO_ANSWER = "(No answer - timed out)"
+
+
+def warm_up():
+    sentiment("warm up")
+    get_spell_checker()
+
+
+def tokenize(answer: str) -> List[str]:
+    """The same tokens TextBlob(answer).sentiment scores."""
+    return " ".join(parser.find_tokens(answer or "")).split()
+
+
+def _polarity(tokens: List[str]) -> float:
+    return sentiment([t.lower() for t in tokens])[0]
+
+
+def _spelling_issues(tokens: List[str], verdicts: Dict[str, Optional[str]]) -> List[Dict[str, str]]:
+    return [{'word': t, 'suggestion': verdicts[t]} for t in tokens if verdicts.get(t)]
+
+
+def _spelling_verdicts(tokens) -> Dict[str, Optional[str]]:
+    """Suggestion (or None) for each distinct word token."""
+    checker = get_spell_checker()
+    verdicts = {}
+    for token in tokens:
+        if token not in verdicts and token.isalpha():
+            suggestion = checker.check_token(token)
+            verdicts[token] = suggestion if suggestion != token.lower() else None
+    return verdicts
+
+
+def _sentiment_feedback(polarity: float) -> str:
+    if polarity > 0.2:
+        return 'Your answer sounds positive.'
+    elif polarity < -0.2:
+        return 'Your answer sounds negative. Try to be more positive.'
+    return 'Your answer is neutral.'
+
+
+def _result(polarity: float, spelling: List[Dict[str, str]], reduced: bool = False) -> Dict:
+    if reduced:
+        spelling_feedback = 'Spelling check skipped while the server is busy.'
+    elif spelling:
+        spelling_feedback = 'Possible grammar/spelling issues detected.'
+    else:
+        spelling_feedback = 'No major grammar issues detected.'
+    return {
+        'feedback': _sentiment_feedback(polarity) + ' ' + spelling_feedback,
+        'sentiment': round(polarity, 3),
+        'spelling': spelling,
+        'reduced': reduced,
+    }
+
+
+def analyze(answer: str) -> Dict:
+    """Full check: sentiment and flagged spelling issues."""
+    tokens = tokenize(answer)
+    return _result(_polarity(tokens), _spelling_issues(tokens, _spelling_verdicts(tokens)))
+
+
+def reduced_analysis(answer: str) -> Dict:
+    """Sentiment only; used in-process when the analysis pool is busy or slow."""
+    return _result(_polarity(tokenize(answer)), [], reduced=True)
+
+
+def answer_score(words: int, spelling_errors: int, polarity: float) -> float:
+    """
+    0-10 heuristic: half for substance (full marks from 50 words), 30% for
+    spelling (zero at 5 errors per 100 words), 20% for tone.
+    """
+    if not words:
+        return 0.0
+    length = min(1.0, words / 50)
+    spelling = 1.0 - min(1.0, spelling_errors * 100 / words / 5)
+    tone = (polarity + 1) / 2
+    return round(10 * (0.5 * length + 0.3 * spelling + 0.2 * tone), 1)
+
+
+def _aggregate(results: List[Dict]) -> Dict:
+    answered = [r for r in results if r['answered']]
+    n = len(answered) or 1
+    return {
+        'questions': len(results),
+        'answered': len(answered),
+        'score': round(sum(r['score'] for r in answered) / n, 1),
+        'sentiment': round(sum(r['sentiment'] for r in answered) / n, 3),
+        'spelling_issues': sum(len(r['spelling']) for r in answered),
+        'avg_words': round(sum(r['words'] for r in answered) / n, 1),
+    }
+
+
+def analyze_batch(answers: Sequence[str], reduced: bool = False) -> Dict:
+    """
+    Analyze every answer of a mock interview in one pass. Returns
+    {"answers": [per-answer result + words/score/answered], "aggregate": {...}}.
+    With reduced=True the spell check is skipped (sentiment only).
+    """
+    tokenized = [tokenize(a) if a and a != NO_ANSWER else [] for a in answers]
+    verdicts = {} if reduced else _spelling_verdicts(t for tokens in tokenized for t in tokens)
+
+    results = []
+    for tokens in tokenized:
+        words = sum(1 for t in tokens if t.isalpha())
+        polarity = _polarity(tokens) if tokens else 0.0
+        result = _result(polarity, _spelling_issues(tokens, verdicts), reduced)
+        if not tokens:
+            result['feedback'] = 'No answer given.'
+        result.update(
+            answered=bool(tokens),
+            words=words,
+            score=answer_score(words, len(result['spelling']), polarity),
+        )
+        results.append(result)
+    return {'answers': results, 'aggregate': _aggregate(results)}
+
+
+def reduced_batch(answers: Sequence[str]) -> Dict:
+    return analyze_batch(answers, reduced=True)
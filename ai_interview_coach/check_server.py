@@ -1,8 +1,11 @@
+import os
 import requests
 
+OLLAMA_URL = os.getenv("OLLAMA_URL", "http://127.0.0.1:11434")
+
 try:
     # Check the Ollama server models endpoint
-    r = requests.get("http://127.0.0.1:11434/v1/models", timeout=5)
+    r = requests.get(f"{OLLAMA_URL}/v1/models", timeout=5)
     print("✅ Connected! Models:", r.json())
 except Exception as e:
     print("❌ Cannot reach Ollama server:", e)
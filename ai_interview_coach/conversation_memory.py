@@ -0,0 +1,71 @@
+# ai_interview_coach/conversation_memory.py
+"""
+Token-budgeted conversation memory.
+
+The most recent turns are sent verbatim as long as they fit a token budget;
+anything older is represented by a rolling summary that is updated
+incrementally (see ai_llm.summarize_conversation).
+"""
+import math
+from typing import Dict, List, Optional
+
+# Llama 3's tokenizer averages roughly four characters per token on English
+# prose; each chat message also costs a few tokens of role/template markup.
+CHARS_PER_TOKEN = 4.0
+MESSAGE_OVERHEAD_TOKENS = 4
+
+
+def count_tokens(text: str) -> int:
+    """Estimate how many model tokens `text` takes."""
+    return math.ceil(len(text or "") / CHARS_PER_TOKEN)
+
+
+def message_tokens(message: Dict[str, str]) -> int:
+    return count_tokens(message.get("content", "")) + MESSAGE_OVERHEAD_TOKENS
+
+
+class ConversationMemory:
+    """
+    Picks which part of a chat history goes into the prompt.
+
+    The window slides in steps rather than by one turn at a time: while the
+    history fits `budget_tokens` it is sent whole, and once it overflows it
+    is cut back to `keep_ratio` of the budget. Between cuts each prompt
+    extends the previous one, so Ollama can reuse its KV cache for the prefix.
+    """
+
+    def __init__(self, budget_tokens: int = 1200, keep_ratio: float = 0.5):
+        self.budget_tokens = budget_tokens
+        self.keep_ratio = keep_ratio
+
+    def window_start(self, history: List[Dict[str, str]]) -> int:
+        """
+        Index of the first message to send. The last message is always kept,
+        and the window never starts on an assistant message cut off from its
+        user turn.
+        """
+        if sum(message_tokens(m) for m in history) <= self.budget_tokens:
+            return 0
+        limit = self.budget_tokens * self.keep_ratio
+        used = 0
+        start = len(history)
+        for i in range(len(history) - 1, -1, -1):
+            used += message_tokens(history[i])
+            if used > limit and start < len(history):
+                break
+            start = i
+        while 0 < start < len(history) - 1 and history[start].get("role") == "assistant":
+            start += 1
+        return start
+
+    @staticmethod
+    def summary_message(summary: str) -> Optional[Dict[str, str]]:
+        if not summary:
+            return None
+        return {"role": "system", "content": f"Summary of the interview so far:\n{summary}"}
+
+    def prompt_history(self, history: List[Dict[str, str]], summary: str = "") -> List[Dict[str, str]]:
+        """Summary (if any) followed by the recent turns that fit the budget."""
+        window = history[self.window_start(history):]
+        summary_msg = self.summary_message(summary)
+        return ([summary_msg] if summary_msg else []) + window
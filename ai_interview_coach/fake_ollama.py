@@ -0,0 +1,456 @@
+# ai_interview_coach/fake_ollama.py
+"""
+Local stand-in for the Ollama server, for load and latency testing without a GPU.
+
+Speaks the /api/chat, /api/generate, /api/tags and /v1/models wire formats,
+with configurable time-to-first-token, per-token latency, streaming, error
+injection, prompt (KV) cache reuse, and record/replay of real exchanges
+through JSONL cassettes.
+
+    python -m ai_interview_coach.fake_ollama --port 11434 --ttft 0.4 --token-latency 0.03 --prompt-eval-latency 0.002
+    python -m ai_interview_coach.fake_ollama --port 11435 --record cassette.jsonl --upstream http://127.0.0.1:11434
+    python -m ai_interview_coach.fake_ollama --replay cassette.jsonl --replay-timing
+
+Point the app at it with OLLAMA_URL=http://127.0.0.1:<port>.
+"""
+import argparse
+import hashlib
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+DEFAULT_MODEL = "llama3.2:3b"
+
+CANNED_QUESTIONS = [
+    "Good start. Can you walk me through a project you are proud of and your role in it?",
+    "Nice. How would you explain the difference between a process and a thread?",
+    "Thanks. Tell me about a time you had to handle conflicting priorities.",
+    "Solid answer. How do you approach debugging a problem you have never seen before?",
+    "Good. What would you improve in the last system you worked on, and why?",
+    "Fair point. How do you keep your technical skills up to date?",
+]
+
+CANNED_RESUME_QUESTIONS = {
+    "hr": ["Tell me about yourself.", "Why do you want this role?",
+           "Describe a challenge you overcame.", "Where do you see yourself in five years?"],
+    "technical": ["Explain a data structure you use often and why.", "How do you test your code?",
+                  "What happens when you type a URL into a browser?", "How would you design a URL shortener?",
+                  "Explain REST versus RPC.", "How do you profile a slow endpoint?"],
+    "project": ["Walk me through the architecture of your main project.",
+                "What was the hardest bug in that project?",
+                "What would you do differently if you rebuilt it?"],
+}
+
+QUESTION_TOPICS = [
+    "caching", "testing", "code review", "deadlines", "teamwork", "databases", "APIs", "security",
+    "performance", "mentoring", "estimation", "incidents", "documentation", "trade-offs", "feedback",
+    "ownership", "scaling", "refactoring", "requirements", "monitoring",
+]
+
+QUESTION_TEMPLATES = [
+    "How do you approach {topic} in your day-to-day work?",
+    "Describe a time when {topic} went wrong and what you learned.",
+    "What does good {topic} look like to you?",
+    "How would you explain your view on {topic} to a new teammate?",
+]
+
+_TOKEN_RE = re.compile(r"\S+\s*|\s+")
+
+
+def tokenize(text):
+    """Split a reply into word-sized pieces, the way it will be streamed."""
+    return _TOKEN_RE.findall(text) or [""]
+
+
+def exchange_key(path, payload):
+    """Stable key for a request, used to match cassette entries."""
+    relevant = {
+        "path": path,
+        "model": payload.get("model"),
+        "messages": payload.get("messages"),
+        "prompt": payload.get("prompt"),
+        "format": payload.get("format"),
+    }
+    return hashlib.sha256(json.dumps(relevant, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class Cassette:
+    """Append-only JSONL file of recorded exchanges, indexed by exchange_key."""
+
+    def __init__(self, path):
+        self.path = path
+        self.entries = {}
+        self._lock = threading.Lock()
+        try:
+            with open(path, encoding="utf-8") as fh:
+                for line in fh:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self.entries.setdefault(entry["key"], []).append(entry)
+        except FileNotFoundError:
+            pass
+
+    def lookup(self, key):
+        entries = self.entries.get(key)
+        return random.choice(entries) if entries else None
+
+    def append(self, entry):
+        with self._lock:
+            self.entries.setdefault(entry["key"], []).append(entry)
+            with open(self.path, "a", encoding="utf-8") as fh:
+                fh.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+
+class FakeOllamaServer(ThreadingHTTPServer):
+    """
+    Threaded fake Ollama. Run with serve_forever() or start() (background thread).
+
+    ttft / token_latency are in seconds; prompt_eval_latency (seconds per prompt
+    token) adds prompt-processing time before the first token. With kv_slots > 0
+    the server keeps that many recent prompts+replies and, like Ollama, only
+    evaluates the part of a new prompt past the longest cached prefix; a
+    /api/generate call that passes `context` only evaluates its new prompt.
+    error_rate is the share of requests answered with HTTP 500, drop_rate the share whose connection is closed
+    without a response. With a cassette in "record" mode requests are proxied to
+    `upstream` and saved; in "replay" mode recorded replies are served (with
+    their original timing when replay_timing is set).
+    """
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def __init__(self, host="127.0.0.1", port=0, model=DEFAULT_MODEL, ttft=0.0, token_latency=0.0,
+                 prompt_eval_latency=0.0, kv_slots=0, error_rate=0.0, drop_rate=0.0, cassette=None, mode=None, upstream=None,
+                 replay_timing=False, seed=None):
+        self.model = model
+        self.ttft = ttft
+        self.token_latency = token_latency
+        self.prompt_eval_latency = prompt_eval_latency
+        self.kv_slots = kv_slots
+        self.kv_cache = []
+        self.error_rate = error_rate
+        self.drop_rate = drop_rate
+        self.cassette = Cassette(cassette) if cassette else None
+        self.mode = mode
+        self.upstream = upstream.rstrip("/") if upstream else None
+        self.replay_timing = replay_timing
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.requests_served = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        super().__init__((host, port), FakeOllamaHandler)
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def handle_error(self, request, client_address):
+        # Clients hanging up mid-stream is normal (deadlines, early stops)
+        if isinstance(sys.exc_info()[1], (BrokenPipeError, ConnectionResetError)):
+            return
+        super().handle_error(request, client_address)
+
+    def reset_stats(self):
+        with self.lock:
+            self.requests_served = 0
+            self.in_flight = 0
+            self.peak_in_flight = 0
+            self.kv_cache = []
+
+    def cached_prefix(self, text):
+        """Length of the longest prefix of `text` held in a KV slot."""
+        with self.lock:
+            return max((len(os.path.commonprefix([cached, text])) for cached in self.kv_cache), default=0)
+
+    def remember_prompt(self, text):
+        """Store `text` in a free slot or, when all are taken, the one sharing most of it."""
+        if not self.kv_slots:
+            return
+        with self.lock:
+            if len(self.kv_cache) >= self.kv_slots:
+                shared = [len(os.path.commonprefix([cached, text])) for cached in self.kv_cache]
+                self.kv_cache.pop(shared.index(max(shared)))
+            self.kv_cache.append(text)
+
+    def canned_questions(self, prompt):
+        """A JSON {"questions": [...]} reply; the count is the first number in the prompt."""
+        match = re.search(r"\d+", prompt)
+        count = int(match.group()) if match else 5
+        pairs = [(t, topic) for t in QUESTION_TEMPLATES for topic in QUESTION_TOPICS]
+        picked = self.random.sample(pairs, min(count, len(pairs)))
+        return json.dumps({"questions": [t.format(topic=topic) for t, topic in picked]})
+
+    def canned_reply(self, path, payload):
+        if path == "/api/generate":
+            prompt = payload.get("prompt") or ""
+            if '"questions"' in prompt:
+                return self.canned_questions(prompt)
+            if payload.get("format") or "JSON" in prompt:
+                return json.dumps(CANNED_RESUME_QUESTIONS)
+            return CANNED_QUESTIONS[0]
+        messages = payload.get("messages") or []
+        last = messages[-1]["content"] if messages else ""
+        digest = int(hashlib.md5(last.encode("utf-8")).hexdigest(), 16)
+        return CANNED_QUESTIONS[digest % len(CANNED_QUESTIONS)]
+
+    def resolve(self, path, payload):
+        """Return (reply_text, ttft, token_latency) for a request."""
+        ttft, token_latency = self.ttft, self.token_latency
+        if self.cassette is None:
+            return self.canned_reply(path, payload), ttft, token_latency
+
+        key = exchange_key(path, payload)
+        if self.mode == "replay":
+            entry = self.cassette.lookup(key)
+            if entry is None:
+                return self.canned_reply(path, payload), ttft, token_latency
+            if self.replay_timing:
+                n = max(1, len(tokenize(entry["reply"])))
+                ttft = entry["ttft"]
+                token_latency = max(0.0, entry["duration"] - entry["ttft"]) / n
+            return entry["reply"], ttft, token_latency
+
+        # record: the real server's own latency is the delay, so relay its reply as-is
+        body = dict(payload, stream=True)
+        start = time.perf_counter()
+        first_token_at = None
+        parts = []
+        with requests.post(self.upstream + path, json=body, stream=True, timeout=(5, 600)) as upstream:
+            upstream.raise_for_status()
+            for line in upstream.iter_lines():
+                if not line:
+                    continue
+                chunk = json.loads(line)
+                piece = chunk.get("message", {}).get("content", "") if path == "/api/chat" else chunk.get("response", "")
+                if piece and first_token_at is None:
+                    first_token_at = time.perf_counter()
+                parts.append(piece)
+                if chunk.get("done"):
+                    break
+        duration = time.perf_counter() - start
+        reply = "".join(parts)
+        self.cassette.append({
+            "key": key,
+            "path": path,
+            "request": payload,
+            "reply": reply,
+            "ttft": (first_token_at or time.perf_counter()) - start,
+            "duration": duration,
+        })
+        return reply, 0.0, 0.0
+
+
+class FakeOllamaHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    # --------------------------
+    # Routing
+    # --------------------------
+    def do_GET(self):
+        server = self.server
+        if self.path == "/v1/models":
+            self._send_json(200, {"object": "list", "data": [
+                {"id": server.model, "object": "model", "created": int(time.time()), "owned_by": "library"},
+            ]})
+        elif self.path == "/api/tags":
+            self._send_json(200, {"models": [{"name": server.model, "model": server.model}]})
+        elif self.path == "/":
+            self._send_text(200, "Ollama is running")
+        else:
+            self._send_json(404, {"error": "not found"})
+
+    def do_POST(self):
+        if self.path not in ("/api/chat", "/api/generate"):
+            self._send_json(404, {"error": "not found"})
+            return
+        try:
+            payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        except ValueError:
+            self._send_json(400, {"error": "invalid JSON body"})
+            return
+
+        server = self.server
+        with server.lock:
+            server.requests_served += 1
+            server.in_flight += 1
+            server.peak_in_flight = max(server.peak_in_flight, server.in_flight)
+        try:
+            self._generate(payload)
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+    # --------------------------
+    # Generation
+    # --------------------------
+    def _generate(self, payload):
+        server = self.server
+        roll = server.random.random()
+        if roll < server.drop_rate:
+            self.close_connection = True
+            self.connection.close()
+            return
+        if roll < server.drop_rate + server.error_rate:
+            self._send_json(500, {"error": "injected failure"})
+            return
+
+        try:
+            reply, ttft, token_latency = server.resolve(self.path, payload)
+        except requests.exceptions.RequestException as e:
+            self._send_json(502, {"error": f"upstream failed: {e}"})
+            return
+
+        tokens = tokenize(reply)
+        prompt_text = self._prompt_text(payload)
+        cached = server.cached_prefix(prompt_text) if server.kv_slots else 0
+        prompt_tokens = max(1, (len(prompt_text) - cached) // 4)
+        prompt_seconds = prompt_tokens * server.prompt_eval_latency
+        server.remember_prompt(prompt_text + self._reply_text(reply))
+        ttft += prompt_seconds
+        start = time.perf_counter()
+
+        if payload.get("stream", True):
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            time.sleep(ttft)
+            for i, token in enumerate(tokens):
+                if i:
+                    time.sleep(token_latency)
+                self._write_chunk(self._chunk(payload, token, done=False))
+            self._write_chunk(self._chunk(payload, "", done=True, start=start, prompt_seconds=ttft,
+                                          prompt_tokens=prompt_tokens, eval_tokens=len(tokens), reply=reply))
+            self.wfile.write(b"0\r\n\r\n")
+        else:
+            time.sleep(ttft + token_latency * max(0, len(tokens) - 1))
+            self._send_json(200, self._chunk(payload, reply, done=True, start=start, prompt_seconds=ttft,
+                                             prompt_tokens=prompt_tokens, eval_tokens=len(tokens), reply=reply))
+
+    def _chunk(self, payload, text, done, start=None, prompt_seconds=0.0, prompt_tokens=0, eval_tokens=0, reply=""):
+        chunk = {
+            "model": payload.get("model") or self.server.model,
+            "created_at": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+        }
+        if self.path == "/api/chat":
+            chunk["message"] = {"role": "assistant", "content": text}
+        else:
+            chunk["response"] = text
+        chunk["done"] = done
+        if done:
+            total_ns = int((time.perf_counter() - start) * 1e9)
+            prompt_ns = int(min(prompt_seconds * 1e9, total_ns))
+            chunk.update({
+                "done_reason": "stop",
+                "total_duration": total_ns,
+                "load_duration": 0,
+                "prompt_eval_count": prompt_tokens,
+                "prompt_eval_duration": prompt_ns,
+                "eval_count": eval_tokens,
+                "eval_duration": max(0, total_ns - prompt_ns),
+            })
+            if self.path == "/api/generate":
+                # Stand-in token ids: one per ~4 characters of prompt and reply
+                new_text = self._prompt_text(payload) + reply
+                chunk["context"] = self._context_ids(payload) + [
+                    ord(c) for c in new_text[::4]
+                ]
+        return chunk
+
+    def _prompt_text(self, payload):
+        """The prompt as the model sees it (~4 characters per token)."""
+        if "messages" in payload:
+            return "".join(f"<|{m.get('role')}|>{m.get('content', '')}" for m in payload["messages"])
+        if self._context_ids(payload):
+            # The carried context is already evaluated; only the new prompt counts
+            return payload.get("prompt") or ""
+        return (payload.get("system") or "") + (payload.get("prompt") or "")
+
+    def _reply_text(self, reply):
+        return f"<|assistant|>{reply}" if self.path == "/api/chat" else reply
+
+    @staticmethod
+    def _context_ids(payload):
+        context = payload.get("context")
+        return list(context) if isinstance(context, list) else []
+
+    # --------------------------
+    # Wire helpers
+    # --------------------------
+    def _write_chunk(self, obj):
+        data = (json.dumps(obj) + "\n").encode("utf-8")
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+        self.wfile.flush()
+
+    def _send_json(self, status, obj):
+        data = json.dumps(obj).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_text(self, status, text):
+        data = text.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "text/plain")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fake Ollama server for load and latency testing.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11434)
+    parser.add_argument("--model", default=DEFAULT_MODEL)
+    parser.add_argument("--ttft", type=float, default=0.3, help="Seconds before the first token.")
+    parser.add_argument("--token-latency", type=float, default=0.03, help="Seconds between tokens.")
+    parser.add_argument("--prompt-eval-latency", type=float, default=0.0,
+                        help="Extra seconds before the first token per prompt token.")
+    parser.add_argument("--kv-slots", type=int, default=0,
+                        help="Recent prompts kept for prefix (KV cache) reuse; 0 disables it.")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests answered with HTTP 500.")
+    parser.add_argument("--drop-rate", type=float, default=0.0, help="Share of connections closed with no response.")
+    parser.add_argument("--seed", type=int, default=None)
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--record", metavar="CASSETTE", help="Proxy to --upstream and save exchanges.")
+    group.add_argument("--replay", metavar="CASSETTE", help="Serve recorded exchanges.")
+    parser.add_argument("--upstream", default="http://127.0.0.1:11434", help="Real Ollama used by --record.")
+    parser.add_argument("--replay-timing", action="store_true", help="Replay with the recorded latency.")
+    args = parser.parse_args(argv)
+
+    server = FakeOllamaServer(
+        host=args.host, port=args.port, model=args.model, ttft=args.ttft, token_latency=args.token_latency,
+        prompt_eval_latency=args.prompt_eval_latency, kv_slots=args.kv_slots,
+        error_rate=args.error_rate, drop_rate=args.drop_rate, seed=args.seed,
+        cassette=args.record or args.replay, mode="record" if args.record else "replay" if args.replay else None,
+        upstream=args.upstream, replay_timing=args.replay_timing,
+    )
+    print(f"Fake Ollama listening on {server.url} (model {args.model})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,51 +1,244 @@
 # ai_interview_coach/resume_parser.py
+import multiprocessing
 import os
 import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
 import pdfplumber
 import docx2txt
+from pdfminer.pdftypes import resolve1
 
-def _extract_pdf_text(path: str) -> str:
-    text_parts = []
+SECTION_HEADERS = ["education", "skills", "projects", "experience"]
+
+# Header line wordings per section; the first four are SECTION_HEADERS
+HEADER_SYNONYMS = {
+    "education": ["education", "academic background", "academic qualifications", "academics",
+                  "educational background", "educational qualifications", "qualifications",
+                  "education and training", "academic history"],
+    "skills": ["skills", "technical skills", "key skills", "core skills", "skill set", "skillset",
+               "core competencies", "competencies", "technologies", "tech stack", "tools",
+               "skills and tools", "tools and technologies", "technical proficiencies", "expertise",
+               "areas of expertise", "skills summary", "programming languages"],
+    "projects": ["projects", "project", "personal projects", "academic projects", "key projects",
+                 "selected projects", "side projects", "project experience", "portfolio"],
+    "experience": ["experience", "work experience", "work history", "professional experience",
+                   "employment", "employment history", "career history", "relevant experience",
+                   "internships", "internship", "internship experience", "professional background",
+                   "experience and internships"],
+    "summary": ["summary", "professional summary", "profile", "career objective", "objective",
+                "about me", "career summary"],
+    "certifications": ["certifications", "certificates", "certification", "licenses and certifications",
+                       "courses", "courses and certifications"],
+    "achievements": ["achievements", "awards", "honors", "awards and honors", "honors and awards",
+                     "accomplishments", "awards and achievements"],
+}
+
+def _synonym_trie(names) -> dict:
+    """Word trie {word: subtrie}; None marks the end of a synonym."""
+    trie = {}
+    for name in names:
+        node = trie
+        for word in name.split():
+            node = node.setdefault(word, {})
+        node[None] = True
+    return trie
+
+def _trie_regex(node) -> str:
+    """Regex equivalent of a synonym trie, sharing common word prefixes."""
+    alternatives = []
+    for word in sorted((w for w in node if w is not None), key=len, reverse=True):
+        child = node[word]
+        atom = r"(?:and|&)" if word == "and" else re.escape(word)
+        if len(child) > (None in child):
+            atom += r"(?:[ \t]+" + _trie_regex(child) + ")" + ("?" if None in child else "")
+        alternatives.append(atom)
+    return "(?:" + "|".join(alternatives) + ")"
+
+# One alternation per section (named after it), each compiled from that
+# section's synonym trie. A header line is optional bullet/markdown formatting
+# and numbering ("2." or "3)", so "5 projects" or "2019 Experience" is not a
+# header), one synonym, then optional formatting or ":" and inline text.
+# It is anchored on the preceding "\n" rather than ^ so the regex engine can
+# jump from line to line with its literal-prefix search.
+_HEADER_LINE_PATTERN = (
+    r"\n[ \t#*\-_=|>~\u2022\u25cf\u25aa\u25a0\u2013\u2014]*(?:[0-9]+[.)][ \t]*)?"
+    + "(?:" + "|".join(f"(?P<{section}>{_trie_regex(_synonym_trie(names))})"
+                       for section, names in HEADER_SYNONYMS.items()) + ")"
+    + r"[ \t#*\-_=|~.\u2013\u2014]*(?::(?P<inline>[^\n]*))?(?=\n|\Z)"
+)
+# Matched against lowercased text (twice as fast as IGNORECASE), unless
+# lowercasing changes the text's length and so its offsets
+_HEADER_LINE_RE = re.compile(_HEADER_LINE_PATTERN)
+_HEADER_LINE_ANYCASE_RE = re.compile(_HEADER_LINE_PATTERN, re.IGNORECASE)
+_BLANK_RUNS_RE = re.compile(r"\n(?:[ \t]*\n){2,}")
+_INLINE_FORMATTING = " \t#*-_=|~\u2022\u25cf\u25aa\u25a0\u2013\u2014"
+
+def _find_headers(text: str):
+    """(start, end, section, inline text) per header line of "\n"-prefixed text."""
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        matches = _HEADER_LINE_RE.finditer(lowered)
+    else:
+        matches = _HEADER_LINE_ANYCASE_RE.finditer(text)
+    for m in matches:
+        section = next(name for name in HEADER_SYNONYMS if m.start(name) >= 0)
+        inline = text[m.start("inline"):m.end("inline")] if m.start("inline") >= 0 else ""
+        yield m.start(), m.end(), section, inline.strip(_INLINE_FORMATTING)
+
+def match_header(line: str):
+    """
+    (section, inline text) if `line` is a section header, else None. The
+    whole line, bar markdown/bullet/numbering formatting, must be one
+    synonym: "## TECHNICAL SKILLS", "Work History:", "Skills: Python, SQL".
+    """
+    for start, end, section, inline in _find_headers("\n" + line.strip()):
+        return section, inline
+    return None
+
+# PDF extraction budgets: pages read, bytes of text kept, pages per pool job
+PDF_MAX_PAGES = 30
+PDF_MAX_BYTES = 200_000
+PDF_PAGES_PER_CHUNK = 4
+
+_pdf_pool = None
+_pdf_pool_lock = threading.Lock()
+
+def _has_text(page) -> bool:
+    """
+    False for pages that cannot contain text (no fonts, only image XObjects,
+    i.e. scanned or blank pages), so their layout analysis can be skipped.
+    """
+    resources = resolve1(page.page_obj.resources) or {}
+    if resolve1(resources.get("Font")):
+        return True
+    for xobject in (resolve1(resources.get("XObject")) or {}).values():
+        subtype = resolve1(xobject).get("Subtype")
+        if getattr(subtype, "name", None) != "Image":
+            return True  # a form XObject may carry text
+    return False
+
+def _page_text(page) -> str:
+    try:
+        return (page.extract_text() or "") if _has_text(page) else ""
+    finally:
+        page.close()  # drop the page's cached layout objects
+
+def _extract_pdf_range(path: str, start: int, stop: int) -> list:
+    """Text of pages [start, stop); runs in a pool worker."""
+    with pdfplumber.open(path, pages=range(start + 1, stop + 1)) as pdf:
+        return [_page_text(page) for page in pdf.pages]
+
+def _get_pdf_pool(workers: int) -> ProcessPoolExecutor:
+    global _pdf_pool
+    with _pdf_pool_lock:
+        if _pdf_pool is None:
+            _pdf_pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        return _pdf_pool
+
+def iter_pdf_pages(path: str, max_pages: int = PDF_MAX_PAGES, workers: int = 0,
+                   pages_per_chunk: int = PDF_PAGES_PER_CHUNK):
+    """
+    Yield the text of each page, in order, up to max_pages ("" for pages
+    without text). With workers > 1, page ranges are extracted in a process
+    pool, at most `workers` ranges in flight; closing the generator early
+    cancels the rest.
+    """
     with pdfplumber.open(path) as pdf:
-        for page in pdf.pages:
-            txt = page.extract_text() or ""
+        count = min(len(pdf.pages), max_pages)
+        if workers <= 1 or count <= pages_per_chunk:
+            for page in pdf.pages[:count]:
+                yield _page_text(page)
+            return
+
+    pool = _get_pdf_pool(workers)
+    ranges = [(start, min(start + pages_per_chunk, count)) for start in range(0, count, pages_per_chunk)]
+    in_flight = [pool.submit(_extract_pdf_range, path, *r) for r in ranges[:workers]]
+    queued = ranges[workers:]
+    try:
+        while in_flight:
+            texts = in_flight.pop(0).result()
+            if queued:
+                in_flight.append(pool.submit(_extract_pdf_range, path, *queued.pop(0)))
+            yield from texts
+    finally:
+        for future in in_flight:
+            future.cancel()
+
+def _extract_pdf_text(path: str, max_pages: int = PDF_MAX_PAGES, max_bytes: int = PDF_MAX_BYTES,
+                      workers: int = 0) -> str:
+    """
+    Join page text until max_bytes, skipping empty pages. Once all of
+    SECTION_HEADERS have appeared, stops at the first page where a header of
+    another section (awards, certifications) follows them, since the rest of
+    a long PDF is not needed for the summary; a needed section that runs over
+    several pages is read to its end.
+    """
+    text_parts = []
+    size = 0
+    found = set()
+    last_section = None
+    pages = iter_pdf_pages(path, max_pages, workers)
+    try:
+        for txt in pages:
+            if not txt.strip():
+                continue
+            encoded = txt.encode("utf-8")
+            if size + len(encoded) > max_bytes:
+                text_parts.append(encoded[:max(0, max_bytes - size)].decode("utf-8", "ignore"))
+                break
             text_parts.append(txt)
+            size += len(encoded) + 1  # the page and the "\n" before the next one
+            if size >= max_bytes:
+                break
+
+            for _, _, section, _ in _find_headers("\n" + txt):
+                last_section = section
+                if section in SECTION_HEADERS:
+                    found.add(section)
+            if len(found) == len(SECTION_HEADERS) and last_section not in SECTION_HEADERS:
+                break
+    finally:
+        pages.close()
     return "\n".join(text_parts)
 
 def _extract_docx_text(path: str) -> str:
     return docx2txt.process(path) or ""
 
-def extract_resume_text(file_path: str) -> str:
+def extract_resume_text(file_path: str, max_pages: int = PDF_MAX_PAGES, max_bytes: int = PDF_MAX_BYTES,
+                        workers: int = 0) -> str:
     ext = os.path.splitext(file_path)[1].lower()
     if ext == ".pdf":
-        return _extract_pdf_text(file_path)
+        return _extract_pdf_text(file_path, max_pages, max_bytes, workers)
     if ext in [".docx", ".doc"]:
-        return _extract_docx_text(file_path)
+        return _extract_docx_text(file_path).encode("utf-8")[:max_bytes].decode("utf-8", "ignore")
     return ""
 
 def parse_sections(raw: str):
-    text = raw.replace("\r", "\n")
-    text = re.sub(r"\n{2,}", "\n\n", text)
-
-    headers = ["education", "skills", "projects", "experience"]
-    patt = r"^(?P<header>" + r"|".join(headers) + r")\b"
+    """
+    Split resume text into {section: text} in one linear scan: the header
+    regex finds the header lines, and the text between two headers is
+    sliced out as the first one's section. Section names are the
+    HEADER_SYNONYMS keys; text before the first header goes under "misc".
+    """
+    text = "\n" + raw.replace("\r\n", "\n").replace("\r", "\n")
+    sections = {}
+    current, start = "misc", 0
 
-    lines = text.split("\n")
-    sections = {"misc": []}
-    current = "misc"
+    for header_start, header_end, section, inline in _find_headers(text):
+        sections.setdefault(current, []).append(text[start:header_start].strip("\n"))
+        current = section
+        if inline:
+            sections.setdefault(current, []).append(inline)
+        start = header_end
+    sections.setdefault(current, []).append(text[start:].strip("\n"))
 
-    for ln in lines:
-        ln_norm = ln.strip().lower()
-        if re.match(patt, ln_norm):
-            current = ln_norm
-            sections[current] = []
-        else:
-            sections[current].append(ln)
-
-    return {k: "\n".join(v).strip() for k, v in sections.items() if v}
+    parsed = {k: _BLANK_RUNS_RE.sub("\n\n", "\n".join(v)).strip() for k, v in sections.items()}
+    return {k: v for k, v in parsed.items() if v}
 
 def make_resume_summary(raw_text: str) -> str:
-    sections = parse_sections(raw_text)
+    return summarize_sections(parse_sections(raw_text))
+
+def summarize_sections(sections: dict) -> str:
     skills = sections.get("skills", "(not found)")
     projects = sections.get("projects", "(not found)")
     experience = sections.get("experience", "(not found)")
@@ -42,13 +42,12 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
-    'django.contrib.sessions.middleware.SessionMiddleware',
+    'core.middleware.InterruptedSessionTolerantMiddleware',  # SessionMiddleware, see core/middleware.py
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
-    'core.middleware.IgnoreSessionUpdateErrorMiddleware',
 ]
 
 ROOT_URLCONF = 'ai_interview_coach.urls'
@@ -120,6 +119,98 @@ STATIC_URL = '/static/'   # <-- add the slash at the start
 STATICFILES_DIRS = [BASE_DIR / 'static']
 STATIC_ROOT = BASE_DIR / 'staticfiles'
 
+# AI coach / LLM
+# Serve /api/chat/, /api/turn/ and /chat/message/ with the async views. Only
+# turn it on under an ASGI server (e.g. `uvicorn ai_interview_coach.asgi:application`):
+# under WSGI every async view call runs on a new event loop, which would get
+# a new pooled httpx client each time.
+ASYNC_CHAT_VIEWS = False
+
+# Ollama client: connect/read timeouts (seconds), retries on connection errors
+# with jittered exponential backoff, the total time budget (SLO) of a single
+# LLM call, and the connection pool size.
+LLM_CONNECT_TIMEOUT = 3.05
+LLM_READ_TIMEOUT = 120
+LLM_MAX_RETRIES = 2
+LLM_RETRY_BACKOFF = 0.5
+LLM_REQUEST_DEADLINE = 180
+LLM_MAX_CONNECTIONS = 512
+
+# How long Ollama keeps the model (and its prompt KV cache) loaded after a
+# call; a duration string like "30m", or -1 to never unload.
+LLM_KEEP_ALIVE = "30m"
+
+# Chat reply cache for repeated prompts (e.g. "Ask me a <field> interview
+# question." with an empty history). Only turns with at most
+# LLM_CACHE_MAX_HISTORY prior messages are cached; LLM_CACHE_VARIANTS > 1
+# generates that many replies per prompt before caching, then serves one of
+# the distinct ones at random.
+LLM_CACHE_ENABLED = True
+LLM_CACHE_MAX_ENTRIES = 1024
+LLM_CACHE_TTL = 3600
+LLM_CACHE_VARIANTS = 1
+LLM_CACHE_MAX_HISTORY = 0
+
+# Mock interview question pool. When a user has fewer than LOW unseen
+# questions left for a (field, difficulty, tag), a background job generates
+# batches of BATCH_SIZE until they have HIGH again.
+QUESTION_POOL_LOW_WATERMARK = 10
+QUESTION_POOL_HIGH_WATERMARK = 30
+QUESTION_POOL_BATCH_SIZE = 10
+QUESTION_POOL_MAX_BATCHES = 5
+
+# Chat memory: recent turns are sent verbatim up to this many (estimated)
+# tokens; older turns are folded into a rolling summary in the background.
+# On overflow the window is cut back to half the budget, so consecutive
+# prompts share a prefix Ollama can reuse. Transcripts are stored as
+# ChatMessage rows; at most CHAT_HISTORY_MAX_MESSAGES unsummarized messages
+# are loaded per turn.
+CHAT_HISTORY_TOKEN_BUDGET = 1200
+CHAT_SUMMARY_MAX_TOKENS = 250
+CHAT_HISTORY_MAX_MESSAGES = 200
+
+# Answer feedback (sentiment + spelling) runs in a pool of FEEDBACK_WORKERS
+# processes (0 = inline). With more than FEEDBACK_MAX_PENDING jobs queued, or
+# when one takes longer than FEEDBACK_TIMEOUT seconds, the reduced
+# sentiment-only check is returned instead.
+FEEDBACK_WORKERS = 2
+FEEDBACK_MAX_PENDING = 32
+FEEDBACK_TIMEOUT = 5.0
+
+# Parsed resumes are cached by the SHA-256 of the uploaded file, so re-uploads
+# of the same file skip extraction and question generation. Least recently
+# used entries beyond RESUME_CACHE_MAX_ENTRIES are evicted.
+RESUME_CACHE_MAX_ENTRIES = 500
+
+# PDF resume extraction: read at most RESUME_PDF_MAX_PAGES pages and keep at
+# most RESUME_PDF_MAX_BYTES of text. Longer PDFs are split into page ranges
+# across RESUME_PDF_WORKERS processes (0 = extract in the ingestion thread,
+# the default: extra processes only pay off with spare cores).
+RESUME_PDF_WORKERS = 0
+RESUME_PDF_MAX_PAGES = 30
+RESUME_PDF_MAX_BYTES = 200_000
+
+# Skills found in resumes come from ai_interview_coach/skills_taxonomy.json.
+# Its Aho-Corasick automaton is saved here once built and loaded by later
+# processes; it is rebuilt automatically when the taxonomy changes. The file
+# is signed with SECRET_KEY and ignored when the signature does not match.
+SKILLS_AUTOMATON_PATH = BASE_DIR / 'var' / 'cache' / 'skills_automaton.pickle'
+
+# Resume questions are ranked from an in-memory index of the question bank
+# (core.question_index); the LLM is asked only when fewer than three reach
+# MIN_SCORE. Rows inserted by other processes are picked up at most every
+# REFRESH_SECONDS.
+QUESTION_INDEX_MIN_SCORE = 5.0
+QUESTION_INDEX_REFRESH_SECONDS = 30
+
+# The rendered top of the leaderboard is cached this long. Grading drops it
+# at once in the grading process; with a per-process cache (the default
+# LocMemCache) other workers may show the old board until it expires.
+SCOREBOARD_CACHE_SECONDS = 60
+
+# Threads for in-process background jobs (core.tasks)
+BACKGROUND_WORKERS = 2
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -0,0 +1,229 @@
+# ai_interview_coach/skills.py
+"""
+Skills extraction from resume text.
+
+Every alias in skills_taxonomy.json ({"Kubernetes": ["k8s", ...]}; the
+canonical name is an alias of itself) goes into one Aho-Corasick
+automaton, so a single left-to-right pass over the text finds all of them
+at once, however large the taxonomy. Matches must sit on word boundaries
+("java" is not found in "javascript", "c" not in "c++"); overlapping
+matches resolve to the leftmost, then longest ("machine learning" beats
+"learning").
+
+Build time grows with the taxonomy, so get_skill_extractor() saves the
+automaton to disk and later processes (workers, restarts) load it
+instead, as long as the taxonomy has not changed. The file is a pickle,
+so it is signed with an HMAC of a secret key and only unpickled when the
+signature checks out; without a key nothing is saved or loaded.
+"""
+import hashlib
+import hmac
+import json
+import logging
+import os
+import pickle
+import tempfile
+import threading
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 2
+
+# Canonical names too common as plain words to match on their own
+# ("go to market", "Plan C"); their aliases still match
+AMBIGUOUS_NAMES = {"go", "c", "r", "express", "swift"}
+
+# Characters that continue a token: "c" must not match inside "c++" or "c#"
+_TOKEN_TAIL = set("+#")
+
+
+def _taxonomy_file() -> str:
+    return os.path.join(os.path.dirname(__file__), "skills_taxonomy.json")
+
+
+def load_taxonomy(path: Optional[str] = None) -> Dict[str, List[str]]:
+    """Canonical skill -> aliases, from a JSON file."""
+    with open(path or _taxonomy_file(), encoding="utf-8") as fh:
+        return json.load(fh)
+
+
+def normalize(text: str) -> str:
+    """Lowercase with whitespace runs collapsed, as the automaton expects."""
+    return " ".join(text.lower().split())
+
+
+def _signature(key, payload: bytes) -> bytes:
+    if isinstance(key, str):
+        key = key.encode("utf-8")
+    return hmac.new(key, payload, hashlib.sha256).digest()
+
+
+_SIGNATURE_SIZE = hashlib.sha256().digest_size
+
+
+def taxonomy_digest(taxonomy: Dict[str, List[str]]) -> str:
+    data = json.dumps([FORMAT_VERSION, taxonomy], sort_keys=True).encode("utf-8")
+    return hashlib.sha256(data).hexdigest()
+
+
+class SkillExtractor:
+    """Aho-Corasick automaton over the normalized aliases of a skills taxonomy."""
+
+    def __init__(self, taxonomy: Dict[str, List[str]]):
+        self.digest = taxonomy_digest(taxonomy)
+        self.skills: List[str] = list(taxonomy)
+        # Trie: goto[state][char] -> state; out[state] = (skill index, alias length) or None
+        self.goto: List[Dict[str, int]] = [{}]
+        self.out: List[Optional[Tuple[int, int]]] = [None]
+
+        for index, (skill, aliases) in enumerate(taxonomy.items()):
+            names = list(aliases)
+            if skill.lower() not in AMBIGUOUS_NAMES:
+                names.append(skill)
+            for alias in names:
+                self._add(normalize(alias), index)
+
+        # Failure links, breadth first; `link` points to the nearest state on
+        # the failure chain that ends a match, so a scan can list every
+        # match ending at a position without walking the whole chain.
+        self.fail = [0] * len(self.goto)
+        self.link = [0] * len(self.goto)
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in self.goto[state].items():
+                queue.append(child)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(char, 0)
+                self.fail[child] = target if target != child else 0
+                self.link[child] = self.fail[child] if self.out[self.fail[child]] else self.link[self.fail[child]]
+
+    def _add(self, alias: str, index: int):
+        if not alias:
+            return
+        state = 0
+        for char in alias:
+            nxt = self.goto[state].get(char)
+            if nxt is None:
+                nxt = len(self.goto)
+                self.goto[state][char] = nxt
+                self.goto.append({})
+                self.out.append(None)
+            state = nxt
+        if self.out[state] is None:  # the first skill listing an alias keeps it
+            self.out[state] = (index, len(alias))
+
+    def matches(self, text: str) -> List[Tuple[int, int, int]]:
+        """(start, end, skill index) of every alias on word boundaries in normalized `text`."""
+        goto, fail, out, link = self.goto, self.fail, self.out, self.link
+        found = []
+        state = 0
+        length = len(text)
+        for pos, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            hit = state if out[state] else link[state]
+            while hit:
+                index, size = out[hit]
+                start, end = pos + 1 - size, pos + 1
+                if (start == 0 or not text[start - 1].isalnum()) and (
+                        end == length or not (text[end].isalnum() or text[end] in _TOKEN_TAIL)):
+                    found.append((start, end, index))
+                hit = link[hit]
+        return found
+
+    def extract(self, text: str) -> List[str]:
+        """Canonical skills mentioned in `text`, in order of first mention."""
+        skills, seen = [], set()
+        covered = 0
+        # Leftmost first, longest first at the same start; skip overlaps
+        for start, end, index in sorted(self.matches(normalize(text)), key=lambda m: (m[0], -m[1])):
+            if start < covered:
+                continue
+            covered = end
+            if index not in seen:
+                seen.add(index)
+                skills.append(self.skills[index])
+        return skills
+
+    def save(self, path: str, key):
+        """
+        Write the automaton, signed with `key`, atomically so concurrent
+        loaders never see a partial file.
+        """
+        payload = pickle.dumps((FORMAT_VERSION, self.__dict__), protocol=pickle.HIGHEST_PROTOCOL)
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                fh.write(_signature(key, payload))
+                fh.write(payload)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    @classmethod
+    def load(cls, path: str, key) -> "SkillExtractor":
+        """Read a file written by save() with the same `key`; ValueError if it was not."""
+        with open(path, "rb") as fh:
+            data = fh.read()
+        signature, payload = data[:_SIGNATURE_SIZE], data[_SIGNATURE_SIZE:]
+        if not hmac.compare_digest(signature, _signature(key, payload)):
+            raise ValueError("skills automaton signature mismatch")
+        version, state = pickle.loads(payload)
+        if version != FORMAT_VERSION:
+            raise ValueError(f"unsupported skills automaton format {version}")
+        extractor = cls.__new__(cls)
+        extractor.__dict__.update(state)
+        return extractor
+
+
+def build_or_load(taxonomy: Dict[str, List[str]], cache_path: Optional[str] = None,
+                  key=None) -> SkillExtractor:
+    """
+    The automaton for `taxonomy`: loaded from cache_path when that file was
+    signed with `key` and built from the same taxonomy, otherwise built
+    (and saved there). The file is not used at all without a key.
+    """
+    if not key:
+        cache_path = None
+    if cache_path and os.path.exists(cache_path):
+        try:
+            extractor = SkillExtractor.load(cache_path, key)
+            if extractor.digest == taxonomy_digest(taxonomy):
+                return extractor
+        except Exception:
+            logger.warning("Ignoring unreadable skills automaton at %s", cache_path, exc_info=True)
+
+    extractor = SkillExtractor(taxonomy)
+    if cache_path:
+        try:
+            extractor.save(cache_path, key)
+        except OSError:
+            logger.warning("Could not save the skills automaton to %s", cache_path, exc_info=True)
+    return extractor
+
+
+_extractor = None
+_extractor_lock = threading.Lock()
+
+
+def get_skill_extractor(cache_path: Optional[str] = None, key=None) -> SkillExtractor:
+    """Return the process-wide SkillExtractor for the bundled taxonomy."""
+    global _extractor
+    if _extractor is None:
+        with _extractor_lock:
+            if _extractor is None:
+                _extractor = build_or_load(load_taxonomy(), cache_path, key)
+    return _extractor
+
+
+def extract_skills(text: str, cache_path: Optional[str] = None, key=None) -> List[str]:
+    return get_skill_extractor(cache_path, key).extract(text)
@@ -0,0 +1,189 @@
+# ai_interview_coach/spellcheck.py
+"""
+Fast spelling checker for interview answers.
+
+A symmetric-delete (SymSpell-style) index is built once over TextBlob's
+word-frequency list: every dictionary word is stored under each string
+obtainable by deleting up to MAX_EDIT_DISTANCE characters from its prefix.
+Looking up a token then only generates the deletes of the token itself,
+instead of every insert/replace/transpose candidate as TextBlob's
+Norvig-style corrector does. Results are memoized per token.
+
+The checker only flags misspelled tokens (with a suggestion); it never
+rewrites the text. A word missing from the list is accepted when it is a
+regular inflection (-s, -es, -ies, -ed, -ing) of one that is there.
+"""
+import os
+import re
+import threading
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+MAX_EDIT_DISTANCE = 2
+PREFIX_LENGTH = 7
+
+# Interview vocabulary missing from the general-English word list
+DOMAIN_WORDS = """
+agile ai ajax algorithm algorithms analytics android angular ansible api apis async aws azure
+backend backlog blockchain bootstrap cd chatbot ci cli cloud cms cpu crm css csv dashboard
+dashboards dataset datasets debug debugging deployment dev devops django docker ec2 email emails endpoint
+endpoints erp etl excel fastapi figma firebase flask frontend fullstack gcp git github gitlab
+gpu graphql hadoop html http https iam ios java javascript jenkins jira jquery json jwt kafka
+kanban kotlin kpi kpis kubernetes laravel linkedin linux llm llms login logout mentor mongodb mvc
+mysql nginx nlp nodejs nosql numpy oauth onboarding oop orm pandas php postgres postgresql
+powerbi pytorch python qa react redis refactor refactoring repo repos rest roi saas scala
+scrum sdk seo sem signup sklearn smtp spark spreadsheet sql sqlite sre startup startups
+stakeholder stakeholders swift tableau tensorflow terraform typescript ui unix url urls
+usability ux vue webhook webhooks website websites wifi workflow workflows xml yaml
+""".split()
+
+_TOKEN_RE = re.compile(r"[A-Za-z]+(?:'[A-Za-z]+)*")
+
+# Inflectional suffixes and what they replace: the word list mostly has base forms only
+_SUFFIXES = (
+    ("ies", ("y",)), ("ied", ("y",)), ("es", ("",)), ("s", ("",)),
+    ("ed", ("", "e")), ("ing", ("", "e")),
+)
+
+
+def _spelling_file() -> str:
+    import textblob
+    return os.path.join(os.path.dirname(textblob.__file__), "en", "en-spelling.txt")
+
+
+def load_word_counts(path: Optional[str] = None) -> Dict[str, int]:
+    """Read a "word count" per line frequency list (';;;' lines are comments)."""
+    counts = {}
+    with open(path or _spelling_file(), encoding="utf-8") as fh:
+        for line in fh:
+            if line.startswith(";;;"):
+                continue
+            parts = line.split()
+            if len(parts) == 2 and parts[1].isdigit():
+                counts[parts[0].lower()] = int(parts[1])
+    return counts
+
+
+def _deletes(word: str, max_distance: int) -> set:
+    """All strings obtained by deleting up to max_distance characters."""
+    result = {word}
+    frontier = {word}
+    for _ in range(max_distance):
+        frontier = {w[:i] + w[i + 1:] for w in frontier if len(w) > 1 for i in range(len(w))}
+        result |= frontier
+    return result
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """Optimal string alignment distance, or limit + 1 once it exceeds `limit`."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    prev2 = None
+    prev = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        cur = [i] + [0] * len(b)
+        row_min = i
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                cur[j] = min(cur[j], prev2[j - 2] + 1)
+            row_min = min(row_min, cur[j])
+        if row_min > limit:
+            return limit + 1
+        prev2, prev = prev, cur
+    return prev[-1] if prev[-1] <= limit else limit + 1
+
+
+def inflection_stems(word: str) -> Iterable[str]:
+    """Base forms `word` may be inflected from: queries -> query, coded -> code, planned -> plan."""
+    for suffix, endings in _SUFFIXES:
+        base = word[:-len(suffix)]
+        if not word.endswith(suffix) or len(base) < 2:
+            continue
+        for ending in endings:
+            yield base + ending
+        if suffix in ("ed", "ing") and len(base) > 2 and base[-1] == base[-2]:
+            yield base[:-1]
+
+
+class SpellChecker:
+    """Symmetric-delete spelling index over a word-frequency dictionary."""
+
+    def __init__(self, word_counts: Dict[str, int], extra_words: Iterable[str] = (),
+                 max_edit_distance: int = MAX_EDIT_DISTANCE, prefix_length: int = PREFIX_LENGTH):
+        self.max_edit_distance = max_edit_distance
+        self.prefix_length = prefix_length
+        self.words = dict(word_counts)
+        for word in extra_words:
+            self.words.setdefault(word.lower(), 1)
+
+        self.deletes: Dict[str, List[str]] = {}
+        for word in self.words:
+            for delete in _deletes(word[:prefix_length], max_edit_distance):
+                self.deletes.setdefault(delete, []).append(word)
+
+        self.suggest = lru_cache(maxsize=50_000)(self._suggest)
+
+    def known(self, word: str) -> bool:
+        return word in self.words
+
+    def _suggest(self, word: str) -> Optional[str]:
+        """
+        Best dictionary word within max_edit_distance of an unknown `word`
+        (closest first, then most frequent), or None if there is none.
+        """
+        limit = self.max_edit_distance
+        best, best_key = None, None
+        seen = set()
+        for delete in _deletes(word[:self.prefix_length], limit):
+            for candidate in self.deletes.get(delete, ()):
+                if candidate in seen:
+                    continue
+                seen.add(candidate)
+                # Only as close as the best so far can still win
+                bound = best_key[0] if best_key else limit
+                distance = edit_distance(word, candidate, bound)
+                if distance > bound:
+                    continue
+                key = (distance, -self.words[candidate])
+                if best_key is None or key < best_key:
+                    best, best_key = candidate, key
+        return best
+
+    def check_token(self, token: str) -> Optional[str]:
+        """Suggestion for a misspelled token, or None if it looks fine."""
+        word = token.lower()
+        if len(word) < 3 or self.known(word) or (token.isupper() and len(token) > 1):
+            return None
+        if "'" in word:
+            # Contractions and possessives: judge the stem ("team's", "didn't")
+            stem = word.split("'", 1)[0]
+            if self.known(stem):
+                return None
+        if any(self.known(stem) for stem in inflection_stems(word)):
+            return None
+        return self.suggest(word)
+
+    def check(self, text: str) -> List[Tuple[str, str]]:
+        """(token, suggestion) for each misspelled token in `text`, in order."""
+        issues = []
+        for match in _TOKEN_RE.finditer(text or ""):
+            suggestion = self.check_token(match.group())
+            if suggestion and suggestion != match.group().lower():
+                issues.append((match.group(), suggestion))
+        return issues
+
+
+_checker = None
+_checker_lock = threading.Lock()
+
+
+def get_spell_checker() -> SpellChecker:
+    """Return the process-wide SpellChecker, building its index on first use."""
+    global _checker
+    if _checker is None:
+        with _checker_lock:
+            if _checker is None:
+                _checker = SpellChecker(load_word_counts(), DOMAIN_WORDS)
+    return _checker
@@ -1,11 +1,11 @@
 # ai_interview_coach/test_llm.py
-from ai_llm import chat_with_model, MODEL_NAME
+from ai_llm import chat_with_model, MODEL_NAME, OLLAMA_URL
 import requests
 
 def check_server():
     """Check if Ollama server is running."""
     try:
-        r = requests.get("http://127.0.0.1:11434/v1/models", timeout=5)
+        r = requests.get(f"{OLLAMA_URL}/v1/models", timeout=5)
         models = [m["id"] for m in r.json().get("data", [])]
         if MODEL_NAME in models:
             return True
@@ -1,7 +1,10 @@
+import os
 import requests
 
+OLLAMA_URL = os.getenv("OLLAMA_URL", "http://127.0.0.1:11434")
+
 try:
-    r = requests.get("http://127.0.0.1:11434/v1/models", timeout=10)
+    r = requests.get(f"{OLLAMA_URL}/v1/models", timeout=10)
     print("Server reachable!")
     print(r.json())
 except Exception as e:
@@ -1,9 +1,31 @@
 from django.contrib import admin
-from core.models import (UserProfile,Resume,QuizQuestion,Feedback,)
+from core.models import (UserProfile,Resume,ResumeCache,QuizQuestion,Feedback,PooledQuestion,)
+from core import resume_ingest
 
 # Existing registrations
 admin.site.register(UserProfile)
-admin.site.register(Resume)
+
+
+@admin.register(Resume)
+class ResumeAdmin(admin.ModelAdmin):
+    list_display = ('id', 'user', 'uploaded_at', 'status', 'cache_hit', 'processed_at')
+    list_filter = ('status', 'cache_hit')
+    readonly_fields = ('status', 'error', 'processed_at', 'content_hash', 'cache_hit')
+
+
+@admin.register(ResumeCache)
+class ResumeCacheAdmin(admin.ModelAdmin):
+    list_display = ('content_hash', 'hits', 'question_hits', 'last_used_at', 'created_at')
+    readonly_fields = ('content_hash', 'hits', 'question_hits', 'last_used_at', 'created_at')
+    exclude = ('parsed_text',)
+
+    def changelist_view(self, request, extra_context=None):
+        hits, total = resume_ingest.hit_rate()
+        rate = f"{100 * hits / total:.0f}%" if total else "n/a"
+        extra_context = dict(extra_context or {}, title=f"Resume cache: hit rate {rate} ({hits} of {total} uploads)")
+        return super().changelist_view(request, extra_context)
+
+
 @admin.register(QuizQuestion)
 class QuizQuestionAdmin(admin.ModelAdmin):
     list_display = ('id', 'question', 'correct_answer')
@@ -11,4 +33,12 @@ class QuizQuestionAdmin(admin.ModelAdmin):
     admin.site.register(Feedback)
 class FeedbackAdmin(admin.ModelAdmin):
     list_display = ('user', 'subject', 'created_at')
-    list_filter = ('created_at', 'user')
\ No newline at end of file
+    list_filter = ('created_at', 'user')
+
+
+@admin.register(PooledQuestion)
+class PooledQuestionAdmin(admin.ModelAdmin):
+    list_display = ('id', 'field', 'difficulty', 'tag', 'text', 'created_at')
+    list_filter = ('field', 'difficulty')
+    search_fields = ('text', 'tag')
+    exclude = ('seen_by',)
@@ -0,0 +1,178 @@
+# core/analysis_pool.py
+"""
+Process pool for answer analysis, so the GIL-bound sentiment and spelling
+work never runs on a request thread.
+
+Workers are spawned once and warmed (TextBlob lexicon + spelling index).
+At most FEEDBACK_MAX_PENDING jobs may be queued or running; beyond that,
+or when a job misses FEEDBACK_TIMEOUT, callers get the reduced in-process
+check instead of waiting. FEEDBACK_WORKERS = 0 runs the full check inline.
+"""
+import asyncio
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import CancelledError, ProcessPoolExecutor, TimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+
+from ai_interview_coach import answer_analysis
+
+logger = logging.getLogger(__name__)
+
+
+class AnalysisPool:
+    def __init__(self, workers=2, max_pending=32, timeout=5.0):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self.pending = 0
+        self.fallbacks = 0
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                # spawn, not fork: the web process has live threads and DB connections
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=answer_analysis.warm_up,
+                )
+            return self._executor
+
+    def _discard_executor(self, executor):
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def _release(self, _future=None):
+        with self._lock:
+            self.pending -= 1
+
+    def _submit(self, fn, arg):
+        """
+        Queue fn(arg) on the pool. Returns (future, executor); future is None
+        when the pool is full or down.
+        """
+        with self._lock:
+            if self.pending >= self.max_pending:
+                return None, None
+            self.pending += 1
+        executor = self._get_executor()
+        try:
+            future = executor.submit(fn, arg)
+        except (BrokenProcessPool, RuntimeError):
+            logger.warning("Analysis pool is broken; restarting it")
+            self._discard_executor(executor)
+            self._release()
+            return None, None
+        future.add_done_callback(self._release)
+        return future, executor
+
+    def _fallback(self, reduced_fn, arg, reason):
+        with self._lock:
+            self.fallbacks += 1
+        logger.info("Answer analysis fell back to the reduced check (%s)", reason)
+        return reduced_fn(arg)
+
+    def _wait(self, future, executor, fn, reduced_fn, arg):
+        """Result of a job from _submit, or the reduced check when it can't be had in time."""
+        if self.workers <= 0:
+            return fn(arg)
+        if future is None:
+            return self._fallback(reduced_fn, arg, "saturated")
+        try:
+            return future.result(timeout=self.timeout)
+        except TimeoutError:
+            future.cancel()
+            return self._fallback(reduced_fn, arg, "timeout")
+        except BrokenProcessPool:
+            self._discard_executor(executor)
+            return self._fallback(reduced_fn, arg, "broken pool")
+        except CancelledError:
+            # Still queued when another caller found the pool broken and restarted it
+            return self._fallback(reduced_fn, arg, "cancelled")
+
+    def _run(self, fn, reduced_fn, arg):
+        future, executor = self._submit(fn, arg) if self.workers > 0 else (None, None)
+        return self._wait(future, executor, fn, reduced_fn, arg)
+
+    async def _arun(self, fn, reduced_fn, arg):
+        if self.workers <= 0:
+            return fn(arg)
+        future, executor = self._submit(fn, arg)
+        if future is None:
+            return self._fallback(reduced_fn, arg, "saturated")
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), self.timeout)
+        except asyncio.TimeoutError:
+            return self._fallback(reduced_fn, arg, "timeout")
+        except BrokenProcessPool:
+            self._discard_executor(executor)
+            return self._fallback(reduced_fn, arg, "broken pool")
+        except asyncio.CancelledError:
+            if asyncio.current_task().cancelling():
+                raise  # this request itself was cancelled
+            return self._fallback(reduced_fn, arg, "cancelled")
+
+    def start_analyze(self, answer):
+        """Queue the full analysis of `answer` without waiting for it; see PendingAnalysis."""
+        return PendingAnalysis(self, answer_analysis.analyze, answer_analysis.reduced_analysis, answer)
+
+    def analyze(self, answer):
+        """Blocking variant of aanalyze, for sync callers."""
+        return self._run(answer_analysis.analyze, answer_analysis.reduced_analysis, answer)
+
+    async def aanalyze(self, answer):
+        """Full analysis from a worker process; the reduced check if the pool can't serve it in time."""
+        return await self._arun(answer_analysis.analyze, answer_analysis.reduced_analysis, answer)
+
+    def analyze_batch(self, answers):
+        """Blocking variant of aanalyze_batch."""
+        return self._run(answer_analysis.analyze_batch, answer_analysis.reduced_batch, list(answers))
+
+    async def aanalyze_batch(self, answers):
+        """All answers of a mock interview in one job (see answer_analysis.analyze_batch)."""
+        return await self._arun(answer_analysis.analyze_batch, answer_analysis.reduced_batch, list(answers))
+
+
+class PendingAnalysis:
+    """
+    A job queued by AnalysisPool.start_analyze(), for sync callers that have
+    other work to do (e.g. an LLM call) while it runs. result() waits for it
+    like analyze() does, the timeout counting from that call.
+    """
+
+    def __init__(self, pool, fn, reduced_fn, arg):
+        self._pool = pool
+        self._job = (fn, reduced_fn, arg)
+        self._future, self._executor = pool._submit(fn, arg) if pool.workers > 0 else (None, None)
+
+    def done(self):
+        """True once result() won't block on the worker."""
+        return self._future is None or self._future.done()
+
+    def result(self):
+        return self._pool._wait(self._future, self._executor, *self._job)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_analysis_pool():
+    """Return the process-wide AnalysisPool configured from settings."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = AnalysisPool(
+                    workers=getattr(settings, 'FEEDBACK_WORKERS', 2),
+                    max_pending=getattr(settings, 'FEEDBACK_MAX_PENDING', 32),
+                    timeout=getattr(settings, 'FEEDBACK_TIMEOUT', 5.0),
+                )
+    return _pool
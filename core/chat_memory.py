@@ -0,0 +1,156 @@
+# core/chat_memory.py
+"""
+Chat transcripts and prompt memory for the chat views.
+
+Each turn is appended to ChatMessage as two rows in one bulk insert; the
+Django session only holds the ChatSession id, so transcripts outlive it.
+Messages that fall out of the CHAT_HISTORY_TOKEN_BUDGET window are folded
+into ChatSession.summary by a background job, never on the request path.
+"""
+from django.conf import settings
+
+from ai_interview_coach.ai_llm import summarize_conversation
+from ai_interview_coach.conversation_memory import ConversationMemory
+from . import tasks
+from .models import ChatMessage, ChatSession
+
+CHAT_SESSION_KEY = 'chat_session_id'
+
+
+def get_memory():
+    return ConversationMemory(budget_tokens=settings.CHAT_HISTORY_TOKEN_BUDGET)
+
+
+class ChatContext:
+    """What one chat turn needs to know about the conversation so far."""
+
+    def __init__(self, chat_session_id, history=None, message_ids=None, summary=""):
+        self.chat_session_id = chat_session_id
+        self.history = history or []            # unsummarized messages, oldest first
+        self.message_ids = message_ids or []    # ChatMessage ids, parallel to history
+        self.summary = summary
+
+    def prompt_history(self):
+        """History to send to the model: rolling summary + budgeted recent turns."""
+        return get_memory().prompt_history(self.history, self.summary)
+
+
+def _summary_fields(chat_session_id):
+    return ChatSession.objects.filter(id=chat_session_id).values_list('summary', 'summarized_through')
+
+
+def _tail(chat_session_id, summarized_through):
+    """Newest-first messages the summary doesn't cover, capped at CHAT_HISTORY_MAX_MESSAGES."""
+    return (ChatMessage.objects
+            .filter(session_id=chat_session_id, id__gt=summarized_through)
+            .order_by('-created_at', '-id')
+            .values_list('id', 'role', 'content')[:settings.CHAT_HISTORY_MAX_MESSAGES])
+
+
+def _context(chat_session_id, summary, rows):
+    rows = rows[::-1]
+    return ChatContext(
+        chat_session_id,
+        [{"role": role, "content": content} for _, role, content in rows],
+        [pk for pk, _, _ in rows],
+        summary,
+    )
+
+
+def load(request):
+    """
+    Load the caller's chat, starting a new ChatSession if there is none.
+    The session is only written when a chat is started.
+    """
+    chat_session_id = request.session.get(CHAT_SESSION_KEY)
+    row = _summary_fields(chat_session_id).first() if chat_session_id else None
+    if row is None:
+        user = request.user if request.user.is_authenticated else None
+        chat_session_id = ChatSession.objects.create(user=user).id
+        request.session[CHAT_SESSION_KEY] = chat_session_id
+        return ChatContext(chat_session_id)
+
+    summary, summarized_through = row
+    return _context(chat_session_id, summary, list(_tail(chat_session_id, summarized_through)))
+
+
+async def aload(request):
+    """Async variant of load."""
+    chat_session_id = await request.session.aget(CHAT_SESSION_KEY)
+    row = await _summary_fields(chat_session_id).afirst() if chat_session_id else None
+    if row is None:
+        user = await request.auser()
+        chat = await ChatSession.objects.acreate(user=user if user.is_authenticated else None)
+        await request.session.aset(CHAT_SESSION_KEY, chat.id)
+        return ChatContext(chat.id)
+
+    summary, summarized_through = row
+    rows = [r async for r in _tail(chat_session_id, summarized_through)]
+    return _context(chat_session_id, summary, rows)
+
+
+def _turn_messages(ctx, user_msg, reply):
+    return [
+        ChatMessage(session_id=ctx.chat_session_id, role='user', content=user_msg),
+        ChatMessage(session_id=ctx.chat_session_id, role='assistant', content=reply),
+    ]
+
+
+def _schedule_fold(ctx, created):
+    """Fold whatever no longer fits the prompt window, if anything."""
+    history = ctx.history + [{"role": m.role, "content": m.content} for m in created]
+    ids = ctx.message_ids + [m.pk for m in created]
+    start = get_memory().window_start(history)
+    # pk is None on backends where bulk_create can't return ids; the next turn catches up
+    if start and ids[start - 1] is not None:
+        tasks.submit(fold_messages, ctx.chat_session_id, ids[start - 1],
+                     key=('chat-summary', ctx.chat_session_id))
+
+
+def record_turn(ctx, user_msg, reply):
+    """Append a finished turn to the transcript and fold older turns in the background."""
+    created = ChatMessage.objects.bulk_create(_turn_messages(ctx, user_msg, reply))
+    _schedule_fold(ctx, created)
+
+
+async def arecord_turn(ctx, user_msg, reply):
+    """Async variant of record_turn."""
+    created = await ChatMessage.objects.abulk_create(_turn_messages(ctx, user_msg, reply))
+    _schedule_fold(ctx, created)
+
+
+def reset(session):
+    """Start a fresh chat on the next turn; the old transcript is kept."""
+    session.pop(CHAT_SESSION_KEY, None)
+
+
+async def areset(session):
+    await session.apop(CHAT_SESSION_KEY, None)
+
+
+def fold_messages(chat_session_id, through_id):
+    """
+    Background job: fold the messages up to `through_id` into the session
+    summary, at most CHAT_HISTORY_MAX_MESSAGES per pass. A concurrent fold
+    wins ties.
+    """
+    row = _summary_fields(chat_session_id).first()
+    if row is None:
+        return
+    summary, summarized_through = row
+    if through_id <= summarized_through:
+        return
+
+    pending = list(ChatMessage.objects
+                   .filter(session_id=chat_session_id, id__gt=summarized_through, id__lte=through_id)
+                   .order_by('created_at', 'id')
+                   .values('id', 'role', 'content')[:settings.CHAT_HISTORY_MAX_MESSAGES])
+    if not pending:
+        return
+
+    new_summary = summarize_conversation(summary, pending, settings.CHAT_SUMMARY_MAX_TOKENS)
+    if not new_summary:
+        return
+    ChatSession.objects.filter(id=chat_session_id, summarized_through=summarized_through).update(
+        summary=new_summary, summarized_through=pending[-1]['id'],
+    )
@@ -0,0 +1,180 @@
+# core/daily_quiz.py
+"""
+Question sampling for the daily mission.
+
+Each user walks through the question bank in their own shuffled order,
+without repeats, until it is used up, then starts a new shuffle. The order
+is not stored: position p of a cycle holds question id permute(p) + 1,
+where permute is a keyed bijection of range(queue_size) (a small Feistel
+network, cycle-walked down to the size). queue_size is the highest id when
+the cycle started; newer questions join the next cycle.
+
+Serving five questions is then one primary-key lookup of the ids at the
+next few positions (skipping deleted ones) whatever the size of the bank,
+instead of ORDER BY RANDOM() over every unattempted question. When many
+ids were deleted, each lookup covers more positions than the last (up to
+_MAX_BATCH), so the work per page stays bounded; if the range is too
+sparse even for that, a new cycle starts over the current ids.
+
+Grading a submission is likewise a fixed number of queries however many
+questions were answered: one in_bulk load, then one transaction holding a
+single conditional UPDATE of the mission, one bulk insert of the
+attempted questions, the attempt log (core.quiz_log) and the leaderboard
+update.
+"""
+import random
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Case, F, Max, Q, Value, When
+from django.utils import timezone
+
+from . import leaderboard, quiz_log
+from .models import QuizQuestion, UserDailyMission
+
+QUESTIONS_PER_DAY = 5
+POINTS_PER_CORRECT = 10
+
+# Positions fetched per lookup, as a multiple of the questions still needed;
+# grows _GROWTH-fold between lookups (up to _MAX_BATCH positions) when many
+# ids in the range were deleted
+_OVERFETCH = 2
+_GROWTH = 4
+_MAX_BATCH = 4096
+_MAX_LOOKUPS = 5
+
+_M64 = (1 << 64) - 1
+_ROUNDS = 4
+
+
+def _round(seed, rnd, x):
+    """Keyed round function (a splitmix64 finalizer)."""
+    z = (seed ^ (rnd * 0x9E3779B97F4A7C15) ^ (x * 0xBF58476D1CE4E5B9)) & _M64
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & _M64
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _M64
+    return z ^ (z >> 31)
+
+
+def _half_bits(size):
+    bits = max(2, (size - 1).bit_length())
+    return (bits + 1) // 2
+
+
+def permute(seed, size, index):
+    """Image of `index` under the seed's bijection of range(size)."""
+    half = _half_bits(size)
+    mask = (1 << half) - 1
+    while True:
+        left, right = index >> half, index & mask
+        for rnd in range(_ROUNDS):
+            left, right = right, left ^ (_round(seed, rnd, right) & mask)
+        index = (left << half) | right
+        if index < size:
+            return index
+
+
+def unpermute(seed, size, value):
+    """Inverse of permute: the index that `value` came from."""
+    half = _half_bits(size)
+    mask = (1 << half) - 1
+    while True:
+        left, right = value >> half, value & mask
+        for rnd in reversed(range(_ROUNDS)):
+            left, right = right ^ (_round(seed, rnd, left) & mask), left
+        value = (left << half) | right
+        if value < size:
+            return value
+
+
+def _start_cycle(mission):
+    """Reshuffle over the current bank; attempted questions start over with it."""
+    mission.queue_seed = random.getrandbits(63)
+    mission.queue_size = QuizQuestion.objects.aggregate(top=Max('id'))['top'] or 0
+    mission.queue_cursor = 0
+    mission.save(update_fields=['queue_seed', 'queue_size', 'queue_cursor'])
+    mission.attempted_questions.clear()
+
+
+def _page(mission, count):
+    """The next `count` existing questions from the cursor, in shuffled order."""
+    seed, size = mission.queue_seed, mission.queue_size
+    questions = []
+    position = mission.queue_cursor
+    batch = count * _OVERFETCH
+    for _ in range(_MAX_LOOKUPS):
+        if position >= size or len(questions) == count:
+            break
+        ids = [permute(seed, size, p) + 1 for p in range(position, min(position + batch, size))]
+        found = QuizQuestion.objects.in_bulk(ids)
+        questions += [found[i] for i in ids if i in found][:count - len(questions)]
+        position += len(ids)
+        batch = min(batch * _GROWTH, _MAX_BATCH)
+    return questions
+
+
+def questions_for(mission, count=QUESTIONS_PER_DAY):
+    """Today's questions for a mission: the next page of its shuffle, starting a new one when used up."""
+    if mission.queue_cursor >= mission.queue_size:
+        _start_cycle(mission)
+    questions = _page(mission, count)
+    if len(questions) < count and mission.queue_cursor > 0:
+        # Too few left in this cycle, or too sparse to find them in
+        # _MAX_LOOKUPS: reshuffle rather than serve a short quiz
+        _start_cycle(mission)
+        questions = _page(mission, count)
+    return questions
+
+
+def next_cursor(mission, question_ids):
+    """Cursor after the answered questions, so they are not served again this cycle."""
+    cursor = mission.queue_cursor
+    for qid in question_ids:
+        if 0 < qid <= mission.queue_size:
+            cursor = max(cursor, unpermute(mission.queue_seed, mission.queue_size, qid - 1) + 1)
+    return cursor
+
+
+def grade(mission, answers):
+    """
+    Grade a submission ({question id: "A".."D"}, e.g. request.POST) and
+    record it on the mission: score, 10 points per correct answer, streak,
+    attempted questions. Returns (score, ids answered correctly), or None
+    if the mission was already graded in the last 24 hours (a double submit).
+    """
+    submitted = {}
+    for key, answer in answers.items():
+        try:
+            submitted[int(key)] = answer
+        except (TypeError, ValueError):
+            continue  # csrfmiddlewaretoken and anything else that isn't a question
+
+    questions = QuizQuestion.objects.in_bulk(list(submitted))
+    correct_ids = [qid for qid, q in questions.items() if submitted[qid] == q.correct_answer]
+    score = len(correct_ids)
+
+    now = timezone.now()
+    today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    with transaction.atomic():
+        updated = UserDailyMission.objects.filter(
+            Q(last_attempt__isnull=True) | Q(last_attempt__lte=now - timedelta(hours=24)), pk=mission.pk,
+        ).update(
+            score=score,
+            total_points=F('total_points') + score * POINTS_PER_CORRECT,
+            # Attempted yesterday: the streak continues, otherwise it restarts
+            streak=Case(
+                When(last_attempt__gte=today - timedelta(days=1), last_attempt__lt=today, then=F('streak') + 1),
+                default=Value(1),
+            ),
+            last_attempt=now,
+            queue_cursor=next_cursor(mission, questions),
+        )
+        if not updated:
+            return None
+        Attempt = UserDailyMission.attempted_questions.through
+        Attempt.objects.bulk_create(
+            [Attempt(userdailymission_id=mission.pk, quizquestion_id=qid) for qid in questions],
+            ignore_conflicts=True,
+        )
+        quiz_log.record(mission.user_id, [(qid, qid in correct_ids) for qid in questions], now, POINTS_PER_CORRECT)
+        leaderboard.record(mission)
+    return score, correct_ids
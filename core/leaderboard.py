@@ -0,0 +1,119 @@
+# core/leaderboard.py
+"""
+Daily mission leaderboard, materialized in LeaderboardEntry.
+
+Players are ordered by total points, then earliest last attempt, then user
+id, and every row stores its position in `rank` (indexed). Reading the top
+K, a user's rank or the players around them is then an index range read,
+not a sort of the whole mission table.
+
+Ranks are maintained incrementally when a mission is graded: the entry
+moves from its old rank to the new one and only the rows in between shift
+by one, in a constant number of queries inside the grading transaction.
+Updates hold the LeaderboardLock row for the rest of that transaction, so
+two gradings never compute ranks from each other's half-shifted rows.
+`manage.py rebuild_leaderboard` recomputes everything from the missions
+(migration 0022 did so once on deploy).
+
+The rendered top of the board is cached (SCOREBOARD_CACHE_SECONDS) and
+dropped whenever a score changes.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.core.cache.utils import make_template_fragment_key
+from django.db import transaction
+from django.db.models import F, Max, Q
+
+from .models import LeaderboardEntry, LeaderboardLock, UserDailyMission
+
+TOP_SIZE = 10
+NEIGHBOURS = 2
+
+# Name of the {% cache %} fragment in scoreboard.html
+CACHE_FRAGMENT = 'scoreboard_top'
+
+_FIELDS = ('score', 'total_points', 'streak', 'last_attempt')
+LOCK_ID = 1
+
+
+def cache_seconds():
+    return getattr(settings, 'SCOREBOARD_CACHE_SECONDS', 60)
+
+
+def invalidate():
+    cache.delete(make_template_fragment_key(CACHE_FRAGMENT))
+
+
+def _lock():
+    """Hold the leaderboard lock until the surrounding transaction ends."""
+    LeaderboardLock.objects.select_for_update().get_or_create(pk=LOCK_ID)
+
+
+def _ahead_of(user_id, total_points, last_attempt):
+    """Entries ranked above a player with these values."""
+    return LeaderboardEntry.objects.filter(
+        Q(total_points__gt=total_points)
+        | Q(total_points=total_points, last_attempt__lt=last_attempt)
+        | Q(total_points=total_points, last_attempt=last_attempt, user_id__lt=user_id)
+    ).exclude(user_id=user_id)
+
+
+def record(mission):
+    """Move the mission's player to their new rank; call after their score changed."""
+    # No savepoint: grading already runs this inside its transaction
+    with transaction.atomic(savepoint=False):
+        _lock()
+        values = UserDailyMission.objects.filter(pk=mission.pk).values(
+            'user_id', 'user__username', 'user__leaderboard_entry__rank', *_FIELDS).get()
+        user_id, old_rank = values['user_id'], values['user__leaderboard_entry__rank']
+        fields = dict({f: values[f] for f in _FIELDS}, username=values['user__username'])
+        new_rank = _ahead_of(user_id, values['total_points'], values['last_attempt']).count() + 1
+
+        if old_rank is None:
+            LeaderboardEntry.objects.filter(rank__gte=new_rank).update(rank=F('rank') + 1)
+            LeaderboardEntry.objects.create(user_id=user_id, rank=new_rank, **fields)
+        else:
+            if new_rank < old_rank:
+                LeaderboardEntry.objects.filter(rank__gte=new_rank, rank__lt=old_rank).update(rank=F('rank') + 1)
+            elif new_rank > old_rank:
+                LeaderboardEntry.objects.filter(rank__gt=old_rank, rank__lte=new_rank).update(rank=F('rank') - 1)
+            LeaderboardEntry.objects.filter(user_id=user_id).update(rank=new_rank, **fields)
+        # After commit, so a concurrent request can't re-cache the old board
+        transaction.on_commit(invalidate)
+    return new_rank
+
+
+def top(k=TOP_SIZE):
+    return LeaderboardEntry.objects.filter(rank__lte=k).order_by('rank')
+
+
+def around(user, neighbours=NEIGHBOURS):
+    """(user's entry or None, entries within `neighbours` ranks of it, number of players)."""
+    rank = LeaderboardEntry.objects.filter(user=user).values_list('rank', flat=True).first()
+    if rank is None:
+        return None, [], 0
+    nearby = list(LeaderboardEntry.objects.filter(rank__gte=rank - neighbours, rank__lte=rank + neighbours).order_by('rank'))
+    players = LeaderboardEntry.objects.aggregate(last=Max('rank'))['last'] or 0
+    entry = next((e for e in nearby if e.user_id == user.pk), None)
+    return entry, nearby, players
+
+
+def rebuild():
+    """Recompute every entry from the missions. Returns the number of players."""
+    with transaction.atomic():
+        _lock()
+        missions = (UserDailyMission.objects.filter(last_attempt__isnull=False)
+                    .order_by('-total_points', 'last_attempt', 'user_id')
+                    .values('user_id', 'user__username', *_FIELDS))
+        entries, seen = [], set()
+        for values in missions.iterator():
+            if values['user_id'] in seen:  # a user with several missions keeps their best
+                continue
+            seen.add(values['user_id'])
+            entries.append(LeaderboardEntry(
+                user_id=values['user_id'], username=values['user__username'], rank=len(entries) + 1,
+                **{f: values[f] for f in _FIELDS}))
+        LeaderboardEntry.objects.all().delete()
+        LeaderboardEntry.objects.bulk_create(entries, batch_size=1000)
+        transaction.on_commit(invalidate)
+    return len(entries)
@@ -0,0 +1,21 @@
+# core/management/commands/backfill_user_stats.py
+from django.core.management.base import BaseCommand
+
+from core import user_stats
+from core.models import InterviewSession, UserStats
+
+
+class Command(BaseCommand):
+    help = "Compute the profile stats (UserStats) of every user with interview sessions from their sessions."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--missing", action="store_true", help="Only users who have no stats row yet.")
+
+    def handle(self, *args, **options):
+        users = InterviewSession.objects.values_list("user_id", flat=True).distinct()
+        if options["missing"]:
+            users = users.exclude(user_id__in=UserStats.objects.values("user_id"))
+        user_ids = list(users.order_by("user_id"))
+        for user_id in user_ids:
+            user_stats.recompute(user_id)
+        self.stdout.write(f"Stats computed for {len(user_ids)} user(s)")
@@ -0,0 +1,59 @@
+# core/management/commands/bench_chat_concurrency.py
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+
+from ai_interview_coach import ai_llm
+from ai_interview_coach.fake_ollama import FakeOllamaServer
+
+
+class Command(BaseCommand):
+    help = "Compare how many concurrent chat users the sync and async LLM paths can serve at a fixed worker count."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=200, help="Concurrent users, one chat turn each.")
+        parser.add_argument("--workers", type=int, default=8, help="Sync worker threads (async uses a single event loop).")
+        parser.add_argument("--ttft", type=float, default=0.5, help="Fake model time to first token, in seconds.")
+        parser.add_argument("--token-latency", type=float, default=0.03, help="Fake model seconds per token.")
+        parser.add_argument("--cassette", help="Replay recorded exchanges (with their timing) instead of canned replies.")
+
+    def handle(self, *args, **options):
+        users, workers = options["users"], options["workers"]
+
+        server = FakeOllamaServer(
+            ttft=options["ttft"], token_latency=options["token_latency"],
+            cassette=options["cassette"], mode="replay" if options["cassette"] else None,
+            replay_timing=bool(options["cassette"]),
+        ).start()
+        ai_llm.OLLAMA_URL = server.url
+
+        self.stdout.write(f"{users} users, fake model at {server.url}, {workers} sync workers vs 1 event loop\n")
+        self.stdout.write(f"{'path':<8}{'wall (s)':>10}{'turns/s':>10}{'peak in flight':>16}")
+
+        try:
+            server.reset_stats()
+            ai_llm.get_response_cache().clear()
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                list(pool.map(lambda i: ai_llm.chat_with_model([], f"user {i}"), range(users)))
+            self._report("sync", time.perf_counter() - start, users, server.peak_in_flight)
+
+            server.reset_stats()
+            ai_llm.get_response_cache().clear()
+            start = time.perf_counter()
+            asyncio.run(self._run_async(users))
+            self._report("async", time.perf_counter() - start, users, server.peak_in_flight)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    async def _run_async(self, users):
+        try:
+            await asyncio.gather(*(ai_llm.achat_with_model([], f"user {i}") for i in range(users)))
+        finally:
+            await ai_llm.get_async_client().aclose()
+
+    def _report(self, name, wall, users, peak):
+        self.stdout.write(f"{name:<8}{wall:>10.2f}{users / wall:>10.1f}{peak:>16}")
@@ -0,0 +1,76 @@
+# core/management/commands/bench_conversation_memory.py
+import random
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from ai_interview_coach import ai_llm
+from ai_interview_coach.conversation_memory import CHARS_PER_TOKEN, ConversationMemory
+from ai_interview_coach.fake_ollama import FakeOllamaServer
+
+WORDS = (
+    "design service latency cache database index query team deadline customer feature release "
+    "testing pipeline monitoring incident rollback tradeoff python django api queue worker scale "
+    "memory thread process network security review mentor estimate requirement stakeholder"
+).split()
+
+
+def _text(rng, words):
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+
+class Command(BaseCommand):
+    help = ("Measure prompt tokens and prompt latency per turn on a long chat session: "
+            "the old history[-40:] window vs token-budgeted memory with a rolling summary.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--turns", type=int, default=40)
+        parser.add_argument("--answer-words", type=int, default=90, help="Words per candidate answer.")
+        parser.add_argument("--reply-words", type=int, default=60, help="Words per coach reply.")
+        parser.add_argument("--prompt-eval-latency", type=float, default=0.001,
+                            help="Fake model seconds per prompt token (0.001 = 1000 tok/s).")
+
+    def handle(self, *args, **options):
+        rng = random.Random(7)
+        memory = ConversationMemory(settings.CHAT_HISTORY_TOKEN_BUDGET)
+        # Worst case for the new path: the summary is always at its full size
+        summary = _text(rng, int(settings.CHAT_SUMMARY_MAX_TOKENS * CHARS_PER_TOKEN / 7))
+
+        server = FakeOllamaServer(prompt_eval_latency=options["prompt_eval_latency"]).start()
+        client = ai_llm.LLMClient(base_url=server.url)
+
+        def measure(history, user_msg):
+            messages = ai_llm._build_messages(history, user_msg, "Software", "Medium", "")
+            start = time.perf_counter()
+            data = client.request_json("/api/chat", {"model": ai_llm.MODEL_NAME, "messages": messages})
+            return data["prompt_eval_count"], time.perf_counter() - start
+
+        self.stdout.write(f"{'turn':>5}{'old tokens':>12}{'new tokens':>12}{'old s':>8}{'new s':>8}")
+        history = []
+        totals = [0, 0, 0.0, 0.0]
+        try:
+            for turn in range(1, options["turns"] + 1):
+                user_msg = _text(rng, options["answer_words"])
+
+                old_tokens, old_s = measure(history[-40:], user_msg)
+                start = memory.window_start(history)
+                new_history = memory.prompt_history(history[start:], summary if start else "")
+                new_tokens, new_s = measure(new_history, user_msg)
+
+                for i, value in enumerate((old_tokens, new_tokens, old_s, new_s)):
+                    totals[i] += value
+                if turn % 5 == 0 or turn == 1:
+                    self.stdout.write(f"{turn:>5}{old_tokens:>12}{new_tokens:>12}{old_s:>8.2f}{new_s:>8.2f}")
+
+                history += [{"role": "user", "content": user_msg},
+                            {"role": "assistant", "content": _text(rng, options["reply_words"])}]
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        turns = options["turns"]
+        self.stdout.write(
+            f"\nmean per turn: {totals[0] / turns:.0f} -> {totals[1] / turns:.0f} prompt tokens "
+            f"({1 - totals[1] / totals[0]:.0%} fewer), {totals[2] / turns:.2f}s -> {totals[3] / turns:.2f}s"
+        )
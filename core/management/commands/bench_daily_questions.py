@@ -0,0 +1,65 @@
+# core/management/commands/bench_daily_questions.py
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from core import daily_quiz
+from core.models import QuizQuestion, UserDailyMission
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = ("Time daily mission question sampling (ORDER BY RANDOM() against the shuffled cursor) "
+            "on a synthetic question bank. Runs in a transaction that is rolled back.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--questions", type=int, default=200_000)
+        parser.add_argument("--attempted", type=int, default=5_000, help="Questions the user has already attempted.")
+        parser.add_argument("--repeat", type=int, default=20)
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self._run(options)
+                raise Rollback
+        except Rollback:
+            pass
+
+    def _run(self, options):
+        QuizQuestion.objects.bulk_create(
+            [QuizQuestion(question=f"Question {i}", option_a="a", option_b="b", option_c="c", option_d="d",
+                          correct_answer="A") for i in range(options["questions"])],
+            batch_size=5000,
+        )
+        user = User.objects.create(username="bench-daily-questions")
+        mission = UserDailyMission.objects.create(user=user)
+        ids = list(QuizQuestion.objects.values_list("id", flat=True)[:options["attempted"]])
+        mission.attempted_questions.add(*ids)
+        daily_quiz.questions_for(mission)  # start the shuffle outside the timings
+
+        def order_by_random():
+            questions = QuizQuestion.objects.exclude(id__in=mission.attempted_questions.all()).order_by("?")[:5]
+            questions.count()
+            return list(questions)
+
+        def shuffled_cursor():
+            questions = daily_quiz.questions_for(mission)
+            mission.queue_cursor = daily_quiz.next_cursor(mission, [q.id for q in questions])
+            return questions
+
+        self.stdout.write(f"{options['questions']} questions, {options['attempted']} attempted\n")
+        self.stdout.write(f"{'sampler':<18}{'per request':>12}{'queries':>9}")
+        for name, sample in (("ORDER BY RANDOM()", order_by_random), ("shuffled cursor", shuffled_cursor)):
+            with CaptureQueriesContext(connection) as queries:
+                start = time.perf_counter()
+                for _ in range(options["repeat"]):
+                    sample()
+                elapsed = time.perf_counter() - start
+            self.stdout.write(f"{name:<18}{elapsed * 1000 / options['repeat']:>10.2f}ms"
+                              f"{len(queries.captured_queries) / options['repeat']:>9.1f}")
@@ -0,0 +1,81 @@
+# core/management/commands/bench_kv_reuse.py
+import random
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from ai_interview_coach import ai_llm
+from ai_interview_coach.conversation_memory import ConversationMemory
+from ai_interview_coach.fake_ollama import FakeOllamaServer
+
+WORDS = (
+    "design service latency cache database index query team deadline customer feature release "
+    "testing pipeline monitoring incident rollback tradeoff python django api queue worker scale"
+).split()
+
+
+def _text(rng, words):
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+
+class Command(BaseCommand):
+    help = ("Prompt tokens Ollama actually evaluates per chat turn when it can reuse its KV cache: "
+            "a window sliding every turn vs a stepped window vs /api/generate with carried context.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--turns", type=int, default=30)
+        parser.add_argument("--answer-words", type=int, default=90)
+        parser.add_argument("--prompt-eval-latency", type=float, default=0.001,
+                            help="Fake model seconds per evaluated prompt token.")
+
+    def handle(self, *args, **options):
+        server = FakeOllamaServer(prompt_eval_latency=options["prompt_eval_latency"], kv_slots=1).start()
+        ai_llm.OLLAMA_URL = server.url
+        settings.LLM_CACHE_ENABLED = False
+        budget = settings.CHAT_HISTORY_TOKEN_BUDGET
+
+        try:
+            server.kv_slots = 0
+            results = {"no KV reuse": self.run_chat(server, ConversationMemory(budget, keep_ratio=1.0), options)}
+            server.kv_slots = 1
+            results.update({
+                "sliding window": self.run_chat(server, ConversationMemory(budget, keep_ratio=1.0), options),
+                "stepped window": self.run_chat(server, ConversationMemory(budget), options),
+                "generate+context": self.run_generate(server, options),
+            })
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        self.stdout.write(f"{'mode':<18}{'prompt tokens/turn':>20}{'prompt ms/turn':>16}{'turn 20+ tokens':>17}")
+        for mode, turns in results.items():
+            late = turns[19:] or turns
+            self.stdout.write(
+                f"{mode:<18}{sum(t['prompt_eval_count'] for t in turns) / len(turns):>20.0f}"
+                f"{sum(t['prompt_eval_ms'] for t in turns) / len(turns):>16.0f}"
+                f"{sum(t['prompt_eval_count'] for t in late) / len(late):>17.0f}"
+            )
+
+    def run_chat(self, server, memory, options):
+        rng = random.Random(7)
+        server.reset_stats()
+        history, turns = [], []
+        for _ in range(options["turns"]):
+            user_msg = _text(rng, options["answer_words"])
+            window = history[memory.window_start(history):]
+            metrics = {}
+            reply = ai_llm.chat_with_model(window, user_msg, "Software", "Medium", "", metrics)
+            turns.append(metrics)
+            history += [{"role": "user", "content": user_msg}, {"role": "assistant", "content": reply}]
+        return turns
+
+    def run_generate(self, server, options):
+        rng = random.Random(7)
+        server.reset_stats()
+        system = ai_llm.system_prompt("Software", "Medium", "")
+        context, turns = None, []
+        for _ in range(options["turns"]):
+            result = ai_llm.generate_with_context(_text(rng, options["answer_words"]), context, system)
+            context = result["context"]
+            turns.append(result["metrics"])
+        return turns
@@ -0,0 +1,86 @@
+# core/management/commands/bench_resume_sections.py
+import random
+import re
+import time
+
+from django.core.management.base import BaseCommand
+
+from ai_interview_coach.resume_parser import HEADER_SYNONYMS, parse_sections
+
+
+def _regex_parse_sections(raw):
+    """parse_sections as it was before the synonym scanner, for comparison."""
+    text = raw.replace("\r", "\n")
+    text = re.sub(r"\n{2,}", "\n\n", text)
+
+    headers = ["education", "skills", "projects", "experience"]
+    patt = r"^(?P<header>" + r"|".join(headers) + r")\b"
+
+    lines = text.split("\n")
+    sections = {"misc": []}
+    current = "misc"
+
+    for ln in lines:
+        ln_norm = ln.strip().lower()
+        m = re.match(patt, ln_norm)
+        if m:
+            current = m.group("header")
+            sections.setdefault(current, [])
+        else:
+            sections[current].append(ln)
+
+    return {k: "\n".join(v).strip() for k, v in sections.items() if v}
+
+
+_BODY = [
+    "Built a REST API in Django serving 2M requests per day",
+    "Experience with Kubernetes, Terraform and AWS",  # starts like a header, isn't one
+    "Led a team of 4 engineers through a platform migration",
+    "Skills gained: stakeholder management, budgeting",
+    "- Reduced page load time by 40% by caching query results",
+    "Education outreach volunteer at the local library",
+    "Python, SQL, Docker, React, PostgreSQL",
+    "",
+]
+
+
+def _header_line(rng, name):
+    name = rng.choice((name, name.upper(), name.title()))
+    return rng.choice(("{}", "{}:", "## {}", "**{}**", "{} -", "1. {}")).format(name)
+
+
+def _resume(rng, lines):
+    """Synthetic resume of about `lines` lines; returns (text, sections in it)."""
+    out, expected = ["Jane Doe", "jane@example.com"], set()
+    sections = list(HEADER_SYNONYMS)
+    while len(out) < lines:
+        section = rng.choice(sections)
+        expected.add(section)
+        out.append(_header_line(rng, rng.choice(HEADER_SYNONYMS[section])))
+        out.extend(rng.choice(_BODY) for _ in range(rng.randint(5, 40)))
+    return "\n".join(out), expected
+
+
+class Command(BaseCommand):
+    help = "Time the single-pass synonym section scanner against the old regex parse_sections on large synthetic resumes."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--resumes", type=int, default=200)
+        parser.add_argument("--lines", type=int, default=2000, help="Lines per resume.")
+
+    def handle(self, *args, **options):
+        rng = random.Random(7)
+        corpus = [_resume(rng, options["lines"]) for _ in range(options["resumes"])]
+        size = sum(len(text) for text, _ in corpus)
+        self.stdout.write(f"{len(corpus)} resumes, {size / 1e6:.1f} MB\n")
+        self.stdout.write(f"{'parser':<16}{'total':>10}{'per resume':>12}{'MB/s':>8}{'sections found':>16}")
+
+        for name, parse in (("regex (old)", _regex_parse_sections), ("synonym trie", parse_sections)):
+            start = time.perf_counter()
+            results = [parse(text) for text, _ in corpus]
+            elapsed = time.perf_counter() - start
+
+            found = sum(len(expected & set(result)) for (_, expected), result in zip(corpus, results))
+            total = sum(len(expected) for _, expected in corpus)
+            self.stdout.write(f"{name:<16}{elapsed * 1000:>8.0f}ms{elapsed * 1000 / len(corpus):>10.2f}ms"
+                              f"{size / 1e6 / elapsed:>8.1f}{100 * found / total:>15.0f}%")
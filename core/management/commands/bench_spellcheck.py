@@ -0,0 +1,60 @@
+# core/management/commands/bench_spellcheck.py
+import random
+import time
+
+from django.core.management.base import BaseCommand
+from textblob import TextBlob
+
+from ai_interview_coach.spellcheck import DOMAIN_WORDS, get_spell_checker, load_word_counts
+
+
+def _misspell(rng, word):
+    i = rng.randrange(len(word))
+    op = rng.choice(("drop", "swap", "double"))
+    if op == "drop":
+        return word[:i] + word[i + 1:]
+    if op == "swap" and i < len(word) - 1:
+        return word[:i] + word[i + 1] + word[i] + word[i + 2:]
+    return word[:i] + word[i] + word[i:]
+
+
+class Command(BaseCommand):
+    help = "Time the old TextBlob.correct() feedback path against the SymSpell checker on 50/300/1000-word answers."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", default="50,300,1000")
+        parser.add_argument("--typo-rate", type=float, default=0.05, help="Share of longer words misspelled.")
+        parser.add_argument("--jargon-rate", type=float, default=0.05,
+                            help="Share of tech terms (unknown to TextBlob's dictionary).")
+
+    def handle(self, *args, **options):
+        rng = random.Random(11)
+        counts = load_word_counts()
+        vocab = [w for w, n in sorted(counts.items(), key=lambda kv: -kv[1])[:3000] if len(w) > 2]
+        jargon = [w for w in DOMAIN_WORDS if w not in counts]
+
+        start = time.perf_counter()
+        checker = get_spell_checker()
+        self.stdout.write(f"index build: {time.perf_counter() - start:.2f}s, {len(checker.deletes)} delete keys\n")
+        self.stdout.write(f"{'words':>6}{'TextBlob.correct':>18}{'symspell cold':>15}{'symspell warm':>15}{'flagged':>9}")
+
+        for size in (int(s) for s in options["sizes"].split(",")):
+            words = [rng.choice(jargon) if rng.random() < options["jargon_rate"] else rng.choice(vocab)
+                     for _ in range(size)]
+            words = [_misspell(rng, w) if len(w) > 4 and rng.random() < options["typo_rate"] else w for w in words]
+            answer = " ".join(words)
+
+            start = time.perf_counter()
+            [str(c) for c in TextBlob(answer).correct().split() if c not in answer.split()]
+            old = time.perf_counter() - start
+
+            checker.suggest.cache_clear()
+            start = time.perf_counter()
+            issues = checker.check(answer)
+            cold = time.perf_counter() - start
+
+            start = time.perf_counter()
+            checker.check(answer)
+            warm = time.perf_counter() - start
+
+            self.stdout.write(f"{size:>6}{old * 1000:>16.0f}ms{cold * 1000:>13.1f}ms{warm * 1000:>13.2f}ms{len(issues):>9}")
@@ -0,0 +1,27 @@
+# core/management/commands/check_user_stats.py
+from django.core.management.base import BaseCommand, CommandError
+
+from core import user_stats
+
+
+class Command(BaseCommand):
+    help = "Compare the stored profile stats (UserStats) with a fresh computation from the sessions."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", type=int, action="append", dest="users", help="Only this user id (repeatable).")
+        parser.add_argument("--fix", action="store_true", help="Recompute the rows that differ.")
+
+    def handle(self, *args, **options):
+        problems = user_stats.check(set(options["users"]) if options["users"] else None)
+        for user_id, field, stored, actual in problems:
+            self.stdout.write(f"user {user_id}: {field} stored={stored} actual={actual}")
+
+        users = sorted({user_id for user_id, *_ in problems})
+        if options["fix"]:
+            for user_id in users:
+                user_stats.recompute(user_id)
+            self.stdout.write(f"{len(users)} user(s) recomputed")
+        elif users:
+            raise CommandError(f"{len(users)} user(s) with stale stats; run with --fix to recompute them")
+        else:
+            self.stdout.write("All stats consistent")
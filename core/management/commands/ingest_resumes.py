@@ -0,0 +1,25 @@
+# core/management/commands/ingest_resumes.py
+from django.core.management.base import BaseCommand
+
+from core import resume_ingest
+from core.models import Resume
+
+
+class Command(BaseCommand):
+    help = "Parse resumes whose ingestion job never ran (pending), e.g. after a restart or for older uploads."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--retry-failed", action="store_true", help="Also retry resumes that failed to parse.")
+        parser.add_argument("--stuck", action="store_true",
+                            help="Also take resumes left in 'processing' (only when no server is running jobs).")
+
+    def handle(self, *args, **options):
+        statuses = [Resume.PENDING]
+        if options["retry_failed"]:
+            statuses.append(Resume.FAILED)
+        if options["stuck"]:
+            statuses.append(Resume.PROCESSING)
+
+        ids = list(Resume.objects.filter(status__in=statuses).order_by("uploaded_at").values_list("pk", flat=True))
+        ready = sum(resume_ingest.ingest(pk, statuses) for pk in ids)
+        self.stdout.write(f"{len(ids)} resume(s) processed, {ready} ready, {len(ids) - ready} failed or skipped")
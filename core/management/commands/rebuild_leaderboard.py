@@ -0,0 +1,13 @@
+# core/management/commands/rebuild_leaderboard.py
+from django.core.management.base import BaseCommand
+
+from core import leaderboard
+
+
+class Command(BaseCommand):
+    help = ("Recompute the materialized daily mission leaderboard from the missions "
+            "(first deploy, or after users were deleted or scores edited by hand).")
+
+    def handle(self, *args, **options):
+        players = leaderboard.rebuild()
+        self.stdout.write(f"Leaderboard rebuilt: {players} player(s) ranked")
@@ -0,0 +1,12 @@
+# core/management/commands/rebuild_quiz_rollups.py
+from django.core.management.base import BaseCommand
+
+from core import quiz_log
+
+
+class Command(BaseCommand):
+    help = "Recompute the daily, weekly and monthly daily-mission rollups from the quiz attempt log."
+
+    def handle(self, *args, **options):
+        daily, weekly, monthly = quiz_log.rebuild()
+        self.stdout.write(f"Rollups rebuilt: {daily} daily, {weekly} weekly and {monthly} monthly row(s)")
@@ -0,0 +1,36 @@
+# core/management/commands/refill_question_pool.py
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core import question_pool
+
+
+class Command(BaseCommand):
+    help = "Top up the mock interview question pool (once, or continuously with --loop)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--field", help="Only this field (default: every key already in the pool).")
+        parser.add_argument("--difficulty", default="", help="Difficulty for --field (default: Any).")
+        parser.add_argument("--tag", default="", help="Tag for --field.")
+        parser.add_argument("--target", type=int, default=settings.QUESTION_POOL_HIGH_WATERMARK,
+                            help="Questions to keep per key.")
+        parser.add_argument("--loop", type=int, metavar="SECONDS", help="Keep running, refilling every SECONDS.")
+
+    def handle(self, *args, **options):
+        while True:
+            if options["field"]:
+                keys = [question_pool.normalize_key(options["field"], options["difficulty"], options["tag"])]
+            else:
+                keys = question_pool.active_keys()
+
+            for field, difficulty, tag in keys:
+                before = question_pool.unseen_count(None, field, difficulty, tag)
+                question_pool.refill(field, difficulty, tag, target=options["target"])
+                after = question_pool.unseen_count(None, field, difficulty, tag)
+                self.stdout.write(f"{field} / {difficulty} / {tag or '-'}: {before} -> {after}")
+
+            if not options["loop"]:
+                break
+            time.sleep(options["loop"])
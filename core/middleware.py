@@ -1,17 +1,21 @@
-from django.contrib.sessions.backends.base import UpdateError
+from django.contrib.sessions.exceptions import SessionInterrupted
+from django.contrib.sessions.middleware import SessionMiddleware
 
-class IgnoreSessionUpdateErrorMiddleware:
+class InterruptedSessionTolerantMiddleware(SessionMiddleware):
     """
-    Ignore session UpdateError (forced update did not affect any rows)
+    Replacement for django's SessionMiddleware (list it in its place in
+    MIDDLEWARE, not next to it) that saves the session once, only when it
+    was modified, like SessionMiddleware does.
+
+    The one difference: when the session row was deleted while the request
+    ran (e.g. a concurrent logout), SessionMiddleware raises
+    SessionInterrupted and the client gets a 400. Here the view's response
+    is returned as is: the request's session changes are dropped and no
+    session cookie is set, so the next request starts a fresh session.
     """
-    def __init__(self, get_response):
-        self.get_response = get_response
 
-    def __call__(self, request):
-        response = self.get_response(request)
+    def process_response(self, request, response):
         try:
-            if hasattr(request, 'session'):
-                request.session.save()
-        except UpdateError:
-            pass
-        return response
+            return super().process_response(request, response)
+        except SessionInterrupted:
+            return response
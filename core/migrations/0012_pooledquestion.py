@@ -0,0 +1,31 @@
+# Generated by Django 5.2.11 on 2026-10-18 20:03
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_alter_feedback_user'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PooledQuestion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('field', models.CharField(max_length=100)),
+                ('difficulty', models.CharField(max_length=20)),
+                ('tag', models.CharField(blank=True, max_length=100)),
+                ('text', models.TextField()),
+                ('text_hash', models.CharField(max_length=64)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('seen_by', models.ManyToManyField(blank=True, related_name='seen_pool_questions', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('field', 'difficulty', 'tag', 'text_hash'), name='unique_pooled_question')],
+            },
+        ),
+    ]
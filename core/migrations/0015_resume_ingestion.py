@@ -0,0 +1,38 @@
+# Generated by Django 5.2.11 on 2026-10-18 20:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0013_chatsession_summary_chatmessage_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resume',
+            name='error',
+            field=models.TextField(blank=True),
+        ),
+        migrations.AddField(
+            model_name='resume',
+            name='processed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='resume',
+            name='sections',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name='resume',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('processing', 'Processing'), ('ready', 'Ready'), ('failed', 'Failed')], default='pending', max_length=12),
+        ),
+        migrations.AddField(
+            model_name='resume',
+            name='summary',
+            field=models.TextField(blank=True),
+        ),
+    ]
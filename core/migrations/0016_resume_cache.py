@@ -0,0 +1,39 @@
+# Generated by Django 5.2.11 on 2026-10-18 20:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0015_resume_ingestion'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResumeCache',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('content_hash', models.CharField(max_length=64, unique=True)),
+                ('parsed_text', models.TextField(blank=True)),
+                ('sections', models.JSONField(blank=True, default=dict)),
+                ('skills', models.TextField(blank=True)),
+                ('summary', models.TextField(blank=True)),
+                ('questions', models.JSONField(blank=True, default=dict)),
+                ('hits', models.PositiveIntegerField(default=0)),
+                ('question_hits', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('last_used_at', models.DateTimeField(auto_now=True, db_index=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='resume',
+            name='cache_hit',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='resume',
+            name='content_hash',
+            field=models.CharField(blank=True, max_length=64),
+        ),
+    ]
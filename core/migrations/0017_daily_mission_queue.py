@@ -0,0 +1,28 @@
+# Generated by Django 5.2.11 on 2026-10-18 20:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0016_resume_cache'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userdailymission',
+            name='queue_cursor',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='userdailymission',
+            name='queue_seed',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='userdailymission',
+            name='queue_size',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.11 on 2026-10-18 20:52
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('core', '0017_daily_mission_queue'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LeaderboardEntry',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='leaderboard_entry', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('username', models.CharField(max_length=150)),
+                ('score', models.IntegerField(default=0)),
+                ('total_points', models.IntegerField(default=0)),
+                ('streak', models.IntegerField(default=0)),
+                ('last_attempt', models.DateTimeField(blank=True, null=True)),
+                ('rank', models.PositiveIntegerField(db_index=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['-total_points', 'last_attempt'], name='leaderboard_order')],
+            },
+        ),
+    ]
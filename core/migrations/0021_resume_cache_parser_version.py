@@ -0,0 +1,18 @@
+# Generated by Django 5.2.11 on 2026-10-18 21:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0020_user_stats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resumecache',
+            name='parser_version',
+            field=models.CharField(blank=True, max_length=32),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.11 on 2026-10-18 21:26
+
+from django.db import migrations, models
+
+
+LOCK_ID = 1
+
+
+def backfill_leaderboard(apps, schema_editor):
+    """The lock row, and the entries of players who graded before LeaderboardEntry existed."""
+    LeaderboardEntry = apps.get_model('core', 'LeaderboardEntry')
+    UserDailyMission = apps.get_model('core', 'UserDailyMission')
+    apps.get_model('core', 'LeaderboardLock').objects.get_or_create(pk=LOCK_ID)
+
+    fields = ('score', 'total_points', 'streak', 'last_attempt')
+    missions = (UserDailyMission.objects.filter(last_attempt__isnull=False)
+                .order_by('-total_points', 'last_attempt', 'user_id')
+                .values('user_id', 'user__username', *fields))
+    entries, seen = [], set()
+    for values in missions.iterator():
+        if values['user_id'] in seen:  # a user with several missions keeps their best
+            continue
+        seen.add(values['user_id'])
+        entries.append(LeaderboardEntry(
+            user_id=values['user_id'], username=values['user__username'], rank=len(entries) + 1,
+            **{f: values[f] for f in fields}))
+    LeaderboardEntry.objects.all().delete()
+    LeaderboardEntry.objects.bulk_create(entries, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0021_resume_cache_parser_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LeaderboardLock',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+            ],
+        ),
+        migrations.RunPython(backfill_leaderboard, migrations.RunPython.noop),
+    ]
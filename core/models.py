@@ -7,11 +7,14 @@ from django.contrib.auth.models import User
 # Chat Models
 # --------------------------
 class ChatSession(models.Model):
-    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    # Rolling summary of the turns that no longer fit the prompt budget
+    summary = models.TextField(blank=True)
+    summarized_through = models.PositiveIntegerField(default=0)  # id of the last ChatMessage folded into `summary`
 
     def __str__(self):
-        return f"ChatSession {self.id} for {self.user.username}"
+        return f"ChatSession {self.id} for {self.user.username if self.user else 'anonymous'}"
 
 
 class ChatMessage(models.Model):
@@ -20,6 +23,12 @@ class ChatMessage(models.Model):
     content = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        ordering = ['created_at', 'id']
+        indexes = [
+            models.Index(fields=['session', 'created_at'], name='chatmessage_session_created'),
+        ]
+
     def __str__(self):
         return f"{self.role} - {self.content[:40]}..."
 
@@ -40,16 +49,48 @@ class UserProfile(models.Model):
 
 
 class Resume(models.Model):
+    # Ingestion status (see core.resume_ingest)
+    PENDING = 'pending'
+    PROCESSING = 'processing'
+    READY = 'ready'
+    FAILED = 'failed'
+    STATUS_CHOICES = [(PENDING, 'Pending'), (PROCESSING, 'Processing'), (READY, 'Ready'), (FAILED, 'Failed')]
+
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     file = models.FileField(upload_to="resumes/")
     uploaded_at = models.DateTimeField(auto_now_add=True)
     parsed_text = models.TextField(blank=True)
-    skills = models.TextField(blank=True)
+    skills = models.TextField(blank=True)  # comma-separated
+    sections = models.JSONField(default=dict, blank=True)  # header -> text, from resume_parser.parse_sections
+    summary = models.TextField(blank=True)  # prompt-ready summary, read by question generation
+    status = models.CharField(max_length=12, choices=STATUS_CHOICES, default=PENDING)
+    error = models.TextField(blank=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+    content_hash = models.CharField(max_length=64, blank=True)  # sha256 of the uploaded bytes
+    cache_hit = models.BooleanField(default=False)  # parsed results came from ResumeCache
 
     def __str__(self):
         return f"Resume of {self.user.username} ({self.uploaded_at.strftime('%Y-%m-%d')})"
 
 
+class ResumeCache(models.Model):
+    """Parse results (and generated questions) per distinct upload, keyed by content hash."""
+    content_hash = models.CharField(max_length=64, unique=True)
+    parser_version = models.CharField(max_length=32, blank=True)  # resume_ingest.parser_version() of the results
+    parsed_text = models.TextField(blank=True)
+    sections = models.JSONField(default=dict, blank=True)
+    skills = models.TextField(blank=True)
+    summary = models.TextField(blank=True)
+    questions = models.JSONField(default=dict, blank=True)  # field -> generate_resume_questions output
+    hits = models.PositiveIntegerField(default=0)  # uploads served from this entry
+    question_hits = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_used_at = models.DateTimeField(auto_now=True, db_index=True)  # LRU eviction order
+
+    def __str__(self):
+        return f"ResumeCache {self.content_hash[:12]} ({self.hits} hits)"
+
+
 # --------------------------
 # Interview Models
 # --------------------------
@@ -59,12 +100,36 @@ class InterviewSession(models.Model):
     field = models.CharField(max_length=100)
     questions = models.JSONField(default=list)  # List of questions
     answers = models.JSONField(default=list)    # List of answers
-    feedback = models.JSONField(default=list)   # List of feedback strings
+    feedback = models.JSONField(default=list)   # {"answers": [...], "aggregate": {...}} from answer_analysis.analyze_batch
 
     def __str__(self):
         return f"Session {self.id} for {self.user.username} on {self.created_at.strftime('%Y-%m-%d')}"
 
 
+class UserStats(models.Model):
+    """
+    Per-user interview totals for the profile page, kept up to date as
+    sessions and answers are written (see core.user_stats).
+    """
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='stats')
+    mock_interviews = models.IntegerField(default=0)
+    answered = models.IntegerField(default=0)
+    correct = models.IntegerField(default=0)
+    score_total = models.FloatField(default=0)      # sum of the feedback scores of scored sessions
+    scored_interviews = models.IntegerField(default=0)
+    last_activity = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    @property
+    def average_score(self):
+        if not self.scored_interviews:
+            return None
+        return round(self.score_total / self.scored_interviews, 1)
+
+    def __str__(self):
+        return f"Stats for {self.user_id}: {self.mock_interviews} interviews, {self.answered} answered"
+
+
 class InterviewAnswer(models.Model):
     session = models.ForeignKey(
         InterviewSession,
@@ -137,6 +202,12 @@ class UserDailyMission(models.Model):
     attempted_questions = models.ManyToManyField(
         'QuizQuestion', blank=True, related_name='attempted_by_users'
     )
+
+    # Question order for this user: a seeded shuffle of ids 1..queue_size,
+    # read from queue_cursor on (see core.daily_quiz)
+    queue_seed = models.PositiveBigIntegerField(default=0)
+    queue_size = models.PositiveIntegerField(default=0)
+    queue_cursor = models.PositiveIntegerField(default=0)
     
     def can_attempt(self):
         """
@@ -155,6 +226,103 @@ class UserDailyMission(models.Model):
     def __str__(self):
         return f"{self.user.username} - Streak: {self.streak} - Points: {self.total_points}"
 
+
+class LeaderboardEntry(models.Model):
+    """
+    Materialized daily mission leaderboard: one row per user who has played,
+    with their position kept in `rank` (see core.leaderboard).
+    """
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='leaderboard_entry')
+    username = models.CharField(max_length=150)
+    score = models.IntegerField(default=0)
+    total_points = models.IntegerField(default=0)
+    streak = models.IntegerField(default=0)
+    last_attempt = models.DateTimeField(null=True, blank=True)
+    rank = models.PositiveIntegerField(db_index=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['-total_points', 'last_attempt'], name='leaderboard_order'),
+        ]
+
+    def __str__(self):
+        return f"#{self.rank} {self.username} - Points: {self.total_points}"
+
+
+class LeaderboardLock(models.Model):
+    """
+    A single row, locked (SELECT ... FOR UPDATE) by every rank update and
+    rebuild, so concurrent gradings shift ranks one at a time.
+    """
+
+
+class QuizAttempt(models.Model):
+    """One graded daily mission question; append-only (see core.quiz_log)."""
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='quiz_attempts')
+    question = models.ForeignKey('QuizQuestion', on_delete=models.SET_NULL, null=True, related_name='attempts')
+    correct = models.BooleanField()
+    points = models.IntegerField(default=0)
+    attempted_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'attempted_at'], name='quiz_attempt_user_time'),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} q{self.question_id} {'correct' if self.correct else 'wrong'} @ {self.attempted_at:%Y-%m-%d %H:%M}"
+
+
+class QuizDailyStats(models.Model):
+    """Per-user totals of QuizAttempt for one day."""
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='quiz_daily_stats')
+    day = models.DateField()
+    attempted = models.IntegerField(default=0)
+    correct = models.IntegerField(default=0)
+    points = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'day'], name='unique_quiz_daily_stats'),
+        ]
+        indexes = [
+            models.Index(fields=['day', '-points'], name='quiz_daily_board'),
+        ]
+
+
+class QuizWeeklyStats(models.Model):
+    """Per-user totals of QuizAttempt for one ISO week (week = its Monday)."""
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='quiz_weekly_stats')
+    week = models.DateField()
+    attempted = models.IntegerField(default=0)
+    correct = models.IntegerField(default=0)
+    points = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'week'], name='unique_quiz_weekly_stats'),
+        ]
+        indexes = [
+            models.Index(fields=['week', '-points'], name='quiz_weekly_board'),
+        ]
+
+
+class QuizMonthlyStats(models.Model):
+    """Per-user totals of QuizAttempt for one calendar month (month = its first day)."""
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='quiz_monthly_stats')
+    month = models.DateField()
+    attempted = models.IntegerField(default=0)
+    correct = models.IntegerField(default=0)
+    points = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'month'], name='unique_quiz_monthly_stats'),
+        ]
+        indexes = [
+            models.Index(fields=['month', '-points'], name='quiz_monthly_board'),
+        ]
+
 from django.db import models
 from django.contrib.auth.models import User
 
@@ -168,3 +336,27 @@ class Feedback(models.Model):
         return f"{self.user.username} - {self.subject}"
 
 
+
+
+# --------------------------
+# Question Pool
+# --------------------------
+class PooledQuestion(models.Model):
+    """Pre-generated interview question, served to mock interviews without an LLM call."""
+    field = models.CharField(max_length=100)
+    difficulty = models.CharField(max_length=20)
+    tag = models.CharField(max_length=100, blank=True)
+    text = models.TextField()
+    text_hash = models.CharField(max_length=64)  # sha256 of the normalized text, for de-duplication
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    # Users who have already been served this question
+    seen_by = models.ManyToManyField(User, blank=True, related_name='seen_pool_questions')
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['field', 'difficulty', 'tag', 'text_hash'], name='unique_pooled_question'),
+        ]
+
+    def __str__(self):
+        return f"[{self.field}/{self.difficulty}/{self.tag or '-'}] {self.text[:40]}"
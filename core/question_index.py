@@ -0,0 +1,286 @@
+# core/question_index.py
+"""
+In-memory retrieval index over the question bank: QuizQuestion rows,
+PooledQuestion rows and the curated questions below.
+
+Each question is indexed under its words and under the canonical skills it
+mentions (via ai_interview_coach.skills, so "k8s" and "Kubernetes" meet),
+in an inverted index with field and difficulty facets. Ranking is BM25
+(TF-IDF with document length normalization), computed from the postings
+at query time, so adding or removing a question only touches its own
+postings. Quiz questions carry no field, so they stay candidates for every
+field, but at UNTAGGED_WEIGHT of their score: a field's own questions rank
+first on comparable matches.
+
+The index is built once per process on first use. New rows are picked up
+incrementally: saves and deletes in this process through signals, rows
+inserted elsewhere (bulk_create, other workers) through an id watermark
+checked at most every QUESTION_INDEX_REFRESH_SECONDS.
+"""
+import heapq
+import math
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+
+from django.conf import settings
+
+from .models import PooledQuestion, QuizQuestion
+from .resume_ingest import skill_extractor
+
+# Hand-written technical questions per field; also the last-resort fallback
+CURATED_QUESTIONS = {
+    "Software": [
+        "What is Django ORM?", "Explain REST API.", "How do you manage version control with Git?",
+        "How would you containerize a Django application with Docker?",
+        "How does Kubernetes decide where to schedule a pod?",
+        "How do you design a REST API for versioning and backwards compatibility?",
+        "What are the trade-offs between SQL and NoSQL databases such as MongoDB?",
+        "How would you find and fix a slow PostgreSQL query?",
+        "How do you use Redis as a cache, and how do you invalidate it?",
+        "Explain the event loop in JavaScript and Node.js.",
+        "How does React decide when to re-render a component?",
+        "What does a CI/CD pipeline you have built look like?",
+        "How do you design microservices so one failing service does not take down the rest?",
+        "What is the difference between a process and a thread in Python?",
+        "How do you secure an API with OAuth and JWT?",
+        "How would you design a URL shortener? Walk through the system design.",
+        "How do you write unit tests for code that calls external services?",
+        "What is the difference between TypeScript and JavaScript, and why use TypeScript?",
+        "How do you deploy and monitor an application on AWS?",
+        "How does Kafka guarantee message ordering?",
+    ],
+    "Data Science": [
+        "What is supervised vs unsupervised learning?", "How do you handle missing data?",
+        "Explain overfitting and how to prevent it.",
+        "How do you choose evaluation metrics for an imbalanced classification problem?",
+        "How would you explain a machine learning model's predictions to a business stakeholder?",
+        "What is the difference between bagging and boosting?",
+        "How do you use Pandas to clean and join messy datasets?",
+        "When would you use deep learning instead of a simpler model?",
+        "How do you fine-tune a large language model, and when is prompting enough?",
+        "How do you build a text classification pipeline for NLP tasks?",
+        "How do you process large datasets with Apache Spark?",
+        "How do you design an A/B test and check statistical significance?",
+        "What goes into a good data visualization dashboard in Tableau or Power BI?",
+        "How do you deploy a scikit-learn or PyTorch model to production?",
+    ],
+    "Marketing": [
+        "What is digital marketing?", "Explain SEO vs SEM.", "How do you measure campaign performance?",
+        "How do you use Google Analytics to find where a funnel loses users?",
+        "How would you plan a social media marketing campaign on a small budget?",
+        "How do you decide how to split budget between Google Ads and SEO?",
+    ],
+    "Finance": [
+        "Explain NPV and IRR.", "What is ROI?", "How do you evaluate financial statements?",
+        "Walk me through a DCF valuation.",
+        "How do you build a financial model in Excel that others can audit?",
+        "How do you prepare a budget and forecast for a new business unit?",
+    ],
+    "HR": [
+        "How do you handle workplace conflict?", "Explain the recruitment process.", "How do you motivate employees?",
+        "How do you measure the success of an onboarding program?",
+        "How do you run performance management for a remote team?",
+        "How do you reduce time-to-hire without lowering the bar?",
+    ],
+    "Sales": [
+        "What is the sales funnel?", "How do you handle client objections?", "Explain your biggest sales achievement.",
+        "How do you use a CRM such as Salesforce to manage your pipeline?",
+        "How do you approach lead generation for B2B sales?",
+        "How do you prepare for a negotiation with a large client?",
+    ],
+    "Design": [
+        "What is the difference between UI and UX?", "Explain design thinking.", "How do you test usability?",
+        "How do you go from wireframes to a high-fidelity prototype in Figma?",
+        "How do you run user research with a limited budget?",
+        "How do you build and maintain a design system?",
+    ],
+    "Teaching": [
+        "What is your teaching philosophy?", "How do you engage students?", "How do you adapt to different learning styles?",
+        "How do you plan a curriculum for a new course?",
+        "How do you handle classroom management with a disruptive student?",
+        "How do you assess whether students have understood a lesson?",
+    ],
+    "General": [
+        "Explain problem-solving skills.", "How do you work in a team?", "What motivates you?",
+        "Describe a project where you had to learn a new skill quickly.",
+        "How do you prioritize when everything is urgent?",
+        "Tell me about a time you showed leadership without being the manager.",
+    ],
+}
+
+_WORD_RE = re.compile(r"[a-z0-9][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9]")
+STOPWORDS = frozenset("""
+a about an and are as at be by can do does explain for from have how i if in is it me of on or tell that
+the this through to use used using walk what when where which who why will with would you your
+""".split())
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+# Score factor for untagged docs when a field is asked for
+UNTAGGED_WEIGHT = 0.5
+
+
+def curated_questions(field):
+    return CURATED_QUESTIONS.get(field, CURATED_QUESTIONS["General"])
+
+
+def terms(text):
+    """Index terms of a text: its words (minus stopwords) and "skill:<name>" per skill it mentions."""
+    words = [w for w in _WORD_RE.findall(text.lower()) if w not in STOPWORDS]
+    skills = ["skill:" + s.lower() for s in skill_extractor().extract(text)]
+    return Counter(words + skills)
+
+
+class QuestionIndex:
+    def __init__(self):
+        self.postings = defaultdict(dict)  # term -> {doc: tf}
+        self.docs = {}                     # doc -> (text, field, difficulty, length)
+        self.by_field = defaultdict(set)
+        self.by_difficulty = defaultdict(set)
+        self.total_length = 0
+        self.watermarks = {'quiz': 0, 'pool': 0}
+        self.refreshed_at = 0.0
+        self._lock = threading.RLock()
+
+    def add(self, doc, text, field="", difficulty=""):
+        """Index (or re-index) one question; doc is a key like ("pool", 12)."""
+        counts = terms(text)
+        with self._lock:
+            self.remove(doc)
+            length = sum(counts.values())
+            self.docs[doc] = (text, field, difficulty, length)
+            self.total_length += length
+            for term, tf in counts.items():
+                self.postings[term][doc] = tf
+            self.by_field[field].add(doc)
+            self.by_difficulty[difficulty].add(doc)
+
+    def remove(self, doc):
+        with self._lock:
+            entry = self.docs.pop(doc, None)
+            if entry is None:
+                return
+            text, field, difficulty, length = entry
+            self.total_length -= length
+            for term in terms(text):
+                posting = self.postings.get(term)
+                if posting is not None:
+                    posting.pop(doc, None)
+                    if not posting:
+                        del self.postings[term]
+            self.by_field[field].discard(doc)
+            self.by_difficulty[difficulty].discard(doc)
+
+    def _candidates(self, field, difficulty):
+        """Docs allowed by the facets; "" (untagged, e.g. quiz questions) matches any value, see search()."""
+        allowed = None
+        if field:
+            allowed = self.by_field[field] | self.by_field["General"] | self.by_field[""]
+        if difficulty and difficulty != "Any":
+            by_difficulty = self.by_difficulty[difficulty] | self.by_difficulty["Any"] | self.by_difficulty[""]
+            allowed = by_difficulty if allowed is None else allowed & by_difficulty
+        return allowed
+
+    def search(self, query, field=None, difficulty=None, k=5, exclude=()):
+        """
+        Top-k (score, text) for a weighted query {term: weight}, BM25-ranked,
+        within the field/difficulty facets. Untagged docs score UNTAGGED_WEIGHT
+        of their BM25 score when a field is given. Texts in `exclude` are skipped.
+        """
+        with self._lock:
+            n = len(self.docs)
+            if not n:
+                return []
+            avg_length = self.total_length / n
+            allowed = self._candidates(field, difficulty)
+            scores = defaultdict(float)
+            for term, weight in query.items():
+                posting = self.postings.get(term)
+                if not posting:
+                    continue
+                idf = math.log(1 + (n - len(posting) + 0.5) / (len(posting) + 0.5))
+                for doc, tf in posting.items():
+                    if allowed is not None and doc not in allowed:
+                        continue
+                    length = self.docs[doc][3]
+                    scores[doc] += weight * idf * tf * (K1 + 1) / (tf + K1 * (1 - B + B * length / avg_length))
+            if field:
+                for doc in self.by_field[""] & scores.keys():
+                    scores[doc] *= UNTAGGED_WEIGHT
+            ranked = heapq.nlargest(k + len(exclude), scores.items(), key=lambda item: item[1])
+            results = []
+            for doc, score in ranked:
+                text = self.docs[doc][0]
+                if text not in exclude:
+                    results.append((score, text))
+            return results[:k]
+
+    def build(self):
+        for field, texts in CURATED_QUESTIONS.items():
+            for i, text in enumerate(texts):
+                self.add(("curated", field, i), text, field)
+        self.refresh(force=True)
+
+    def refresh(self, force=False):
+        """Index rows added since the last refresh (by id), at most every QUESTION_INDEX_REFRESH_SECONDS."""
+        interval = getattr(settings, 'QUESTION_INDEX_REFRESH_SECONDS', 30)
+        if not force and time.monotonic() - self.refreshed_at < interval:
+            return
+        self.refreshed_at = time.monotonic()
+        for pk, text in QuizQuestion.objects.filter(pk__gt=self.watermarks['quiz']).order_by('pk').values_list('pk', 'question'):
+            self.add(('quiz', pk), text)
+            self.watermarks['quiz'] = pk
+        rows = PooledQuestion.objects.filter(pk__gt=self.watermarks['pool']).order_by('pk')
+        for pk, text, field, difficulty in rows.values_list('pk', 'text', 'field', 'difficulty'):
+            self.add(('pool', pk), text, field, difficulty)
+            self.watermarks['pool'] = pk
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_question_index():
+    """Return the process-wide QuestionIndex, building it on first use."""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                index = QuestionIndex()
+                index.build()
+                _index = index
+    _index.refresh()
+    return _index
+
+
+def resume_query(resume):
+    """Weighted query from a parsed resume: its skills count double, project words once."""
+    query = Counter()
+    for skill in (s for s in resume.skills.split(", ") if s):
+        query["skill:" + skill.lower()] += 2.0
+        for word in terms(skill):
+            query[word] += 1.0
+    for word, tf in terms(resume.sections.get("projects", "")).items():
+        query[word] += min(tf, 3)
+    return query
+
+
+def questions_for_resume(resume, field, difficulty=None, k=3, exclude=()):
+    """Up to k bank questions relevant to the resume (score >= QUESTION_INDEX_MIN_SCORE)."""
+    min_score = getattr(settings, 'QUESTION_INDEX_MIN_SCORE', 5.0)
+    results = get_question_index().search(resume_query(resume), field, difficulty, k, exclude)
+    return [text for score, text in results if score >= min_score]
+
+
+# Incremental updates for saves/deletes in this process (see core.signals)
+def question_saved(doc, text, field="", difficulty=""):
+    if _index is not None:
+        _index.add(doc, text, field, difficulty)
+
+
+def question_deleted(doc):
+    if _index is not None:
+        _index.remove(doc)
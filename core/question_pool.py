@@ -0,0 +1,133 @@
+# core/question_pool.py
+"""
+Pre-generated interview questions per (field, difficulty, tag).
+
+Mock interviews take their questions from the pool with one query instead of
+one LLM call per question. When a user's supply of unseen questions for a key
+drops below QUESTION_POOL_LOW_WATERMARK, a background job generates batches
+until it is back at QUESTION_POOL_HIGH_WATERMARK. A key the pool has nothing
+for yet is served curated questions while its first batches are generated.
+"""
+import hashlib
+import re
+
+from django.conf import settings
+
+from ai_interview_coach.ai_llm import generate_question_batch
+from . import tasks
+from .models import PooledQuestion
+from .question_index import curated_questions
+
+_NORMALIZE_RE = re.compile(r"[^a-z0-9]+")
+
+
+def normalize_key(field, difficulty, tag):
+    """Map the values the UI sends (e.g. "Choose a field", "") onto pool keys."""
+    field = (field or "").strip()
+    if not field or field == "Choose a field":
+        field = "General"
+    difficulty = (difficulty or "").strip() or "Any"
+    return field, difficulty, (tag or "").strip().lower()
+
+
+def question_hash(text):
+    """Hash of the question with case, punctuation and spacing folded away."""
+    normalized = _NORMALIZE_RE.sub(" ", text.lower()).strip()
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+def _key_filter(field, difficulty, tag):
+    return PooledQuestion.objects.filter(field=field, difficulty=difficulty, tag=tag)
+
+
+def unseen_count(user_id, field, difficulty, tag):
+    qs = _key_filter(field, difficulty, tag)
+    if user_id is not None:
+        qs = qs.exclude(seen_by=user_id)
+    return qs.count()
+
+
+def add_questions(field, difficulty, tag, texts):
+    """Store new questions, skipping duplicates of each other and of the pool. Returns how many were new."""
+    rows = {}
+    for text in texts:
+        text = text.strip()
+        if text:
+            rows.setdefault(question_hash(text), text)
+    if not rows:
+        return 0
+
+    existing = set(_key_filter(field, difficulty, tag)
+                   .filter(text_hash__in=rows.keys())
+                   .values_list("text_hash", flat=True))
+    new = [PooledQuestion(field=field, difficulty=difficulty, tag=tag, text=text, text_hash=h)
+           for h, text in rows.items() if h not in existing]
+    # ignore_conflicts covers a concurrent refill inserting the same question
+    PooledQuestion.objects.bulk_create(new, ignore_conflicts=True)
+    return len(new)
+
+
+def remember_questions(user, field, difficulty, tag, texts):
+    """Add questions generated for `user` to the pool, already marked as seen by them."""
+    field, difficulty, tag = normalize_key(field, difficulty, tag)
+    add_questions(field, difficulty, tag, texts)
+    ids = _key_filter(field, difficulty, tag).filter(
+        text_hash__in=[question_hash(t) for t in texts]
+    ).values_list("id", flat=True)
+    PooledQuestion.seen_by.through.objects.bulk_create(
+        [PooledQuestion.seen_by.through(pooledquestion_id=qid, user_id=user.id) for qid in ids],
+        ignore_conflicts=True,
+    )
+
+
+def refill(field, difficulty, tag, user_id=None, target=None):
+    """
+    Generate batches until `user_id` (or the pool as a whole) has `target`
+    unseen questions. Stops early when a batch brings nothing new.
+    """
+    target = target or settings.QUESTION_POOL_HIGH_WATERMARK
+    batch_size = settings.QUESTION_POOL_BATCH_SIZE
+    for _ in range(settings.QUESTION_POOL_MAX_BATCHES):
+        missing = target - unseen_count(user_id, field, difficulty, tag)
+        if missing <= 0:
+            break
+        texts = generate_question_batch(field, difficulty, tag, count=min(batch_size, missing))
+        if not add_questions(field, difficulty, tag, texts):
+            break
+
+
+def schedule_refill(field, difficulty, tag, user_id=None):
+    return tasks.submit(refill, field, difficulty, tag, user_id,
+                        key=("question_pool", field, difficulty, tag, user_id))
+
+
+def take_questions(user, field, difficulty, tag, count):
+    """
+    Return up to `count` questions `user` hasn't seen for this key and mark them
+    seen. Never waits on the LLM: when the pool can't cover the request the
+    rest comes from the curated questions for the field, and a background
+    top-up is scheduled whenever supply runs low.
+    """
+    field, difficulty, tag = normalize_key(field, difficulty, tag)
+    pool = _key_filter(field, difficulty, tag).exclude(seen_by=user).order_by("id")
+
+    picked = list(pool.values_list("id", "text")[:count + settings.QUESTION_POOL_LOW_WATERMARK])
+    remaining = len(picked) - count
+    picked = picked[:count]
+    PooledQuestion.seen_by.through.objects.bulk_create(
+        [PooledQuestion.seen_by.through(pooledquestion_id=qid, user_id=user.id) for qid, _ in picked],
+        ignore_conflicts=True,
+    )
+
+    if remaining < settings.QUESTION_POOL_LOW_WATERMARK:
+        schedule_refill(field, difficulty, tag, user.id)
+
+    questions = [text for _, text in picked]
+    if len(questions) < count:
+        questions += [q for q in curated_questions(field) if q not in questions][:count - len(questions)]
+    return questions
+
+
+def active_keys():
+    """(field, difficulty, tag) keys that already have questions in the pool."""
+    return list(PooledQuestion.objects.values_list("field", "difficulty", "tag").distinct())
@@ -0,0 +1,119 @@
+# core/quiz_log.py
+"""
+Daily mission attempt log and its rollups.
+
+Every graded question is appended to QuizAttempt (user, question,
+correct, points, time); rows are never updated. So that boards and charts
+don't scan the log, the same grading transaction adds the submission's
+totals to the user's rows for the day (QuizDailyStats), the ISO week
+(QuizWeeklyStats) and the month (QuizMonthlyStats):
+
+- weekly and monthly boards: one row per player for the period
+- profile history: one QuizDailyStats row per day
+
+`manage.py rebuild_quiz_rollups` recomputes the rollups from the log.
+Days and weeks are in the project time zone (TIME_ZONE).
+"""
+import datetime
+
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import QuizAttempt, QuizDailyStats, QuizMonthlyStats, QuizWeeklyStats
+
+_TOTALS = ('attempted', 'correct', 'points')
+
+
+def week_start(day):
+    """Monday of the ISO week containing `day`."""
+    return day - datetime.timedelta(days=day.weekday())
+
+
+def month_start(day):
+    return day.replace(day=1)
+
+
+def _add(model, user_id, totals, **key):
+    """Add totals to a rollup row, creating it on the first submission of the period."""
+    updated = model.objects.filter(user_id=user_id, **key).update(**{f: F(f) + totals[f] for f in _TOTALS})
+    if not updated:
+        model.objects.create(user_id=user_id, **key, **totals)
+
+
+def record(user_id, results, when=None, points_per_correct=10):
+    """
+    Log one graded submission, `results` being (question id, correct) pairs,
+    and add it to the user's day, week and month. Call inside the grading
+    transaction, which also serializes a user's submissions.
+    """
+    if not results:
+        return
+    when = when or timezone.now()
+    QuizAttempt.objects.bulk_create([
+        QuizAttempt(user_id=user_id, question_id=qid, correct=correct,
+                    points=points_per_correct if correct else 0, attempted_at=when)
+        for qid, correct in results
+    ])
+    correct = sum(1 for _, ok in results if ok)
+    totals = {'attempted': len(results), 'correct': correct, 'points': correct * points_per_correct}
+    day = timezone.localdate(when)
+    _add(QuizDailyStats, user_id, totals, day=day)
+    _add(QuizWeeklyStats, user_id, totals, week=week_start(day))
+    _add(QuizMonthlyStats, user_id, totals, month=month_start(day))
+
+
+def _board(rows, k):
+    return list(rows.order_by('-points', '-correct', 'user_id')[:k])
+
+
+def weekly_top(k=10, day=None):
+    """Top players of the ISO week containing `day` (default: this week)."""
+    week = week_start(day or timezone.localdate())
+    return _board(QuizWeeklyStats.objects.filter(week=week).values('user_id', 'user__username', *_TOTALS), k)
+
+
+def monthly_top(k=10, day=None):
+    """Top players of the month containing `day` (default: this month)."""
+    month = month_start(day or timezone.localdate())
+    return _board(QuizMonthlyStats.objects.filter(month=month).values('user_id', 'user__username', *_TOTALS), k)
+
+
+def daily_history(user, days=14):
+    """[{day, attempted, correct, points}] for the last `days` days, oldest first, zero-filled."""
+    today = timezone.localdate()
+    first = today - datetime.timedelta(days=days - 1)
+    found = {row['day']: row for row in
+             QuizDailyStats.objects.filter(user=user, day__gte=first).values('day', *_TOTALS)}
+    return [found.get(day, {'day': day, 'attempted': 0, 'correct': 0, 'points': 0})
+            for day in (first + datetime.timedelta(days=i) for i in range(days))]
+
+
+def rebuild():
+    """Recompute the daily, weekly and monthly rollups from the attempt log. Returns their row counts."""
+    daily, weekly, monthly = [], {}, {}
+    rows = (QuizAttempt.objects.annotate(day=TruncDate('attempted_at'))
+            .values('user_id', 'day')
+            .annotate(attempted=Count('id'), correct=Count('id', filter=Q(correct=True)), points=Sum('points'))
+            .order_by('user_id', 'day'))
+    for row in rows.iterator():
+        totals = {f: row[f] for f in _TOTALS}
+        daily.append(QuizDailyStats(user_id=row['user_id'], day=row['day'], **totals))
+        for period, key in ((weekly, week_start(row['day'])), (monthly, month_start(row['day']))):
+            sums = period.setdefault((row['user_id'], key), dict.fromkeys(_TOTALS, 0))
+            for f in _TOTALS:
+                sums[f] += totals[f]
+
+    with transaction.atomic():
+        QuizDailyStats.objects.all().delete()
+        QuizWeeklyStats.objects.all().delete()
+        QuizMonthlyStats.objects.all().delete()
+        QuizDailyStats.objects.bulk_create(daily, batch_size=1000)
+        QuizWeeklyStats.objects.bulk_create(
+            [QuizWeeklyStats(user_id=user_id, week=week, **totals) for (user_id, week), totals in weekly.items()],
+            batch_size=1000)
+        QuizMonthlyStats.objects.bulk_create(
+            [QuizMonthlyStats(user_id=user_id, month=month, **totals) for (user_id, month), totals in monthly.items()],
+            batch_size=1000)
+    return len(daily), len(weekly), len(monthly)
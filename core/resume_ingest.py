@@ -0,0 +1,205 @@
+# core/resume_ingest.py
+"""
+Resume ingestion: extract the text of an uploaded resume, split it into
+sections, find the skills it mentions (canonical names from the skills
+taxonomy) and store everything on the Resume row. The skills also fill
+the user's profile skills while those are empty.
+
+The job runs on the core.tasks background pool, never on the request
+thread. Its state lives in Resume.status, so clients poll
+/api/resume/<id>/status/ and `manage.py ingest_resumes` picks up uploads
+whose job was lost (e.g. the server restarted before it ran).
+
+Results are also cached in ResumeCache under the SHA-256 of the uploaded
+bytes: re-uploading the same file is READY immediately, with no job, and
+reuses the questions already generated for it. Entries record the
+parser_version() that produced them; entries from another version (older
+parsing code or skills taxonomy) are ignored and replaced on the next parse.
+"""
+import hashlib
+import logging
+
+from django.conf import settings
+from django.db.models import Count, F, Q
+from django.utils import timezone
+
+from ai_interview_coach.resume_parser import (
+    SECTION_HEADERS, extract_resume_text, parse_sections, summarize_sections,
+)
+from ai_interview_coach.skills import get_skill_extractor
+from . import tasks
+from .models import Resume, ResumeCache, UserProfile
+
+logger = logging.getLogger(__name__)
+
+# Resume fields filled by ingestion, all stored in ResumeCache too
+RESULT_FIELDS = ('parsed_text', 'sections', 'skills', 'summary')
+
+# Bump when extraction or section parsing changes what ingestion stores
+PARSER_VERSION = 2
+
+
+def skill_extractor():
+    """The skills automaton; its on-disk copy is signed with SECRET_KEY."""
+    return get_skill_extractor(getattr(settings, 'SKILLS_AUTOMATON_PATH', None), settings.SECRET_KEY)
+
+
+def parser_version():
+    """Version of the parse results: PARSER_VERSION and the skills taxonomy digest."""
+    return f"{PARSER_VERSION}:{skill_extractor().digest[:16]}"
+
+
+def _cache_entry(digest):
+    """ResumeCache rows for `digest` written by the current parser_version()."""
+    return ResumeCache.objects.filter(content_hash=digest, parser_version=parser_version())
+
+
+def content_hash(uploaded_file):
+    """SHA-256 hex digest of an uploaded file's bytes."""
+    digest = hashlib.sha256()
+    for chunk in uploaded_file.chunks():
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _cached_results(digest):
+    """Cached parse results for `digest` (counting the hit), or None."""
+    entry = _cache_entry(digest).values(*RESULT_FIELDS).first()
+    if entry is not None:
+        _cache_entry(digest).update(hits=F('hits') + 1, last_used_at=timezone.now())
+    return entry
+
+
+def _store_results(digest, fields):
+    version = parser_version()
+    ResumeCache.objects.filter(content_hash=digest).exclude(parser_version=version).delete()
+    ResumeCache.objects.get_or_create(
+        content_hash=digest, defaults={'parser_version': version, **{f: fields[f] for f in RESULT_FIELDS}})
+    evict()
+
+
+def evict(max_entries=None):
+    """Drop the least recently used entries beyond RESUME_CACHE_MAX_ENTRIES."""
+    if max_entries is None:
+        max_entries = getattr(settings, 'RESUME_CACHE_MAX_ENTRIES', 500)
+    stale = list(ResumeCache.objects.order_by('-last_used_at').values_list('pk', flat=True)[max_entries:])
+    if stale:
+        ResumeCache.objects.filter(pk__in=stale).delete()
+    return len(stale)
+
+
+def hit_rate():
+    """(uploads served from the cache, hashed uploads), over all stored resumes."""
+    counts = Resume.objects.exclude(content_hash='').aggregate(
+        total=Count('id'), hits=Count('id', filter=Q(cache_hit=True)))
+    return counts['hits'], counts['total']
+
+
+def create_resume(user, uploaded_file):
+    """
+    Store an upload. A file seen before is READY at once with the cached
+    results; anything else is queued for ingestion.
+    """
+    digest = content_hash(uploaded_file)
+    cached = _cached_results(digest)
+    if cached is not None:
+        _fill_profile_skills(user.pk, cached['skills'])
+        return Resume.objects.create(
+            user=user, file=uploaded_file, content_hash=digest, cache_hit=True,
+            status=Resume.READY, processed_at=timezone.now(), **cached)
+
+    resume = Resume.objects.create(user=user, file=uploaded_file, content_hash=digest)
+    enqueue(resume)
+    return resume
+
+
+def _fill_profile_skills(user_id, skills):
+    """Profile skills come from the resume until the user edits them."""
+    if skills:
+        UserProfile.objects.filter(user_id=user_id, skills='').update(skills=skills)
+
+
+def cached_questions(resume, field):
+    """Questions generated earlier for the same file and field, or None."""
+    if not resume.content_hash:
+        return None
+    entry = _cache_entry(resume.content_hash).values('questions').first()
+    questions = entry and entry['questions'].get(field)
+    if questions is not None:
+        _cache_entry(resume.content_hash).update(
+            question_hits=F('question_hits') + 1, last_used_at=timezone.now())
+    return questions
+
+
+def store_questions(resume, field, questions):
+    entry = _cache_entry(resume.content_hash).first() if resume.content_hash else None
+    if entry is not None:
+        entry.questions[field] = questions
+        entry.save(update_fields=['questions', 'last_used_at'])
+
+
+def enqueue(resume):
+    """Schedule ingestion of a freshly uploaded (pending) resume."""
+    return tasks.submit(ingest, resume.pk, key=('resume-ingest', resume.pk))
+
+
+def ingest(resume_id, statuses=(Resume.PENDING,)):
+    """
+    Parse one resume. The row is claimed by moving it from one of `statuses`
+    to PROCESSING, so a resume is never ingested twice concurrently.
+    Returns False when it was not claimed.
+    """
+    claimed = Resume.objects.filter(pk=resume_id, status__in=statuses).update(status=Resume.PROCESSING, error='')
+    if not claimed:
+        return False
+
+    resume = Resume.objects.get(pk=resume_id)
+    # An identical file may have been parsed since this one was queued
+    cached = _cached_results(resume.content_hash) if resume.content_hash else None
+    if cached is not None:
+        fields = dict(cached, status=Resume.READY, cache_hit=True)
+    else:
+        try:
+            text = extract_resume_text(
+                resume.file.path,
+                max_pages=getattr(settings, 'RESUME_PDF_MAX_PAGES', 30),
+                max_bytes=getattr(settings, 'RESUME_PDF_MAX_BYTES', 200_000),
+                workers=getattr(settings, 'RESUME_PDF_WORKERS', 0),
+            )
+            sections = parse_sections(text)
+            fields = {
+                'parsed_text': text,
+                'sections': sections,
+                'skills': ", ".join(skill_extractor().extract(text)),
+                'summary': summarize_sections(sections),
+                'status': Resume.READY,
+            }
+        except Exception as e:
+            logger.exception("Resume %s could not be parsed", resume_id)
+            fields = {'status': Resume.FAILED, 'error': str(e)[:500]}
+        else:
+            if resume.content_hash:
+                _store_results(resume.content_hash, fields)
+
+    Resume.objects.filter(pk=resume_id).update(processed_at=timezone.now(), **fields)
+    if fields['status'] == Resume.READY:
+        _fill_profile_skills(resume.user_id, fields['skills'])
+    return fields['status'] == Resume.READY
+
+
+def status_payload(resume):
+    """What the status endpoint returns; the analysis fields once READY."""
+    data = {'resume_id': resume.pk, 'status': resume.status}
+    if resume.status == Resume.READY:
+        found = [h for h in SECTION_HEADERS if resume.sections.get(h)]
+        missing = [h for h in SECTION_HEADERS if h not in found]
+        data.update(
+            sections=found,
+            missing_sections=missing,
+            suggestions=[f"Add a {h.title()} section." for h in missing],
+            skills=[s for s in resume.skills.split(", ") if s],
+            summary=resume.summary,
+        )
+    elif resume.status == Resume.FAILED:
+        data['error'] = resume.error or "Resume could not be parsed."
+    return data
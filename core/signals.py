@@ -1,8 +1,9 @@
 # core/signals.py
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 from django.contrib.auth.models import User
-from .models import UserProfile
+from . import question_index, user_stats
+from .models import InterviewAnswer, InterviewSession, PooledQuestion, QuizQuestion, UserProfile
 
 
 @receiver(post_save, sender=User)
@@ -16,3 +17,44 @@ def create_user_profile(sender, instance, created, **kwargs):
 def save_user_profile(sender, instance, **kwargs):
     """Save UserProfile whenever User is saved"""
     instance.userprofile.save()
+
+
+@receiver(post_save, sender=QuizQuestion)
+def index_quiz_question(sender, instance, **kwargs):
+    """Keep the question index in step with edits made in this process"""
+    question_index.question_saved(('quiz', instance.pk), instance.question)
+
+
+@receiver(post_delete, sender=QuizQuestion)
+def unindex_quiz_question(sender, instance, **kwargs):
+    question_index.question_deleted(('quiz', instance.pk))
+
+
+@receiver(post_save, sender=PooledQuestion)
+def index_pooled_question(sender, instance, **kwargs):
+    question_index.question_saved(('pool', instance.pk), instance.text, instance.field, instance.difficulty)
+
+
+@receiver(post_delete, sender=PooledQuestion)
+def unindex_pooled_question(sender, instance, **kwargs):
+    question_index.question_deleted(('pool', instance.pk))
+
+
+@receiver(post_save, sender=InterviewSession)
+def count_interview_session(sender, instance, created, **kwargs):
+    """Keep the user's profile stats (UserStats) up to date"""
+    if created:
+        user_stats.session_created(instance)
+    else:
+        user_stats.session_changed(instance)
+
+
+@receiver(post_delete, sender=InterviewSession)
+def uncount_interview_session(sender, instance, **kwargs):
+    user_stats.session_changed(instance)
+
+
+@receiver(post_save, sender=InterviewAnswer)
+def count_interview_answer(sender, instance, created, **kwargs):
+    if created:
+        user_stats.answer_created(instance)
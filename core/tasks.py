@@ -0,0 +1,55 @@
+# core/tasks.py
+"""
+Small in-process background runner for work that must stay off the request
+path (question pool top-ups, etc.). Jobs run on a shared thread pool; each
+job closes its DB connection when done.
+"""
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_pending = set()
+_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, 'BACKGROUND_WORKERS', 2),
+                thread_name_prefix='coach-bg',
+            )
+        return _executor
+
+
+def _run(key, fn, args, kwargs):
+    try:
+        return fn(*args, **kwargs)
+    except Exception:
+        logger.exception("Background job %r failed", key or fn.__name__)
+    finally:
+        close_old_connections()
+        if key is not None:
+            with _lock:
+                _pending.discard(key)
+
+
+def submit(fn, *args, key=None, **kwargs):
+    """
+    Run fn(*args, **kwargs) in the background. With a key, the job is skipped
+    while another job with the same key is still queued or running.
+    Returns the Future, or None when skipped.
+    """
+    if key is not None:
+        with _lock:
+            if key in _pending:
+                return None
+            _pending.add(key)
+    return _get_executor().submit(_run, key, fn, args, kwargs)
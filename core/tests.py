@@ -1,2 +1,1161 @@
 # interviews/tests.py
-# Add your tests here.
+import asyncio
+import importlib
+import io
+import itertools
+import json
+import os
+import shutil
+import socket
+import tempfile
+import time
+from concurrent.futures import Future
+from datetime import timedelta
+from unittest import mock
+
+import httpx
+import requests
+from django.apps import apps
+from django.contrib.auth.models import AnonymousUser, User
+from django.contrib.sessions.backends.db import SessionStore
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.http import HttpResponse
+from django.test import AsyncRequestFactory, RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from reportlab.pdfgen import canvas
+
+from ai_interview_coach import ai_llm, answer_analysis, resume_parser, skills
+from ai_interview_coach.ai_llm import AsyncLLMClient, LLMClient, LLMResponseCache
+from ai_interview_coach.conversation_memory import ConversationMemory
+from ai_interview_coach.spellcheck import SpellChecker, get_spell_checker
+from ai_interview_coach.fake_ollama import CANNED_QUESTIONS, FakeOllamaServer
+from core import chat_memory, resume_ingest, views, daily_quiz, leaderboard, question_index, question_pool, quiz_log, user_stats
+from core.analysis_pool import AnalysisPool
+from core.middleware import InterruptedSessionTolerantMiddleware
+from core.models import (
+    ChatMessage, ChatSession, InterviewSession, Resume, ResumeCache, UserProfile, LeaderboardEntry, PooledQuestion, QuizAttempt, QuizDailyStats, QuizQuestion, UserDailyMission, UserStats,
+)
+
+
+class FakeOllamaMixin:
+    """Runs a FakeOllamaServer for the class; setUp clears its stats and injected failures."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = FakeOllamaServer(seed=0).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        self.server.reset_stats()
+        self.server.drop_rate = self.server.error_rate = 0.0
+
+    def use_fake_llm(self):
+        """Point the shared LLM clients at the fake server, with the reply cache off."""
+        for patcher in (mock.patch.object(ai_llm, "_client", LLMClient(base_url=self.server.url)),
+                        mock.patch.object(ai_llm, "OLLAMA_URL", self.server.url)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        no_cache = override_settings(LLM_CACHE_ENABLED=False)
+        no_cache.enable()
+        self.addCleanup(no_cache.disable)
+
+
+class FakeOllamaTestCase(FakeOllamaMixin, SimpleTestCase):
+    pass
+
+
+class LLMClientTests(FakeOllamaTestCase):
+    def llm_client(self, **kwargs):
+        return LLMClient(base_url=self.server.url, max_retries=2, retry_backoff=0, **kwargs)
+
+    def test_request_and_stream(self):
+        client = self.llm_client()
+        payload = {"model": "m", "messages": [{"role": "user", "content": "hi"}]}
+        reply = client.request_json("/api/chat", payload)["message"]["content"]
+        streamed = "".join(c["message"]["content"] for c in client.stream_json("/api/chat", payload))
+        self.assertEqual(streamed, reply)
+
+    def test_refused_connection_is_retried(self):
+        with socket.socket() as s:
+            s.bind(("127.0.0.1", 0))
+            port = s.getsockname()[1]
+        client = LLMClient(base_url=f"http://127.0.0.1:{port}", max_retries=2, retry_backoff=0)
+        with mock.patch.object(client.session, "post", wraps=client.session.post) as post:
+            with self.assertRaises(requests.exceptions.ConnectionError):
+                client.request_json("/api/chat", {})
+        self.assertEqual(post.call_count, 3)
+
+    def test_dropped_connection_is_retried_for_plain_requests(self):
+        self.server.drop_rate = 1.0
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            self.llm_client().request_json("/api/chat", {})
+        self.assertEqual(self.server.requests_served, 3)
+
+    def test_stale_keep_alive_connection_is_retried(self):
+        client = self.llm_client()
+        client.request_json("/api/chat", {})
+        # The next call goes out on the pooled socket, which the server closes
+        self.server.drop_rate = 0.5
+        rolls = itertools.chain([0.0], itertools.repeat(0.9))
+        with mock.patch.object(self.server.random, "random", side_effect=lambda: next(rolls)):
+            client.request_json("/api/chat", {})
+        self.assertEqual(self.server.requests_served, 3)
+
+    def test_dropped_stream_is_not_retried(self):
+        self.server.drop_rate = 1.0
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            list(self.llm_client().stream_json("/api/chat", {}))
+        self.assertEqual(self.server.requests_served, 1)
+
+    def test_blocked_stream_read_ends_at_the_deadline(self):
+        self.server.token_latency = 0.9
+        self.addCleanup(setattr, self.server, "token_latency", 0.0)
+        client = self.llm_client(deadline=1.0, read_timeout=30)
+        start = time.monotonic()
+        with self.assertRaises(ai_llm.LLMDeadlineExceeded):
+            list(client.stream_json("/api/chat", {"messages": [{"role": "user", "content": "hi"}]}))
+        self.assertLess(time.monotonic() - start, 1.5)
+
+    def test_streamed_error_response_is_closed(self):
+        self.server.error_rate = 1.0
+        client = self.llm_client()
+        responses = []
+
+        def post(*args, **kwargs):
+            responses.append(requests.Session.post(client.session, *args, **kwargs))
+            return responses[-1]
+
+        with mock.patch.object(client.session, "post", post):
+            with self.assertRaises(requests.exceptions.HTTPError):
+                list(client.stream_json("/api/chat", {}))
+        self.assertTrue(responses[0].raw.closed)
+
+    def test_async_dropped_connection(self):
+        self.server.drop_rate = 1.0
+
+        async def call(stream):
+            client = AsyncLLMClient(base_url=self.server.url, max_retries=2, retry_backoff=0)
+            try:
+                if stream:
+                    return [chunk async for chunk in client.stream_json("/api/chat", {})]
+                return await client.request_json("/api/chat", {})
+            finally:
+                await client.aclose()
+
+        for stream, served in ((False, 3), (True, 1)):
+            self.server.reset_stats()
+            with self.subTest(stream=stream), self.assertRaises(httpx.RemoteProtocolError):
+                asyncio.run(call(stream))
+            self.assertEqual(self.server.requests_served, served)
+
+
+class LLMResponseCacheTests(SimpleTestCase):
+    def test_repeated_reply_fills_variants(self):
+        cache = LLMResponseCache(variants=3)
+        for _ in range(2):
+            self.assertIsNone(cache.get("k"))
+            cache.put("k", "same question")
+        self.assertIsNone(cache.get("k"))
+        cache.put("k", "same question")
+        self.assertEqual(cache.get("k"), "same question")
+        self.assertEqual((cache.hits, cache.misses), (1, 3))
+
+    def test_serves_distinct_variants(self):
+        cache = LLMResponseCache(variants=2)
+        cache.put("k", "first")
+        cache.put("k", "second")
+        self.assertEqual({cache.get("k") for _ in range(50)}, {"first", "second"})
+
+    def test_expiry_and_eviction(self):
+        cache = LLMResponseCache(max_entries=2, ttl=60)
+        with mock.patch("ai_interview_coach.ai_llm.time.monotonic", return_value=0):
+            cache.put("a", "A")
+            cache.put("b", "B")
+            cache.get("a")
+            cache.put("c", "C")  # evicts b, the least recently used
+        with mock.patch("ai_interview_coach.ai_llm.time.monotonic", return_value=30):
+            self.assertEqual((cache.get("a"), cache.get("b"), cache.get("c")), ("A", None, "C"))
+        with mock.patch("ai_interview_coach.ai_llm.time.monotonic", return_value=61):
+            self.assertIsNone(cache.get("a"))
+
+
+class FakeOllamaServerTests(SimpleTestCase):
+    def serve(self, **kwargs):
+        server = FakeOllamaServer(seed=0, **kwargs).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        return server
+
+    def chat(self, server, *contents):
+        messages = [{"role": "user", "content": c} for c in contents]
+        return LLMClient(base_url=server.url, max_retries=0).request_json(
+            "/api/chat", {"model": "m", "messages": messages, "stream": False})
+
+    def test_record_then_replay(self):
+        upstream = self.serve()
+        cassette = os.path.join(tempfile.mkdtemp(), "cassette.jsonl")
+        self.addCleanup(os.remove, cassette)
+
+        recorded = self.chat(self.serve(cassette=cassette, mode="record", upstream=upstream.url), "hello")
+        upstream.shutdown()
+        replayed = self.chat(self.serve(cassette=cassette, mode="replay"), "hello")
+
+        self.assertEqual(replayed["message"]["content"], recorded["message"]["content"])
+        self.assertEqual(upstream.requests_served, 1)
+
+    def test_kv_slots_skip_the_cached_prefix(self):
+        server = self.serve(kv_slots=4)
+        history = ["Tell me about a project you led. " * 20]
+        first = self.chat(server, *history)
+        second = self.chat(server, *history, "It was a payments service.")
+        self.assertLess(second["prompt_eval_count"], first["prompt_eval_count"] / 4)
+
+    def test_injected_errors(self):
+        with self.assertRaises(requests.exceptions.HTTPError):
+            self.chat(self.serve(error_rate=1.0), "hello")
+
+
+class QuestionBatchTests(FakeOllamaTestCase):
+    def setUp(self):
+        super().setUp()
+        self.use_fake_llm()
+
+    def test_clean_questions_drops_blanks_and_near_duplicates(self):
+        questions = ["What is REST?", " what is rest ", "", None, 3, "Explain CAP.", "Define ACID."]
+        self.assertEqual(ai_llm.clean_questions(questions, count=2), ["What is REST?", "Explain CAP."])
+
+    def test_scanner_yields_elements_as_they_complete(self):
+        scanner = ai_llm.JSONStringArrayScanner()
+        pieces = ['{"ques', 'tions": ["Why ', 'a \\"queue\\"?", "Wh', 'en?"', ']}']
+        self.assertEqual([scanner.feed(p) for p in pieces], [[], [], ['Why a "queue"?'], ["When?"], []])
+        self.assertTrue(scanner.closed)
+
+    def test_batch_is_one_call(self):
+        questions = ai_llm.generate_question_batch("Software", "Easy", "", count=4)
+        self.assertEqual(len(questions), 4)
+        self.assertEqual(self.server.requests_served, 1)
+
+    def test_streamed_batch_matches_count(self):
+        questions = list(ai_llm.stream_question_batch("Software", "Easy", "", count=3))
+        self.assertEqual(len(set(questions)), 3)
+
+    def test_unreachable_model_gives_no_questions(self):
+        self.server.error_rate = 1.0
+        self.assertEqual(ai_llm.generate_question_batch(count=3), [])
+        self.assertEqual(list(ai_llm.stream_question_batch(count=3)), [])
+
+
+class ConversationMemoryTests(SimpleTestCase):
+    def history(self, turns):
+        # 40 characters: 10 tokens + 4 of overhead per message
+        return [{"role": role, "content": f"{role} {i}".ljust(40)} for i in range(turns) for role in ("user", "assistant")]
+
+    def test_history_within_budget_is_sent_whole(self):
+        memory = ConversationMemory(budget_tokens=14 * 6)
+        self.assertEqual(memory.window_start(self.history(3)), 0)
+        self.assertEqual(memory.prompt_history(self.history(3), "Asked about REST.")[0]["role"], "system")
+
+    def test_overflow_cuts_back_to_keep_ratio_on_a_user_turn(self):
+        memory = ConversationMemory(budget_tokens=14 * 6, keep_ratio=0.5)
+        history = self.history(4)
+        start = memory.window_start(history)
+        self.assertEqual(start, 6)
+        self.assertEqual(history[start]["role"], "user")
+
+    def test_oversized_last_message_is_kept(self):
+        memory = ConversationMemory(budget_tokens=50)
+        history = self.history(2) + [{"role": "user", "content": "x" * 1000}]
+        self.assertEqual(memory.window_start(history), len(history) - 1)
+
+
+class KVReuseTests(FakeOllamaTestCase):
+    def setUp(self):
+        super().setUp()
+        self.use_fake_llm()
+
+    def test_carried_context_only_evaluates_the_new_prompt(self):
+        system = "You are an interviewer. " * 50
+        first = ai_llm.generate_with_context("Ask a question.", system=system)
+        second = ai_llm.generate_with_context("Next question.", context=first["context"], system=system)
+
+        self.assertGreater(len(second["context"]), len(first["context"]))
+        self.assertLess(second["metrics"]["prompt_eval_count"], first["metrics"]["prompt_eval_count"] / 10)
+
+    def test_failed_call_hands_back_the_context(self):
+        self.server.error_rate = 1.0
+        self.assertEqual(ai_llm.generate_with_context("Hi", context=[1, 2, 3]),
+                         {"response": "", "context": [1, 2, 3], "metrics": {}})
+
+    def test_eval_metrics(self):
+        metrics = ai_llm.eval_metrics({"prompt_eval_count": 12, "eval_duration": 2_500_000, "done": True})
+        self.assertEqual(metrics, {"prompt_eval_count": 12, "eval_ms": 2.5})
+
+    def test_system_prompt_is_stable_across_turns(self):
+        self.assertIs(ai_llm.system_prompt("Software", "Easy", ""), ai_llm.system_prompt("Software", "Easy", ""))
+
+
+@override_settings(CHAT_HISTORY_TOKEN_BUDGET=60)
+@mock.patch("core.chat_memory.tasks.submit")
+class ChatMemoryTests(TestCase):
+    def request(self, session=None):
+        request = RequestFactory().post("/api/chat/")
+        request.session = session if session is not None else SessionStore()
+        request.user = AnonymousUser()
+        return request
+
+    def turn(self, session, i):
+        ctx = chat_memory.load(self.request(session))
+        chat_memory.record_turn(ctx, f"answer {i}".ljust(40), f"question {i}".ljust(40))
+        return ctx
+
+    def test_turns_are_appended_and_reloaded(self, submit):
+        session = SessionStore()
+        first = self.turn(session, 0)
+        self.turn(session, 1)
+
+        ctx = chat_memory.load(self.request(session))
+        self.assertEqual(ctx.chat_session_id, first.chat_session_id)
+        self.assertEqual([m["content"].strip() for m in ctx.history],
+                         ["answer 0", "question 0", "answer 1", "question 1"])
+        self.assertEqual(ctx.message_ids, list(ChatMessage.objects.order_by("id").values_list("id", flat=True)))
+        submit.assert_not_called()
+
+        chat_memory.reset(session)
+        self.assertNotEqual(chat_memory.load(self.request(session)).chat_session_id, first.chat_session_id)
+
+    @mock.patch("core.chat_memory.summarize_conversation", return_value="Talked about answers 0 and 1.")
+    def test_overflow_is_folded_into_the_summary(self, summarize, submit):
+        session = SessionStore()
+        for i in range(3):
+            self.turn(session, i)
+        # 6 messages of 14 tokens overflow the 60 token budget
+        fold, chat_session_id, through_id = submit.call_args.args
+        self.assertEqual(fold, chat_memory.fold_messages)
+
+        fold(chat_session_id, through_id)
+        fold(chat_session_id, through_id)  # a repeated job is a no-op
+
+        summarize.assert_called_once()
+        ctx = chat_memory.load(self.request(session))
+        self.assertEqual(ctx.summary, "Talked about answers 0 and 1.")
+        self.assertTrue(all(pk > through_id for pk in ctx.message_ids))
+        self.assertEqual(ctx.prompt_history()[0]["role"], "system")
+        self.assertEqual(ChatSession.objects.get(id=chat_session_id).summarized_through, through_id)
+
+
+class SessionMiddlewareTests(TestCase):
+    def test_session_deleted_during_request_does_not_fail_it(self):
+        session = SessionStore()
+        session["chat_session_id"] = 1
+        session.save()
+
+        def view(request):
+            request.session["chat_session_id"] = 2
+            SessionStore(session.session_key).delete()  # e.g. logged out in another tab
+            return HttpResponse("ok")
+
+        request = RequestFactory().get("/")
+        request.COOKIES["sessionid"] = session.session_key
+        response = InterruptedSessionTolerantMiddleware(view)(request)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("sessionid", response.cookies)
+
+
+class SpellCheckerTests(SimpleTestCase):
+    def test_suggests_closest_then_most_frequent(self):
+        checker = SpellChecker({"receive": 50, "review": 80, "the": 1000, "ten": 5, "mail": 20})
+        self.assertEqual(checker.check("I recieve teh mail"), [("recieve", "receive"), ("teh", "the")])
+
+    def test_inflected_forms_of_known_words_pass(self):
+        checker = get_spell_checker()
+        text = ("I implemented deployments, mentoring juniors and tuning slow queries; "
+                "we planned, coded and applied fixes to the team's services.")
+        self.assertEqual(checker.check(text), [])
+
+    def test_misspelled_inflections_are_still_flagged(self):
+        checker = get_spell_checker()
+        issues = checker.check("I recieved the requirments and implementd the fetaures")
+        self.assertEqual([token for token, _ in issues], ["recieved", "requirments", "implementd", "fetaures"])
+        self.assertEqual(dict(issues)["recieved"], "received")
+
+
+class AnalysisPoolTests(SimpleTestCase):
+    answer = "I enjoyed leading the migration and we recieved great feedback."
+
+    def test_worker_process_gives_the_full_analysis(self):
+        pool = AnalysisPool(workers=1, timeout=60)
+        self.addCleanup(lambda: pool._executor and pool._executor.shutdown())
+        self.assertEqual(pool.analyze(self.answer), answer_analysis.analyze(self.answer))
+        pending = pool.start_analyze(self.answer)
+        self.assertEqual(pending.result(), answer_analysis.analyze(self.answer))
+        self.assertTrue(pending.done())
+        self.assertEqual(asyncio.run(pool.aanalyze_batch([self.answer])),
+                         answer_analysis.analyze_batch([self.answer]))
+        self.assertEqual(pool.pending, 0)
+
+    def test_saturated_pool_falls_back_to_the_reduced_check(self):
+        pool = AnalysisPool(workers=1, max_pending=0)
+        result = pool.analyze(self.answer)
+        self.assertTrue(result["reduced"])
+        self.assertEqual(result["spelling"], [])
+        self.assertEqual(pool.fallbacks, 1)
+        self.assertIsNone(pool._executor)
+
+    def test_slow_job_falls_back_to_the_reduced_check(self):
+        pool = AnalysisPool(workers=1, timeout=0.01)
+        with mock.patch.object(pool, "_submit", side_effect=lambda fn, arg: (Future(), None)):
+            self.assertTrue(pool.analyze(self.answer)["reduced"])
+            self.assertTrue(asyncio.run(pool.aanalyze(self.answer))["reduced"])
+        self.assertEqual(pool.fallbacks, 2)
+
+    def test_job_cancelled_by_a_pool_restart_falls_back(self):
+        pool = AnalysisPool(workers=1)
+
+        def cancelled(fn, arg):
+            future = Future()
+            future.cancel()
+            return future, None
+
+        with mock.patch.object(pool, "_submit", side_effect=cancelled):
+            self.assertTrue(pool.analyze(self.answer)["reduced"])
+            self.assertTrue(asyncio.run(pool.aanalyze(self.answer))["reduced"])
+        self.assertEqual(pool.fallbacks, 2)
+
+    def test_no_workers_runs_inline(self):
+        result = AnalysisPool(workers=0).analyze(self.answer)
+        self.assertFalse(result["reduced"])
+        self.assertEqual(result["spelling"], [{"word": "recieved", "suggestion": "received"}])
+
+
+class MockFeedbackTests(TestCase):
+    url = "/api/mock/feedback/"
+
+    def setUp(self):
+        self.user = User.objects.create_user("candidate")
+        self.client.force_login(self.user)
+        patcher = mock.patch("core.views.get_analysis_pool", return_value=AnalysisPool(workers=0))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def post(self, data):
+        return self.client.post(self.url, data, content_type="application/json")
+
+    def test_scores_answered_questions_and_saves_the_session(self):
+        items = [
+            {"question": "Tell me about yourself.", "answer": "I build reliable backend services in Python. " * 3},
+            {"question": "Why this role?", "answer": "I like teh product."},
+            {"question": "Any questions?", "answer": answer_analysis.NO_ANSWER},
+        ]
+        response = self.post({"field": "Software", "items": items})
+
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        scores = [a["score"] for a in body["answers"]]
+        self.assertEqual(scores[2], 0.0)
+        self.assertEqual(body["aggregate"]["answered"], 2)
+        self.assertEqual(body["aggregate"]["score"], round((scores[0] + scores[1]) / 2, 1))
+        self.assertEqual(body["answers"][1]["spelling"], [{"word": "teh", "suggestion": "the"}])
+        session = InterviewSession.objects.get(id=body["session_id"])
+        self.assertEqual(session.answers[1], "I like teh product.")
+        self.assertEqual(session.feedback["aggregate"], body["aggregate"])
+
+    def test_malformed_items_are_rejected(self):
+        for items in ([], [{"question": "Q", "answer": None}], [{"question": 3, "answer": "A"}],
+                      [{"question": "Q", "answer": "A"}, "A"], "Q", [{"question": "Q"}] * 51):
+            with self.subTest(items=items):
+                self.assertEqual(self.post({"items": items}).status_code, 400)
+        self.assertFalse(InterviewSession.objects.exists())
+
+
+def ndjson(response):
+    return [json.loads(line) for line in b"".join(response.streaming_content).splitlines() if line]
+
+
+class ChatStreamTests(FakeOllamaMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.use_fake_llm()
+
+    def test_streamed_reply_matches_the_full_reply(self):
+        tokens = list(ai_llm.stream_chat_with_model([], "Hello"))
+        self.assertGreater(len(tokens), 1)
+        self.assertEqual("".join(tokens).strip(), ai_llm.chat_with_model([], "Hello"))
+
+    def test_api_chat_streams_tokens_then_done(self):
+        response = self.client.post("/api/chat/", {"message": "Hello", "stream": True}, content_type="application/json")
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        events = ndjson(response)
+
+        self.assertTrue(all("token" in e for e in events[:-1]))
+        self.assertEqual(events[-1]["reply"], "".join(e["token"] for e in events[:-1]).strip())
+        # The turn is stored once the stream has ended
+        self.assertEqual(ChatMessage.objects.filter(role="assistant").get().content, events[-1]["reply"])
+
+    def test_send_message_stream_needs_login(self):
+        data = {"message": "Hello", "stream": True}
+        self.assertEqual(self.client.post("/chat/message/", data, content_type="application/json").status_code, 302)
+        self.client.force_login(User.objects.create_user("candidate"))
+        events = ndjson(self.client.post("/chat/message/", data, content_type="application/json"))
+        self.assertIn(events[-1]["reply"], CANNED_QUESTIONS)
+
+
+class AsyncChatTests(FakeOllamaMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.use_fake_llm()
+
+    async def test_async_reply_matches_the_sync_one(self):
+        try:
+            reply = await ai_llm.achat_with_model([], "Hello")
+            tokens = [t async for t in ai_llm.astream_chat_with_model([], "Hello")]
+        finally:
+            await ai_llm.get_async_client().aclose()
+
+        self.assertEqual(reply, ai_llm.chat_with_model([], "Hello"))
+        self.assertEqual("".join(tokens).strip(), reply)
+
+    async def test_async_view(self):
+        request = AsyncRequestFactory().post("/chat/message/", {"message": "Hello"}, content_type="application/json")
+        request.session = SessionStore()
+        request.auser = mock.AsyncMock(return_value=await User.objects.acreate(username="candidate"))
+        request.user = request.auser.return_value
+
+        try:
+            body = json.loads((await views.send_message_async(request)).content)
+        finally:
+            await ai_llm.get_async_client().aclose()
+
+        self.assertIn(body["reply"], CANNED_QUESTIONS)
+        self.assertEqual(await ChatMessage.objects.filter(session__user__username="candidate").acount(), 2)
+
+
+class ChatTurnTests(FakeOllamaMixin, TestCase):
+    answer = "I led the migration of our billing service to Postgres."
+
+    def setUp(self):
+        super().setUp()
+        self.use_fake_llm()
+        patcher = mock.patch("core.views.get_analysis_pool", return_value=AnalysisPool(workers=0))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def turn(self, **data):
+        return self.client.post("/api/turn/", dict({"message": self.answer, "field": "Software"}, **data),
+                                content_type="application/json")
+
+    def test_reply_and_feedback_in_one_response(self):
+        body = self.turn().json()
+
+        self.assertIn(body["reply"], CANNED_QUESTIONS)
+        self.assertEqual(body["feedback"], answer_analysis.analyze(self.answer))
+        self.assertEqual(list(ChatMessage.objects.order_by("id").values_list("role", "content")),
+                         [("user", self.answer), ("assistant", body["reply"])])
+
+    def test_streamed_turn(self):
+        events = ndjson(self.turn(stream=True))
+
+        self.assertEqual([e["feedback"] for e in events if "feedback" in e], [answer_analysis.analyze(self.answer)])
+        done = events[-1]
+        self.assertTrue(done["done"])
+        self.assertEqual("".join(e["token"] for e in events if "token" in e).strip(), done["reply"])
+        self.assertEqual(done["metrics"]["eval_count"], sum(1 for e in events if "token" in e))
+
+    def test_feedback_is_sent_when_the_model_fails(self):
+        self.server.error_rate = 1.0
+        events = ndjson(self.turn(stream=True))
+        self.assertEqual(len([e for e in events if "feedback" in e]), 1)
+        self.assertTrue(events[-1]["reply"].startswith("Coach: Error contacting AI coach"))
+
+    def test_sync_view_uses_the_pooled_client(self):
+        with mock.patch.object(ai_llm, "get_async_client") as get_async_client:
+            self.assertEqual(self.turn().status_code, 200)
+            self.assertEqual(ndjson(self.turn(stream=True))[-1]["done"], True)
+        get_async_client.assert_not_called()
+
+    async def test_async_variant(self):
+        request = AsyncRequestFactory().post("/api/turn/", {"message": self.answer}, content_type="application/json")
+        request.session = SessionStore()
+        request.auser = mock.AsyncMock(return_value=AnonymousUser())
+        try:
+            response = await views.api_turn_async(request)
+        finally:
+            await ai_llm.get_async_client().aclose()
+
+        body = json.loads(response.content)
+        self.assertIn(body["reply"], CANNED_QUESTIONS)
+        self.assertEqual(body["feedback"], answer_analysis.analyze(self.answer))
+        self.assertEqual(await ChatMessage.objects.acount(), 2)
+
+
+def make_pdf(*pages):
+    """A PDF with one page per string, one line of text per line of the string."""
+    buffer = io.BytesIO()
+    pdf = canvas.Canvas(buffer)
+    for page in pages:
+        for i, line in enumerate(page.splitlines()):
+            pdf.drawString(72, 760 - 14 * i, line)
+        pdf.showPage()
+    pdf.save()
+    return buffer.getvalue()
+
+
+RESUME_PDF = make_pdf(
+    "Jane Doe\nSkills\nPython, Django, k8s and PostgreSQL",
+    "Projects\nPayments API - rewrote billing in Django\nExperience\nBackend engineer at Acme",
+)
+
+
+class MediaRootMixin:
+    """Uploads go to a temporary MEDIA_ROOT, removed after each test."""
+
+    def setUp(self):
+        super().setUp()
+        media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media, ignore_errors=True)
+        media_root = override_settings(MEDIA_ROOT=media)
+        media_root.enable()
+        self.addCleanup(media_root.disable)
+
+
+class ResumeParserTests(SimpleTestCase):
+    def extract(self, *pages, **kwargs):
+        with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as f:
+            f.write(make_pdf(*pages))
+        self.addCleanup(os.remove, f.name)
+        return resume_parser.extract_resume_text(f.name, **kwargs)
+
+    def test_text_is_cut_at_max_bytes(self):
+        text = self.extract("a" * 10, "b" * 50, max_bytes=10)
+        self.assertEqual(text, "a" * 10)
+        text = self.extract("a" * 10, "b" * 50, max_bytes=15)
+        self.assertEqual(text, "a" * 10 + "\n" + "bbbb")
+
+    def test_multi_page_last_section_is_read_to_its_end(self):
+        text = self.extract(
+            "Education\nBSc\nSkills\nPython\nProjects\nBilling",
+            "Experience\nBackend engineer at Acme",
+            "Kubernetes migration at Acme",
+            "Oncall lead at Acme\nAwards\nHackathon winner",
+            "Publications page",
+        )
+        self.assertIn("Oncall lead", text)
+        self.assertNotIn("Publications", text)
+
+    def test_match_header_synonyms_and_formatting(self):
+        self.assertEqual(resume_parser.match_header("## TECHNICAL SKILLS"), ("skills", ""))
+        self.assertEqual(resume_parser.match_header("Work History:"), ("experience", ""))
+        self.assertEqual(resume_parser.match_header("Skills & Tools"), ("skills", ""))
+        self.assertEqual(resume_parser.match_header("Skills: Python, SQL"), ("skills", "Python, SQL"))
+        self.assertIsNone(resume_parser.match_header("Experience with Django"))
+        self.assertIsNone(resume_parser.match_header("I have skills"))
+        self.assertEqual(resume_parser.match_header("2) Skills"), ("skills", ""))
+        self.assertEqual(resume_parser.match_header("## 3. Projects"), ("projects", ""))
+        for line in ("5 projects", "2019 Experience", "3 skills:", "12 awards"):
+            self.assertIsNone(resume_parser.match_header(line), line)
+
+    def test_parse_sections(self):
+        sections = resume_parser.parse_sections(
+            "Jane Doe\r\nSkills: Python\nSQL\n\n\n\n• Work Experience\nAcme\nExperience with Django\nAwards\nHackathon"
+        )
+        self.assertEqual(sections, {
+            "misc": "Jane Doe",
+            "skills": "Python\nSQL",
+            "experience": "Acme\nExperience with Django",
+            "achievements": "Hackathon",
+        })
+
+
+@mock.patch("core.resume_ingest.tasks.submit")
+class ResumeIngestTests(MediaRootMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user("candidate")
+
+    def upload(self, content=RESUME_PDF):
+        return resume_ingest.create_resume(self.user, SimpleUploadedFile("cv.pdf", content))
+
+    def test_upload_is_ingested_in_the_background(self, submit):
+        resume = self.upload()
+        self.assertEqual(resume.status, Resume.PENDING)
+        submit.assert_called_once_with(resume_ingest.ingest, resume.pk, key=("resume-ingest", resume.pk))
+
+        self.assertTrue(resume_ingest.ingest(resume.pk))
+        self.assertFalse(resume_ingest.ingest(resume.pk))  # already claimed
+
+        resume.refresh_from_db()
+        self.assertEqual(resume.status, Resume.READY)
+        self.assertEqual(resume.skills, "Python, Django, Kubernetes, PostgreSQL")
+        self.assertIn("Payments API", resume.sections["projects"])
+        self.assertEqual(UserProfile.objects.get(user=self.user).skills, resume.skills)
+
+    def test_same_file_again_is_ready_from_the_cache(self, submit):
+        resume_ingest.ingest(self.upload().pk)
+        again = self.upload()
+
+        self.assertEqual((again.status, again.cache_hit), (Resume.READY, True))
+        self.assertEqual(submit.call_count, 1)
+        self.assertEqual(resume_ingest.hit_rate(), (1, 2))
+
+    def test_unreadable_file_fails_with_an_error(self, submit):
+        resume = self.upload(b"%PDF-1.4 not really")
+        with self.assertLogs("core.resume_ingest", "ERROR"):
+            self.assertFalse(resume_ingest.ingest(resume.pk))
+        resume.refresh_from_db()
+        self.assertEqual(resume.status, Resume.FAILED)
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.get(f"/api/resume/{resume.pk}/status/").json()["status"], Resume.FAILED)
+
+    def test_status_and_questions_endpoints(self, submit):
+        resume = self.upload()
+        resume_ingest.ingest(resume.pk)
+        self.client.force_login(self.user)
+
+        status = self.client.get(f"/api/resume/{resume.pk}/status/").json()
+        self.assertEqual(status["missing_sections"], ["education"])
+        response = self.client.post("/api/generate-questions/", {"field": "Software", "resume_id": resume.pk})
+        self.assertEqual(response.json()["resume_id"], resume.pk)
+        self.assertIn("Payments API", response.json()["questions"]["project"][0])
+
+    def test_bad_resume_id_is_a_400(self, submit):
+        self.client.force_login(self.user)
+        response = self.client.post("/api/generate-questions/", {"resume_id": "latest"})
+        self.assertEqual(response.status_code, 400)
+
+
+@mock.patch("core.resume_ingest.tasks.submit")
+class ResumeCacheTests(MediaRootMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user("candidate")
+        self.client.force_login(self.user)
+
+    def questions(self, content=RESUME_PDF):
+        resume = resume_ingest.create_resume(self.user, SimpleUploadedFile("cv.pdf", content))
+        resume_ingest.ingest(resume.pk)
+        return self.client.post("/api/generate-questions/", {"field": "Software", "resume_id": resume.pk}).json()
+
+    def test_questions_are_reused_for_the_same_file_and_field(self, submit):
+        first = self.questions()
+        with mock.patch("core.views._technical_questions") as technical:
+            second = self.questions()
+        technical.assert_not_called()
+
+        self.assertEqual(second["questions"], first["questions"])
+        entry = ResumeCache.objects.get()
+        self.assertEqual((entry.hits, entry.question_hits), (1, 1))
+        self.assertEqual(submit.call_count, 1)
+
+    def test_least_recently_used_entries_are_evicted(self, submit):
+        now = timezone.now()
+        for i, used in enumerate((now, now - timedelta(hours=2), now - timedelta(hours=1))):
+            ResumeCache.objects.create(content_hash=f"{i:064d}")
+            ResumeCache.objects.filter(content_hash=f"{i:064d}").update(last_used_at=used)
+
+        self.assertEqual(resume_ingest.evict(max_entries=2), 1)
+        self.assertFalse(ResumeCache.objects.filter(content_hash=f"{1:064d}").exists())
+
+    def test_entries_from_another_parser_version_are_ignored(self, submit):
+        resume = resume_ingest.create_resume(self.user, SimpleUploadedFile("cv.pdf", RESUME_PDF))
+        resume_ingest.ingest(resume.pk)
+        ResumeCache.objects.update(parser_version="1:0000", skills="Cobol")
+
+        again = resume_ingest.create_resume(self.user, SimpleUploadedFile("cv.pdf", RESUME_PDF))
+        self.assertFalse(again.cache_hit)
+        resume_ingest.ingest(again.pk)
+        entry = ResumeCache.objects.get()
+        self.assertEqual(entry.parser_version, resume_ingest.parser_version())
+        self.assertIn("Kubernetes", entry.skills)
+
+
+class SkillExtractorTests(SimpleTestCase):
+    TAXONOMY = {
+        "Java": ["jdk"], "JavaScript": ["js"], "C": ["ansi c"], "C++": ["cpp"],
+        "Machine Learning": ["ml"], "Kubernetes": ["k8s"], "Go": ["golang"],
+    }
+
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        self.path = os.path.join(directory, "cache", "automaton.pickle")
+
+    def test_matches_on_word_boundaries_leftmost_longest(self):
+        extractor = skills.SkillExtractor(self.TAXONOMY)
+        text = "JavaScript and Java, C++ on K8S;\nmachine   learning. Go to market with golang, Plan C"
+        self.assertEqual(extractor.extract(text), ["JavaScript", "Java", "C++", "Kubernetes", "Machine Learning", "Go"])
+
+    def test_ambiguous_names_match_through_their_aliases(self):
+        extractor = skills.SkillExtractor(skills.load_taxonomy())
+        text = "Built apps with SwiftUI and golang; iOS development. Swift turnaround, go to market, Plan C."
+        self.assertEqual(extractor.extract(text), ["Swift", "Go", "iOS"])
+        self.assertEqual(extractor.extract("Swift programming"), ["Swift"])
+
+    def test_saved_automaton_is_loaded_with_the_same_key(self):
+        skills.build_or_load(self.TAXONOMY, self.path, key="secret")
+        with mock.patch.object(skills.SkillExtractor, "__init__") as build:
+            extractor = skills.build_or_load(self.TAXONOMY, self.path, key="secret")
+        build.assert_not_called()
+        self.assertEqual(extractor.extract("k8s"), ["Kubernetes"])
+
+    def test_tampered_or_foreign_file_is_not_unpickled(self):
+        skills.build_or_load(self.TAXONOMY, self.path, key="secret")
+        with open(self.path, "r+b") as fh:
+            fh.seek(-1, os.SEEK_END)
+            last = fh.read(1)
+            fh.seek(-1, os.SEEK_END)
+            fh.write(bytes([last[0] ^ 1]))
+        with self.assertLogs("ai_interview_coach.skills", "WARNING"), \
+                mock.patch("ai_interview_coach.skills.pickle.loads") as loads:
+            skills.build_or_load(self.TAXONOMY, self.path, key="secret")
+        loads.assert_not_called()
+
+        with self.assertRaises(ValueError):
+            skills.SkillExtractor.load(self.path, "other key")
+
+    def test_changed_taxonomy_rebuilds(self):
+        skills.build_or_load(self.TAXONOMY, self.path, key="secret")
+        extractor = skills.build_or_load(dict(self.TAXONOMY, Rust=["rustlang"]), self.path, key="secret")
+        self.assertEqual(extractor.extract("rustlang"), ["Rust"])
+
+    def test_no_key_means_no_file(self):
+        skills.build_or_load(self.TAXONOMY, self.path)
+        self.assertFalse(os.path.exists(self.path))
+
+
+class QuestionIndexTests(TestCase):
+    def setUp(self):
+        self.index = question_index.QuestionIndex()
+
+    def search(self, text, field=None, difficulty=None, **kwargs):
+        return [t for _, t in self.index.search(question_index.terms(text), field, difficulty, **kwargs)]
+
+    def test_skill_aliases_meet_and_facets_filter(self):
+        self.index.add(("pool", 1), "How do you scale a k8s cluster?", "Software", "Hard")
+        self.index.add(("pool", 2), "How does Kubernetes schedule pods?", "Marketing", "Hard")
+        self.index.add(("pool", 3), "What is Kubernetes?", "Software", "Easy")
+
+        self.assertEqual(set(self.search("Kubernetes")), {
+            "How do you scale a k8s cluster?", "How does Kubernetes schedule pods?", "What is Kubernetes?"})
+        self.assertEqual(self.search("Kubernetes", "Software", "Hard"), ["How do you scale a k8s cluster?"])
+        self.assertEqual(self.search("Kubernetes", "Software", exclude={"What is Kubernetes?"}),
+                         ["How do you scale a k8s cluster?"])
+
+        self.index.remove(("pool", 1))
+        self.assertEqual(self.search("Kubernetes", "Software", "Hard"), [])
+
+    def test_untagged_questions_rank_below_the_fields_own(self):
+        self.index.add(("quiz", 1), "What is Docker?")
+        self.index.add(("pool", 1), "What is Docker?", "Software")
+        self.index.add(("pool", 2), "Why Docker?", "Marketing")
+
+        results = self.index.search(question_index.terms("Docker"), "Software", k=5)
+        self.assertEqual(len(results), 2)
+        (tagged, _), (untagged, _) = results
+        self.assertAlmostEqual(untagged, tagged * question_index.UNTAGGED_WEIGHT)
+
+        self.assertEqual(len(self.index.search(question_index.terms("Docker"), k=5)), 3)
+
+    def test_refresh_picks_up_rows_by_id(self):
+        self.index.build()
+        PooledQuestion.objects.bulk_create([PooledQuestion(
+            field="Software", difficulty="Easy", text="How do you tune Elasticsearch?", text_hash="x")])
+        self.index.refresh()
+        self.assertEqual(self.search("Elasticsearch", "Software"), [])
+
+        self.index.refresh(force=True)
+        self.assertEqual(self.search("Elasticsearch", "Software"), ["How do you tune Elasticsearch?"])
+
+
+@mock.patch("core.question_pool.schedule_refill")
+@mock.patch("core.question_pool.generate_question_batch")
+class QuestionPoolTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("candidate")
+
+    def test_cold_key_serves_curated_questions_without_the_llm(self, generate, schedule_refill):
+        questions = question_pool.take_questions(self.user, "Choose a field", "", "", 3)
+
+        self.assertEqual(questions, question_index.curated_questions("General")[:3])
+        generate.assert_not_called()
+        schedule_refill.assert_called_once_with("General", "Any", "", self.user.id)
+
+    def test_pool_questions_are_served_once_per_user(self, generate, schedule_refill):
+        question_pool.add_questions("Software", "Easy", "", [f"Question {i}?" for i in range(15)])
+
+        first = question_pool.take_questions(self.user, "Software", "Easy", "", 5)
+        schedule_refill.assert_not_called()  # 10 unseen left, the low watermark
+        second = question_pool.take_questions(self.user, "Software", "Easy", "", 5)
+
+        self.assertEqual(first + second, [f"Question {i}?" for i in range(10)])
+        schedule_refill.assert_called_once()
+        other = User.objects.create_user("other")
+        self.assertEqual(question_pool.take_questions(other, "Software", "Easy", "", 2), first[:2])
+
+    def test_refill_skips_duplicates_and_stops_when_nothing_is_new(self, generate, schedule_refill):
+        generate.return_value = ["What is a deadlock?", "what is a  DEADLOCK", "Explain caching."]
+
+        question_pool.refill("Software", "Easy", "", target=10)
+
+        self.assertEqual(PooledQuestion.objects.count(), 2)
+        self.assertEqual(generate.call_count, 2)  # the second batch added nothing
+
+
+class DailyQuizSamplingTests(TestCase):
+    def setUp(self):
+        self.mission = UserDailyMission.objects.create(user=User.objects.create_user("player"))
+
+    def make_questions(self, ids):
+        return QuizQuestion.objects.bulk_create([
+            QuizQuestion(id=i, question=f"Question {i}", option_a="a", option_b="b", option_c="c", option_d="d",
+                         correct_answer="A")
+            for i in ids
+        ])
+
+    def test_permute_is_a_bijection(self):
+        for size in (1, 5, 37, 1000):
+            images = [daily_quiz.permute(42, size, i) for i in range(size)]
+            self.assertEqual(sorted(images), list(range(size)))
+            self.assertEqual([daily_quiz.unpermute(42, size, v) for v in images], list(range(size)))
+
+    def bank_lookups(self):
+        return [q for q in self.queries.captured_queries
+                if 'FROM "core_quizquestion"' in q["sql"] and "MAX(" not in q["sql"]]
+
+    def test_sparse_ids_fill_the_quiz_in_growing_lookups(self):
+        self.make_questions(range(50, 2001, 50))  # 40 questions, ids up to 2000
+        with CaptureQueriesContext(connection) as self.queries:
+            questions = daily_quiz.questions_for(self.mission)
+        self.assertEqual(len(questions), 5)
+        self.assertLessEqual(len(self.bank_lookups()), daily_quiz._MAX_LOOKUPS)
+
+    def test_too_sparse_range_is_not_scanned(self):
+        self.make_questions([3, 500_000, 1_000_000])
+        with CaptureQueriesContext(connection) as self.queries:
+            questions = daily_quiz.questions_for(self.mission)
+        # Only what the capped lookups found; no query over the whole bank
+        self.assertLessEqual(len(questions), 3)
+        lookups = self.bank_lookups()
+        self.assertLessEqual(len(lookups), 2 * daily_quiz._MAX_LOOKUPS)
+        self.assertTrue(all(" IN (" in q["sql"] for q in lookups))
+
+    def test_new_cycle_once_the_shuffle_is_used_up(self):
+        self.make_questions(range(1, 8))
+        first = daily_quiz.questions_for(self.mission)
+        self.mission.queue_cursor = daily_quiz.next_cursor(self.mission, [q.id for q in first])
+        self.mission.save()
+        seed = self.mission.queue_seed
+
+        self.assertEqual(len(daily_quiz.questions_for(self.mission)), 5)
+        self.assertNotEqual(self.mission.queue_seed, seed)
+
+
+class DailyMissionGradingTests(TestCase):
+    def setUp(self):
+        self.questions = QuizQuestion.objects.bulk_create([
+            QuizQuestion(question=f"Question {i}", option_a="a", option_b="b", option_c="c", option_d="d",
+                         correct_answer="A")
+            for i in range(5)
+        ])
+        self.user = User.objects.create_user("player")
+        self.mission = UserDailyMission.objects.create(user=self.user)
+
+    def answers(self, count, correct=True):
+        return {str(q.id): "A" if correct else "B" for q in self.questions[:count]}
+
+    def test_query_count_does_not_grow_with_answers(self):
+        # in_bulk, SAVEPOINT, UPDATE mission, INSERT attempted questions,
+        # attempt log (INSERT attempts, UPDATE + INSERT for each of day, week, month),
+        # leaderboard (lock, read mission, count players ahead, shift ranks, INSERT entry), RELEASE SAVEPOINT
+        for count in (1, 5):
+            mission = UserDailyMission.objects.create(user=User.objects.create_user(f"player{count}"))
+            with self.assertNumQueries(17):
+                daily_quiz.grade(mission, self.answers(count))
+
+    def test_grades_and_records_submission(self):
+        answers = self.answers(5)
+        answers[str(self.questions[0].id)] = "C"
+        answers["csrfmiddlewaretoken"] = "token"
+        answers["999999"] = "A"
+
+        score, correct_ids = daily_quiz.grade(self.mission, answers)
+
+        self.mission.refresh_from_db()
+        self.assertEqual(score, 4)
+        self.assertEqual(sorted(correct_ids), [q.id for q in self.questions[1:]])
+        self.assertEqual((self.mission.score, self.mission.total_points, self.mission.streak), (4, 40, 1))
+        self.assertEqual(self.mission.attempted_questions.count(), 5)
+
+    def test_streak_continues_from_yesterday(self):
+        # Exactly 24 hours ago is always yesterday and no longer locked
+        self.mission.last_attempt = timezone.now() - timedelta(hours=24)
+        self.mission.streak, self.mission.total_points = 3, 100
+        self.mission.save()
+
+        daily_quiz.grade(self.mission, self.answers(2))
+
+        self.mission.refresh_from_db()
+        self.assertEqual((self.mission.streak, self.mission.total_points), (4, 120))
+
+    def test_second_submission_within_a_day_is_ignored(self):
+        self.assertIsNotNone(daily_quiz.grade(self.mission, self.answers(5)))
+        self.assertIsNone(daily_quiz.grade(self.mission, self.answers(5)))
+
+        self.mission.refresh_from_db()
+        self.assertEqual(self.mission.total_points, 50)
+
+
+class LeaderboardTests(TestCase):
+    def setUp(self):
+        self.questions = QuizQuestion.objects.bulk_create([
+            QuizQuestion(question=f"Question {i}", option_a="a", option_b="b", option_c="c", option_d="d",
+                         correct_answer="A")
+            for i in range(5)
+        ])
+
+    def play(self, name, correct, days_ago=1):
+        user, _ = User.objects.get_or_create(username=name)
+        mission, _ = UserDailyMission.objects.get_or_create(user=user)
+        UserDailyMission.objects.filter(pk=mission.pk).update(
+            last_attempt=timezone.now() - timedelta(days=days_ago))
+        daily_quiz.grade(mission, {str(q.id): "A" if i < correct else "B" for i, q in enumerate(self.questions)})
+        return user
+
+    def ranking(self):
+        return list(LeaderboardEntry.objects.order_by('rank').values_list('username', 'rank'))
+
+    def test_incremental_ranks_match_rebuild(self):
+        for name, correct in (("ann", 2), ("bob", 5), ("cat", 0), ("dan", 3), ("ann", 4), ("cat", 5), ("bob", 0)):
+            self.play(name, correct, days_ago=2)
+        incremental = self.ranking()
+
+        leaderboard.rebuild()
+
+        self.assertEqual(incremental, self.ranking())
+        # bob and cat tie on 50 points; cat got there first
+        self.assertEqual([name for name, _ in incremental], ["ann", "cat", "bob", "dan"])
+        self.assertEqual([rank for _, rank in incremental], [1, 2, 3, 4])
+
+    def test_rank_and_neighbours_in_constant_queries(self):
+        users = [self.play(f"user{i}", i % 6) for i in range(12)]
+
+        with self.assertNumQueries(3):
+            entry, nearby, players = leaderboard.around(users[0])
+
+        self.assertEqual(players, 12)
+        self.assertEqual(entry.user_id, users[0].pk)
+        self.assertEqual([e.rank for e in nearby], list(range(entry.rank - 2, min(entry.rank + 2, 12) + 1)))
+
+    def test_rank_update_takes_the_lock_first(self):
+        mission = UserDailyMission.objects.get(user=self.play("ann", 3))
+        with CaptureQueriesContext(connection) as queries:
+            leaderboard.record(mission)
+        self.assertIn("core_leaderboardlock", queries.captured_queries[0]["sql"])
+
+    def test_backfill_migration_ranks_existing_players(self):
+        for name, correct in (("ann", 2), ("bob", 5), ("cat", 0)):
+            self.play(name, correct)
+        expected = self.ranking()
+        LeaderboardEntry.objects.all().delete()
+
+        backfill = importlib.import_module("core.migrations.0022_leaderboard_lock_backfill").backfill_leaderboard
+        backfill(apps, None)
+
+        self.assertEqual(self.ranking(), expected)
+
+
+class QuizLogTests(TestCase):
+    def setUp(self):
+        self.questions = QuizQuestion.objects.bulk_create([
+            QuizQuestion(question=f"Question {i}", option_a="a", option_b="b", option_c="c", option_d="d",
+                         correct_answer="A")
+            for i in range(5)
+        ])
+        self.ann = User.objects.create_user("ann")
+        self.bob = User.objects.create_user("bob")
+
+    def submit(self, user, correct, when):
+        results = [(q.id, i < correct) for i, q in enumerate(self.questions)]
+        quiz_log.record(user.pk, results, when)
+
+    def test_rollups_feed_weekly_and_monthly_boards(self):
+        monday = timezone.make_aware(timezone.datetime(2026, 3, 9, 12))  # ISO week 11
+        self.submit(self.ann, 2, monday - timedelta(days=7))
+        self.submit(self.ann, 3, monday)
+        self.submit(self.ann, 1, monday + timedelta(days=1))
+        self.submit(self.bob, 5, monday + timedelta(days=6))
+        self.submit(self.bob, 5, monday + timedelta(days=7))
+
+        week = quiz_log.weekly_top(day=monday.date())
+        self.assertEqual([(r['user__username'], r['correct'], r['attempted'], r['points']) for r in week],
+                         [("bob", 5, 5, 50), ("ann", 4, 10, 40)])
+        month = quiz_log.monthly_top(day=monday.date())
+        self.assertEqual([(r['user__username'], r['points']) for r in month], [("bob", 100), ("ann", 60)])
+        self.assertEqual(QuizAttempt.objects.count(), 25)
+
+        before = sorted(QuizDailyStats.objects.values_list('user_id', 'day', 'attempted', 'correct', 'points'))
+        quiz_log.rebuild()
+        after = sorted(QuizDailyStats.objects.values_list('user_id', 'day', 'attempted', 'correct', 'points'))
+        self.assertEqual(before, after)
+        self.assertEqual(quiz_log.weekly_top(day=monday.date()), week)
+
+
+class UserStatsTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("candidate")
+
+    def session(self, answers, score=None):
+        feedback = {"answers": [], "aggregate": {"score": score}} if score is not None else []
+        return InterviewSession.objects.create(
+            user=self.user, field="Software", questions=[f"Q{i}" for i in range(len(answers))],
+            answers=answers, feedback=feedback)
+
+    def stored(self):
+        return UserStats.objects.filter(user=self.user).values(*user_stats.FIELDS).get()
+
+    def test_counters_follow_sessions(self):
+        self.session(["A good answer", "no idea"], score=6.0)
+        self.session(["Good", "good too", "meh"], score=8.0)
+        last = self.session(["skipped"])
+
+        row = UserStats.objects.get(user=self.user)
+        self.assertEqual((row.mock_interviews, row.answered, row.correct), (3, 6, 3))
+        self.assertEqual(row.average_score, 7.0)
+        self.assertEqual(row.last_activity, last.created_at)
+        self.assertEqual(self.stored(), user_stats.compute(self.user.pk))
+
+        last.delete()
+        self.assertEqual(self.stored(), user_stats.compute(self.user.pk))
+        self.assertEqual(UserStats.objects.get(user=self.user).mock_interviews, 2)
+
+    def test_missing_row_is_computed_from_existing_sessions(self):
+        self.session(["good"], score=5.0)
+        self.session(["fine"])
+        UserStats.objects.all().delete()
+
+        self.assertEqual(user_stats.check(), [(self.user.pk, 'row', None, 'missing')])
+        self.session(["good"], score=7.0)  # first write after the table existed
+
+        self.assertEqual(self.stored()['mock_interviews'], 3)
+        self.assertEqual(UserStats.objects.get(user=self.user).average_score, 6.0)
+        self.assertEqual(user_stats.check(), [])
+
+    def test_checker_reports_drift(self):
+        self.session(["good"])
+        UserStats.objects.filter(user=self.user).update(answered=40)
+
+        self.assertEqual(user_stats.check(), [(self.user.pk, 'answered', 40, 1)])
+        user_stats.recompute(self.user.pk)
+        self.assertEqual(user_stats.check(), [])
+
+    def test_profile_reads_one_row_whatever_the_history(self):
+        for _ in range(20):
+            self.session(["good answer"] * 5, score=5.0)
+        self.assertNumQueries(1, user_stats.get, self.user)
@@ -1,7 +1,17 @@
+from django.conf import settings
 from django.contrib import admin
 from django.urls import path
 from core import views as core_views
 
+if settings.ASYNC_CHAT_VIEWS:
+    send_message_view = core_views.send_message_async
+    api_chat_view = core_views.api_chat_async
+    api_turn_view = core_views.api_turn_async
+else:
+    send_message_view = core_views.send_message
+    api_chat_view = core_views.api_chat
+    api_turn_view = core_views.api_turn
+
 urlpatterns = [
     # Home
     path('', core_views.home, name='home'),
@@ -18,11 +28,16 @@ urlpatterns = [
     # AI Chat / Interview
     path('chat/', core_views.chat, name='chat'),
     path('chat/start/', core_views.start_chat, name='start_chat'),
-    path('chat/message/', core_views.send_message, name='send_message'),
+    path('chat/message/', send_message_view, name='send_message'),
 
     # API endpoints
-    path('api/chat/', core_views.api_chat, name='api_chat'),
+    path('api/chat/', api_chat_view, name='api_chat'),
+    path('api/turn/', api_turn_view, name='api_turn'),
+    path('api/mock/start/', core_views.api_mock_start, name='api_mock_start'),
+    path('api/mock/questions/', core_views.api_mock_questions, name='api_mock_questions'),
+    path('api/mock/feedback/', core_views.api_mock_feedback, name='api_mock_feedback'),
     path('api/upload_resume/', core_views.api_upload_resume, name='api_upload_resume'),
+    path('api/resume/<int:resume_id>/status/', core_views.api_resume_status, name='api_resume_status'),
     path('api/generate-questions/', core_views.generate_resume_questions, name='generate_questions'),
     path('api/feedback/', core_views.api_feedback, name='api_feedback'),
     path('api/session/', core_views.api_session, name='api_session'),
@@ -0,0 +1,114 @@
+# core/user_stats.py
+"""
+Per-user interview stats for the profile page, denormalized into UserStats.
+
+The profile used to load every InterviewSession of the user and walk their
+questions/answers JSON on each view. Now each new session adds its totals
+to the user's row (one UPDATE), new answers move last_activity, and the
+profile reads one row. Edits and deletes of sessions are rare, so those
+recompute the user's row from their sessions instead.
+
+A user without a row (sessions written before this table existed) gets it
+computed on first use; `manage.py backfill_user_stats` computes them all
+up front and `manage.py check_user_stats` compares stored rows against a
+fresh computation.
+"""
+from django.db import IntegrityError, transaction
+from django.db.models import F, Max
+
+from .models import InterviewAnswer, InterviewSession, UserStats
+
+COUNTERS = ('mock_interviews', 'answered', 'correct', 'score_total', 'scored_interviews')
+FIELDS = COUNTERS + ('last_activity',)
+
+
+def session_totals(questions, answers, feedback):
+    """What one session adds to its user's counters."""
+    aggregate = feedback.get('aggregate') if isinstance(feedback, dict) else None
+    score = aggregate.get('score') if isinstance(aggregate, dict) else None
+    return {
+        'mock_interviews': 1,
+        'answered': len(questions or []),
+        'correct': sum(1 for a in answers or [] if isinstance(a, str) and 'good' in a.lower()),
+        'score_total': float(score) if score is not None else 0.0,
+        'scored_interviews': 1 if score is not None else 0,
+    }
+
+
+def compute(user_id):
+    """The user's stats from their sessions and answers (the slow path the table replaces)."""
+    stats = dict.fromkeys(COUNTERS, 0)
+    stats['score_total'] = 0.0
+    last_activity = None
+    sessions = InterviewSession.objects.filter(user_id=user_id).values_list('questions', 'answers', 'feedback', 'created_at')
+    for questions, answers, feedback, created_at in sessions.iterator():
+        for f, v in session_totals(questions, answers, feedback).items():
+            stats[f] += v
+        last_activity = max(last_activity, created_at) if last_activity else created_at
+    answered_at = InterviewAnswer.objects.filter(session__user_id=user_id).aggregate(last=Max('created_at'))['last']
+    if answered_at and (last_activity is None or answered_at > last_activity):
+        last_activity = answered_at
+    stats['last_activity'] = last_activity
+    return stats
+
+
+def recompute(user_id):
+    """Store freshly computed stats for the user and return the row."""
+    row, _ = UserStats.objects.update_or_create(user_id=user_id, defaults=compute(user_id))
+    return row
+
+
+def get(user):
+    """The user's stats row, computed on first use."""
+    return UserStats.objects.filter(user=user).first() or recompute(user.pk)
+
+
+def session_created(session):
+    totals = session_totals(session.questions, session.answers, session.feedback)
+    changes = {f: F(f) + v for f, v in totals.items()}
+    if UserStats.objects.filter(user_id=session.user_id).update(last_activity=session.created_at, **changes):
+        return
+    # No row yet: compute it (this session included) rather than start from zero
+    try:
+        with transaction.atomic():
+            recompute(session.user_id)
+    except IntegrityError:
+        # Created concurrently, and that computation already saw this session
+        pass
+
+
+def session_changed(session):
+    """
+    A session was edited or deleted: recompute its user's row, if they have
+    one (an UPDATE only, so a row removed by a cascading user delete stays removed).
+    """
+    UserStats.objects.filter(user_id=session.user_id).update(**compute(session.user_id))
+
+
+def answer_created(answer):
+    UserStats.objects.filter(user__interviewsession=answer.session_id).update(last_activity=answer.created_at)
+
+
+def check(user_ids=None):
+    """
+    Compare stored rows with a fresh computation. Returns
+    [(user_id, field, stored, actual)] for every difference, including
+    users with sessions but no row.
+    """
+    if user_ids is None:
+        user_ids = set(InterviewSession.objects.values_list('user_id', flat=True).distinct())
+        user_ids |= set(UserStats.objects.values_list('user_id', flat=True))
+    stored = {row['user_id']: row for row in UserStats.objects.filter(user_id__in=user_ids).values('user_id', *FIELDS)}
+    problems = []
+    for user_id in sorted(user_ids):
+        actual = compute(user_id)
+        row = stored.get(user_id)
+        if row is None:
+            if actual['mock_interviews']:
+                problems.append((user_id, 'row', None, 'missing'))
+            continue
+        for f in FIELDS:
+            same = abs(row[f] - actual[f]) < 1e-6 if f == 'score_total' else row[f] == actual[f]
+            if not same:
+                problems.append((user_id, f, row[f], actual[f]))
+    return problems
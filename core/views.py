@@ -1,7 +1,8 @@
+import asyncio
 import io
 import json
 import random
-from django.http import JsonResponse, FileResponse
+from django.http import JsonResponse, FileResponse, StreamingHttpResponse
 from django.shortcuts import render, redirect
 from django.contrib import messages
 from django.contrib.auth import authenticate, login as auth_login, logout as auth_logout
@@ -12,10 +13,16 @@ from django.core.mail import send_mail
 from django.contrib.auth.hashers import make_password
 from reportlab.pdfgen import canvas
 from reportlab.lib.pagesizes import letter
-from textblob import TextBlob
 
 from .models import UserProfile, Resume, InterviewSession
-from ai_interview_coach.ai_llm import chat_with_model
+from . import chat_memory, daily_quiz, leaderboard, quiz_log, resume_ingest, user_stats
+from .question_pool import add_questions, take_questions, remember_questions, normalize_key
+from .question_index import curated_questions, questions_for_resume
+from .analysis_pool import get_analysis_pool
+from ai_interview_coach.ai_llm import (
+    chat_with_model, stream_chat_with_model, achat_with_model, astream_chat_with_model,
+    generate_question_batch, stream_question_batch,
+)
 
 # --------------------------
 # AUTH VIEWS
@@ -130,12 +137,15 @@ def profile(request):
     user_profile, _ = UserProfile.objects.get_or_create(user=user)
     user_resume = Resume.objects.filter(user=user).order_by('-uploaded_at').first()
 
-    # Stats for dashboard
-    stats = {'answered': 0, 'correct': 0, 'mock_interviews': 0}
-    sessions = InterviewSession.objects.filter(user=user)
-    stats['mock_interviews'] = sessions.count()
-    stats['answered'] = sum(len(s.questions) for s in sessions)
-    stats['correct'] = sum(len([a for a in s.answers if a and 'good' in a.lower()]) for s in sessions)
+    # Stats for dashboard, from the denormalized per-user row
+    row = user_stats.get(user)
+    stats = {
+        'answered': row.answered,
+        'correct': row.correct,
+        'mock_interviews': row.mock_interviews,
+        'average_score': row.average_score,
+        'last_activity': row.last_activity,
+    }
 
     if request.method == "POST":
         # Update only allowed fields
@@ -149,7 +159,7 @@ def profile(request):
         user_profile.save()
 
         if "resume" in request.FILES:
-            Resume.objects.create(user=user, file=request.FILES["resume"])
+            resume_ingest.create_resume(user, request.FILES["resume"])
 
         return redirect("profile")
 
@@ -161,6 +171,7 @@ def profile(request):
             "user_profile": user_profile,
             "user_resume": user_resume,
             "stats": stats,
+            "quiz_history": quiz_log.daily_history(user, days=7),
         },
     )
 
@@ -185,10 +196,34 @@ def chat(request):
 @login_required
 def start_chat(request):
     """Initialize chat session."""
-    request.session['chat_history'] = []
+    chat_memory.reset(request.session)
     return JsonResponse({"session_id": 1, "question": "Session started. Ask the first question!", "score": 0})
 
 
+def _stream_chat_response(request, ctx, user_msg, field="General", difficulty="Any", tag=""):
+    """
+    Relay the model reply as NDJSON lines: {"token": ...} per chunk, then
+    {"done": true, "reply": ..., "metrics": ...}, metrics being Ollama's
+    prompt/eval counts and timings. The turn is stored once the stream ends.
+    """
+    def events():
+        parts = []
+        metrics = {}
+        for token in stream_chat_with_model(ctx.prompt_history(), user_msg, field, difficulty, tag, metrics):
+            parts.append(token)
+            yield json.dumps({"token": token}) + "\n"
+
+        assistant_text = "".join(parts).strip()
+        chat_memory.record_turn(ctx, user_msg, assistant_text)
+
+        yield json.dumps({"done": True, "reply": assistant_text, "metrics": metrics}) + "\n"
+
+    response = StreamingHttpResponse(events(), content_type='application/x-ndjson')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
 @login_required
 @csrf_exempt
 def send_message(request):
@@ -196,90 +231,443 @@ def send_message(request):
     if request.method == 'POST':
         data = json.loads(request.body or "{}")
         user_msg = data.get('message', '').strip()
-        history = request.session.get('chat_history', [])
+        ctx = chat_memory.load(request)
+
+        if data.get('stream'):
+            return _stream_chat_response(request, ctx, user_msg)
 
         try:
-            assistant_msg = chat_with_model(history, user_msg)
+            metrics = {}
+            assistant_msg = chat_with_model(ctx.prompt_history(), user_msg, metrics=metrics)
         except Exception as e:
             return JsonResponse({"reply": "AI engine unavailable", "error": str(e)}, status=500)
 
-        history.append({"role": "user", "content": user_msg})
-        history.append({"role": "assistant", "content": assistant_msg})
-        request.session['chat_history'] = history[-40:]
-        request.session.modified = True
+        chat_memory.record_turn(ctx, user_msg, assistant_msg)
 
-        return JsonResponse({"reply": assistant_msg})
+        return JsonResponse({"reply": assistant_msg, "metrics": metrics})
     return JsonResponse({"error": "Invalid request"}, status=400)
 
 
+def _api_chat_params(request):
+    data = json.loads(request.body or "{}") if 'application/json' in (request.content_type or '') else request.POST
+    user_msg = data.get('message', '').strip() or "Start the interview. Ask the first question only."
+    field = data.get('field', 'General')
+    difficulty = data.get('difficulty', 'Any')
+    tag = data.get('tag', '')
+    return data, user_msg, field, difficulty, tag
+
+
 @csrf_exempt
 def api_chat(request):
     """Legacy API endpoint for chat (used in async JS)."""
     if request.method != 'POST':
         return JsonResponse({'reply': 'Invalid request.'}, status=400)
 
-    data = json.loads(request.body or "{}") if 'application/json' in (request.content_type or '') else request.POST
-    user_msg = data.get('message', '').strip() or "Start the interview. Ask the first question only."
-    field = data.get('field', 'General')
-    difficulty = data.get('difficulty', 'Any')
-    tag = data.get('tag', '')
+    data, user_msg, field, difficulty, tag = _api_chat_params(request)
 
     if user_msg == "RESET_SESSION":
-        request.session['chat_history'] = []
+        chat_memory.reset(request.session)
         return JsonResponse({'reply': "Session cleared. Click Send to begin again.", 'suggestion': "Select a field and start."})
 
-    history = request.session.get('chat_history', [])
+    ctx = chat_memory.load(request)
+    if data.get('stream'):
+        return _stream_chat_response(request, ctx, user_msg, field, difficulty, tag)
+
     try:
-        assistant_text = chat_with_model(history, user_msg, field, difficulty, tag)
+        metrics = {}
+        assistant_text = chat_with_model(ctx.prompt_history(), user_msg, field, difficulty, tag, metrics)
     except Exception as e:
         return JsonResponse({'reply': "Sorry, I couldn't reach the AI engine.", 'suggestion': "Check that Ollama is running and the model is pulled.", 'error': str(e)}, status=500)
 
-    history.append({"role": "user", "content": user_msg})
-    history.append({"role": "assistant", "content": assistant_text})
-    request.session['chat_history'] = history[-40:]
-    request.session.modified = True
+    chat_memory.record_turn(ctx, user_msg, assistant_text)
+
+    return JsonResponse({'reply': assistant_text, 'metrics': metrics})
+
+
+def _stream_turn_response(ctx, user_msg, feedback, field, difficulty, tag):
+    """
+    NDJSON like _stream_chat_response, plus one {"feedback": ...} line, sent
+    after the first token that finds the analysis finished (before "done" at
+    the latest).
+    """
+    def events():
+        parts = []
+        metrics = {}
+        pending = feedback
+        for token in stream_chat_with_model(ctx.prompt_history(), user_msg, field, difficulty, tag, metrics):
+            parts.append(token)
+            yield json.dumps({"token": token}) + "\n"
+            if pending is not None and pending.done():
+                yield json.dumps({"feedback": pending.result()}) + "\n"
+                pending = None
+        if pending is not None:
+            yield json.dumps({"feedback": pending.result()}) + "\n"
+
+        assistant_text = "".join(parts).strip()
+        chat_memory.record_turn(ctx, user_msg, assistant_text)
+
+        yield json.dumps({"done": True, "reply": assistant_text, "metrics": metrics}) + "\n"
+
+    response = StreamingHttpResponse(events(), content_type='application/x-ndjson')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+@csrf_exempt
+def api_turn(request):
+    """
+    One chat turn: the coach's reply and the feedback on the user's answer,
+    computed concurrently (the analysis runs in the pool while this thread
+    waits on Ollama), so the turn takes as long as the slower of the two
+    rather than their sum.
+    """
+    if request.method != 'POST':
+        return JsonResponse({'reply': 'Invalid request.'}, status=400)
+
+    data, user_msg, field, difficulty, tag = _api_chat_params(request)
+    answer = data.get('message', '').strip()
+
+    feedback = get_analysis_pool().start_analyze(answer) if answer else None
+    ctx = chat_memory.load(request)
+
+    if data.get('stream'):
+        return _stream_turn_response(ctx, user_msg, feedback, field, difficulty, tag)
+
+    metrics = {}
+    try:
+        assistant_text, error = chat_with_model(ctx.prompt_history(), user_msg, field, difficulty, tag, metrics), None
+    except Exception as e:
+        assistant_text, error = None, e
+    feedback_result = feedback.result() if feedback is not None else None
+    if error is not None:
+        return JsonResponse({'reply': "Sorry, I couldn't reach the AI engine.", 'suggestion': "Check that Ollama is running and the model is pulled.", 'feedback': feedback_result, 'error': str(error)}, status=500)
 
-    return JsonResponse({'reply': assistant_text})
+    chat_memory.record_turn(ctx, user_msg, assistant_text)
+
+    return JsonResponse({'reply': assistant_text, 'metrics': metrics, 'feedback': feedback_result})
+
+
+# --------------------------
+# AI CHAT (ASYNC / ASGI)
+# --------------------------
+# Same contract as the sync views above, but the model call is awaited on the
+# shared pooled client, so no worker thread is held while Ollama generates.
+# Mounted in place of the sync views when settings.ASYNC_CHAT_VIEWS is on.
+def _astream_chat_response(request, ctx, user_msg, field="General", difficulty="Any", tag=""):
+    """Async variant of _stream_chat_response."""
+    async def events():
+        parts = []
+        metrics = {}
+        async for token in astream_chat_with_model(ctx.prompt_history(), user_msg, field, difficulty, tag, metrics):
+            parts.append(token)
+            yield json.dumps({"token": token}) + "\n"
+
+        assistant_text = "".join(parts).strip()
+        await chat_memory.arecord_turn(ctx, user_msg, assistant_text)
+
+        yield json.dumps({"done": True, "reply": assistant_text, "metrics": metrics}) + "\n"
+
+    response = StreamingHttpResponse(events(), content_type='application/x-ndjson')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+@login_required
+@csrf_exempt
+async def send_message_async(request):
+    """Async variant of send_message."""
+    if request.method == 'POST':
+        data = json.loads(request.body or "{}")
+        user_msg = data.get('message', '').strip()
+        ctx = await chat_memory.aload(request)
+
+        if data.get('stream'):
+            return _astream_chat_response(request, ctx, user_msg)
+
+        try:
+            metrics = {}
+            assistant_msg = await achat_with_model(ctx.prompt_history(), user_msg, metrics=metrics)
+        except Exception as e:
+            return JsonResponse({"reply": "AI engine unavailable", "error": str(e)}, status=500)
+
+        await chat_memory.arecord_turn(ctx, user_msg, assistant_msg)
+
+        return JsonResponse({"reply": assistant_msg, "metrics": metrics})
+    return JsonResponse({"error": "Invalid request"}, status=400)
+
+
+@csrf_exempt
+async def api_chat_async(request):
+    """Async variant of api_chat."""
+    if request.method != 'POST':
+        return JsonResponse({'reply': 'Invalid request.'}, status=400)
+
+    data, user_msg, field, difficulty, tag = _api_chat_params(request)
+
+    if user_msg == "RESET_SESSION":
+        await chat_memory.areset(request.session)
+        return JsonResponse({'reply': "Session cleared. Click Send to begin again.", 'suggestion': "Select a field and start."})
+
+    ctx = await chat_memory.aload(request)
+    if data.get('stream'):
+        return _astream_chat_response(request, ctx, user_msg, field, difficulty, tag)
+
+    try:
+        metrics = {}
+        assistant_text = await achat_with_model(ctx.prompt_history(), user_msg, field, difficulty, tag, metrics)
+    except Exception as e:
+        return JsonResponse({'reply': "Sorry, I couldn't reach the AI engine.", 'suggestion': "Check that Ollama is running and the model is pulled.", 'error': str(e)}, status=500)
+
+    await chat_memory.arecord_turn(ctx, user_msg, assistant_text)
+
+    return JsonResponse({'reply': assistant_text, 'metrics': metrics})
+
+
+async def _with_feedback(tokens, feedback):
+    """
+    Relay ("token", text) from the model stream and ("feedback", result) as
+    soon as the analysis task finishes, whichever comes first.
+    """
+    stream = tokens.__aiter__()
+    next_token = asyncio.ensure_future(anext(stream))
+    try:
+        while True:
+            waiting = {next_token} if feedback is None else {next_token, feedback}
+            done, _ = await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
+            if feedback in done:
+                yield "feedback", feedback.result()
+                feedback = None
+            if next_token in done:
+                try:
+                    token = next_token.result()
+                except StopAsyncIteration:
+                    break
+                yield "token", token
+                next_token = asyncio.ensure_future(anext(stream))
+    finally:
+        next_token.cancel()
+    if feedback is not None:
+        yield "feedback", await feedback
+
+
+def _astream_turn_response(ctx, user_msg, feedback, field, difficulty, tag):
+    """
+    NDJSON like _astream_chat_response, plus one {"feedback": ...} line sent
+    as soon as the answer analysis is ready (before "done" at the latest).
+    """
+    async def events():
+        parts = []
+        metrics = {}
+        tokens = astream_chat_with_model(ctx.prompt_history(), user_msg, field, difficulty, tag, metrics)
+        async for kind, value in _with_feedback(tokens, feedback):
+            if kind == "token":
+                parts.append(value)
+            yield json.dumps({kind: value}) + "\n"
+
+        assistant_text = "".join(parts).strip()
+        await chat_memory.arecord_turn(ctx, user_msg, assistant_text)
+
+        yield json.dumps({"done": True, "reply": assistant_text, "metrics": metrics}) + "\n"
+
+    response = StreamingHttpResponse(events(), content_type='application/x-ndjson')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+@csrf_exempt
+async def api_turn_async(request):
+    """Async variant of api_turn."""
+    if request.method != 'POST':
+        return JsonResponse({'reply': 'Invalid request.'}, status=400)
+
+    data, user_msg, field, difficulty, tag = _api_chat_params(request)
+    answer = data.get('message', '').strip()
+
+    # Start the analysis first; it runs in the pool while the history loads
+    feedback = asyncio.ensure_future(get_analysis_pool().aanalyze(answer)) if answer else None
+    ctx = await chat_memory.aload(request)
+
+    if data.get('stream'):
+        return _astream_turn_response(ctx, user_msg, feedback, field, difficulty, tag)
+
+    metrics = {}
+    reply = asyncio.ensure_future(achat_with_model(ctx.prompt_history(), user_msg, field, difficulty, tag, metrics))
+    feedback_result = await feedback if feedback is not None else None
+    try:
+        assistant_text = await reply
+    except Exception as e:
+        return JsonResponse({'reply': "Sorry, I couldn't reach the AI engine.", 'suggestion': "Check that Ollama is running and the model is pulled.", 'feedback': feedback_result, 'error': str(e)}, status=500)
+
+    await chat_memory.arecord_turn(ctx, user_msg, assistant_text)
+
+    return JsonResponse({'reply': assistant_text, 'metrics': metrics, 'feedback': feedback_result})
+
+
+# --------------------------
+# MOCK INTERVIEW
+# --------------------------
+@login_required
+@csrf_exempt
+def api_mock_start(request):
+    """Return all questions for a mock interview at once, from the question pool."""
+    if request.method != 'POST':
+        return JsonResponse({'error': 'Invalid request'}, status=400)
+
+    data = json.loads(request.body or "{}")
+    try:
+        count = max(1, min(int(data.get('count', 5)), 20))
+    except (TypeError, ValueError):
+        return JsonResponse({'error': 'count must be a number'}, status=400)
+
+    questions = take_questions(request.user, data.get('field'), data.get('difficulty'), data.get('tag'), count)
+    return JsonResponse({'questions': questions})
+
+
+@login_required
+@csrf_exempt
+def api_mock_questions(request):
+    """
+    Generate N mock interview questions in one structured-output LLM call.
+    With "stream": true, questions are sent as NDJSON lines ({"index", "question"})
+    as soon as each one is complete, then {"done": true, "questions": [...]}.
+    """
+    if request.method != 'POST':
+        return JsonResponse({'error': 'Invalid request'}, status=400)
+
+    data = json.loads(request.body or "{}")
+    try:
+        count = max(1, min(int(data.get('count', 5)), 20))
+    except (TypeError, ValueError):
+        return JsonResponse({'error': 'count must be a number'}, status=400)
+    field, difficulty, tag = normalize_key(data.get('field'), data.get('difficulty'), data.get('tag'))
+    user = request.user
+
+    if not data.get('stream'):
+        questions = generate_question_batch(field, difficulty, tag, count)
+        if not questions:
+            return JsonResponse({'questions': [], 'error': "Couldn't generate questions."}, status=502)
+        remember_questions(user, field, difficulty, tag, questions)
+        return JsonResponse({'questions': questions})
+
+    def events():
+        questions = []
+        for question in stream_question_batch(field, difficulty, tag, count):
+            yield json.dumps({"index": len(questions), "question": question}) + "\n"
+            questions.append(question)
+        if questions:
+            remember_questions(user, field, difficulty, tag, questions)
+        yield json.dumps({"done": True, "questions": questions}) + "\n"
+
+    response = StreamingHttpResponse(events(), content_type='application/x-ndjson')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+@login_required
+@csrf_exempt
+async def api_mock_feedback(request):
+    """
+    Score a finished mock interview in one call. Takes
+    {"field", "items": [{"question", "answer"}, ...]}, analyzes all answers in
+    one pass in the analysis pool, saves the session with its feedback and
+    returns {"session_id", "answers": [...], "aggregate": {...}}.
+    """
+    if request.method != 'POST':
+        return JsonResponse({'error': 'Invalid request'}, status=400)
+
+    data = json.loads(request.body or "{}")
+    items = data.get('items')
+    if (not isinstance(items, list) or not items or len(items) > 50
+            or not all(isinstance(item, dict) and isinstance(item.get('question', ''), str)
+                       and isinstance(item.get('answer', ''), str) for item in items)):
+        return JsonResponse({'error': 'items must be a list of 1-50 {question, answer} objects with string values'},
+                            status=400)
+    questions = [item.get('question', '') for item in items]
+    answers = [item.get('answer', '') for item in items]
+
+    result = await get_analysis_pool().aanalyze_batch(answers)
+    session = await InterviewSession.objects.acreate(
+        user=await request.auser(),
+        field=str(data.get('field') or 'General')[:100],
+        questions=questions,
+        answers=answers,
+        feedback=result,
+    )
+    return JsonResponse({'session_id': session.id, **result})
 
 
 # --------------------------
 # FEEDBACK
 # --------------------------
 @csrf_exempt
-def api_feedback(request):
+async def api_feedback(request):
+    """Sentiment and spelling feedback, computed in the analysis process pool."""
     if request.method == 'POST':
         data = json.loads(request.body) if request.content_type == 'application/json' else request.POST
         answer = data.get('answer', '')
         if not answer:
             return JsonResponse({'feedback': 'No answer provided.'}, status=400)
 
-        blob = TextBlob(answer)
-        sentiment = blob.sentiment.polarity
-        grammar_errors = [str(c) for c in blob.correct().split() if c not in answer.split()]
-
-        feedback = []
-        if sentiment > 0.2:
-            feedback.append('Your answer sounds positive.')
-        elif sentiment < -0.2:
-            feedback.append('Your answer sounds negative. Try to be more positive.')
-        else:
-            feedback.append('Your answer is neutral.')
-        feedback.append('Possible grammar/spelling issues detected.' if grammar_errors else 'No major grammar issues detected.')
-
-        return JsonResponse({'feedback': ' '.join(feedback)})
+        return JsonResponse(await get_analysis_pool().aanalyze(answer))
     return JsonResponse({'feedback': 'Invalid request.'}, status=400)
 
 
 # --------------------------
 # RESUME QUESTION GENERATOR
 # --------------------------
+def _technical_questions(resume, field, count=3):
+    """
+    Technical questions for a parsed resume: the best matches from the
+    question index, topped up by one LLM batch (kept in the pool, so the
+    index has them next time) and then the curated list for the field.
+    """
+    questions = questions_for_resume(resume, field, k=count)
+    if len(questions) < count:
+        skills = [s for s in resume.skills.split(", ") if s]
+        key = normalize_key(field, "Any", skills[0] if skills else "")
+        generated = generate_question_batch(*key, count=count - len(questions))
+        add_questions(*key, generated)
+        questions += [q for q in generated if q not in questions]
+    questions += [q for q in curated_questions(field) if q not in questions]
+    return questions[:count]
+
+
 @csrf_exempt
 def generate_resume_questions(request):
-    if request.method != "POST" or "resume" not in request.FILES:
+    """
+    Questions for a resume, built from its stored ingestion results (skills
+    and projects) rather than by re-parsing the file. Uses `resume_id`, or
+    the user's latest resume; a newly uploaded file is queued for ingestion
+    and gets the generic questions until it is ready.
+    """
+    if request.method != "POST":
         return JsonResponse({"error": "Upload a resume via POST"}, status=400)
 
-    file = request.FILES["resume"]
     field = request.POST.get("field", "General")
+    resume = None
+    if request.user.is_authenticated:
+        if "resume" in request.FILES:
+            resume = resume_ingest.create_resume(request.user, request.FILES["resume"])
+        else:
+            resumes = Resume.objects.filter(user=request.user).order_by('-uploaded_at')
+            if request.POST.get("resume_id"):
+                try:
+                    resumes = resumes.filter(pk=int(request.POST["resume_id"]))
+                except (TypeError, ValueError):
+                    return JsonResponse({"error": "resume_id must be a number"}, status=400)
+            resume = resumes.first()
+    if resume is None and "resume" not in request.FILES:
+        return JsonResponse({"error": "Upload a resume via POST"}, status=400)
+    ready = resume is not None and resume.status == Resume.READY
+
+    # Same file and field as an earlier request: reuse its questions
+    questions = resume_ingest.cached_questions(resume, field) if ready else None
+    if questions is not None:
+        return JsonResponse({"field": field, "questions": questions, "resume_id": resume.pk, "status": resume.status})
 
     hr = [
         "Tell me about yourself.",
@@ -287,26 +675,26 @@ def generate_resume_questions(request):
         "Why should we hire you?",
     ]
 
-    technical_map = {
-        "Software": ["What is Django ORM?", "Explain REST API.", "How do you manage version control with Git?"],
-        "Data Science": ["What is supervised vs unsupervised learning?", "How do you handle missing data?", "Explain overfitting and how to prevent it."],
-        "Marketing": ["What is digital marketing?", "Explain SEO vs SEM.", "How do you measure campaign performance?"],
-        "Finance": ["Explain NPV and IRR.", "What is ROI?", "How do you evaluate financial statements?"],
-        "HR": ["How do you handle workplace conflict?", "Explain the recruitment process.", "How do you motivate employees?"],
-        "Sales": ["What is the sales funnel?", "How do you handle client objections?", "Explain your biggest sales achievement."],
-        "Design": ["What is the difference between UI and UX?", "Explain design thinking.", "How do you test usability?"],
-        "Teaching": ["What is your teaching philosophy?", "How do you engage students?", "How do you adapt to different learning styles?"],
-        "General": ["Explain problem-solving skills.", "How do you work in a team?", "What motivates you?"],
-    }
-    technical = technical_map.get(field, technical_map["General"])
+    technical = curated_questions(field)[:3]
+    project_name = f"{field} project"
+    if ready:
+        technical = _technical_questions(resume, field)
+        first_project = next((ln.strip(" -*\u2022") for ln in resume.sections.get("projects", "").splitlines() if ln.strip(" -*\u2022")), "")
+        if first_project:
+            project_name = f'project "{first_project[:80]}"'
 
     project = [
-        f"Explain your {field} project mentioned in your resume.",
-        f"What challenges did you face in your {field} project?",
-        f"If given more time, how would you improve your {field} project?",
+        f"Explain your {project_name} mentioned in your resume.",
+        f"What challenges did you face in your {project_name}?",
+        f"If given more time, how would you improve your {project_name}?",
     ]
 
-    return JsonResponse({"field": field, "questions": {"hr": hr, "technical": technical, "project": project}})
+    data = {"field": field, "questions": {"hr": hr, "technical": technical, "project": project}}
+    if ready:
+        resume_ingest.store_questions(resume, field, data["questions"])
+    if resume is not None:
+        data.update(resume_id=resume.pk, status=resume.status)
+    return JsonResponse(data)
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.contrib.auth.decorators import login_required
@@ -319,9 +707,24 @@ def api_upload_resume(request):
         return JsonResponse({'success': False, 'error': 'No resume uploaded.'}, status=400)
 
     resume_file = request.FILES['resume']
-    Resume.objects.create(user=request.user, file=resume_file)
+    resume = resume_ingest.create_resume(request.user, resume_file)
 
-    return JsonResponse({'success': True, 'message': 'Resume uploaded successfully.'})
+    return JsonResponse({
+        'success': True,
+        'message': 'Resume uploaded successfully.',
+        'resume_id': resume.pk,
+        'status': resume.status,
+        'status_url': f'/api/resume/{resume.pk}/status/',
+    }, status=202)
+
+
+@login_required
+def api_resume_status(request, resume_id):
+    """Poll a resume's ingestion; includes sections, skills and summary once ready."""
+    resume = Resume.objects.filter(pk=resume_id, user=request.user).first()
+    if resume is None:
+        return JsonResponse({'error': 'Resume not found.'}, status=404)
+    return JsonResponse(resume_ingest.status_payload(resume))
 from django.http import JsonResponse
 from django.contrib.auth.decorators import login_required
 from django.views.decorators.csrf import csrf_exempt
@@ -399,43 +802,15 @@ def daily_mission(request):
     correct_ids = []  # Keep track of correct questions for optional highlight
 
     if request.method == "POST":
-        score = 0
-        for q_id, answer in request.POST.items():
-            if q_id == "csrfmiddlewaretoken":
-                continue
-            try:
-                q = QuizQuestion.objects.get(id=int(q_id))
-                # Check answer
-                if answer == q.correct_answer:
-                    score += 1
-                    correct_ids.append(q.id)
-                # Mark question as attempted
-                mission.attempted_questions.add(q)
-            except QuizQuestion.DoesNotExist:
-                continue
-
-        # Update points (10 points per correct answer)
-        mission.total_points += score * 10
-        mission.score = score
-
-        # Update streak
-        if mission.last_attempt and (now().date() - mission.last_attempt.date()).days == 1:
-            mission.streak += 1
-        else:
-            mission.streak = 1
-
-        # Update last_attempt timestamp
-        mission.last_attempt = now()
-        mission.save()
+        graded = daily_quiz.grade(mission, request.POST)
+        if graded is None:
+            return redirect('daily_mission')  # already submitted
+        score, correct_ids = graded
+        # Reload the points and streak computed by the database
+        mission.refresh_from_db(fields=["score", "total_points", "streak", "last_attempt"])
 
-    # Get 5 random questions excluding already attempted ones
-    attempted_qs = mission.attempted_questions.all()
-    questions = QuizQuestion.objects.exclude(id__in=attempted_qs).order_by("?")[:5]
-
-    # If less than 5 questions left and user hasn't submitted yet, reset attempted questions
-    if questions.count() < 5 and score is None:
-        mission.attempted_questions.clear()
-        questions = QuizQuestion.objects.order_by("?")[:5]
+    # Next 5 questions of the user's shuffled pass through the bank (only shown before submitting)
+    questions = daily_quiz.questions_for(mission) if score is None else []
 
     return render(request, "daily_mission.html", {
         "questions": questions,
@@ -447,9 +822,20 @@ def daily_mission(request):
 
 @login_required
 def scoreboard(request):
-    # Top 10 users sorted by total points
-    scores = UserDailyMission.objects.order_by("-total_points", "last_attempt")[:10]
-    return render(request, "scoreboard.html", {"scores": scores})
+    # All time: top 10 from the materialized leaderboard, only queried when the cached table has expired.
+    # This week / this month: read from the attempt rollups.
+    period = request.GET.get("period", "all")
+    period_scores = {"week": quiz_log.weekly_top, "month": quiz_log.monthly_top}.get(period)
+    entry, nearby, players = leaderboard.around(request.user)
+    return render(request, "scoreboard.html", {
+        "period": period if period_scores else "all",
+        "period_scores": period_scores() if period_scores else None,
+        "scores": leaderboard.top(),
+        "cache_seconds": leaderboard.cache_seconds(),
+        "my_entry": entry,
+        "nearby": nearby,
+        "players": players,
+    })
 
 def faq(request):
     return render(request, 'faq.html')
@@ -21,6 +21,8 @@ document.addEventListener('DOMContentLoaded', function() {
     let mockCurrent = 0;
     let mockTimer = null;
     let mockTimeLeft = 0;
+    let mockStreaming = false;   // questions still arriving from /api/mock/questions/
+    let mockWaitingFor = null;   // index of a question the user is waiting on
 
     const MOCK_QUESTION_COUNT = 5;
     const MOCK_TIME_PER_Q = 60;
@@ -77,6 +79,7 @@ document.addEventListener('DOMContentLoaded', function() {
         chatLog.scrollTop = chatLog.scrollHeight;
         if (sender === 'coach') speakText(text);
         saveChatHistory();
+        return msg;
     }
 
     function addSuggestion(suggestion, afterElem = null) {
@@ -88,6 +91,74 @@ document.addEventListener('DOMContentLoaded', function() {
         chatLog.scrollTop = chatLog.scrollHeight;
     }
 
+    // Read an NDJSON response body, calling onEvent for every parsed line.
+    function readNdjson(res, onEvent) {
+        const reader = res.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+
+        function handleLine(line) {
+            if (line.trim()) onEvent(JSON.parse(line));
+        }
+
+        function read() {
+            return reader.read().then(({ done, value }) => {
+                if (done) {
+                    handleLine(buffer);
+                    return;
+                }
+                buffer += decoder.decode(value, { stream: true });
+                const lines = buffer.split('\n');
+                buffer = lines.pop();
+                lines.forEach(handleLine);
+                return read();
+            });
+        }
+        return read();
+    }
+
+    // Stream a coach reply from /api/chat/ (NDJSON: {"token"} ... {"done", "reply"})
+    // into a new chat bubble. Resolves with { reply } once the stream ends.
+    // With onFeedback, the turn goes to /api/turn/ instead, which also sends a
+    // {"feedback"} event on the same stream as soon as the answer is analyzed;
+    // onFeedback(feedback, replyElem) gets the reply bubble still being filled.
+    function streamChat(payload, onFeedback = null) {
+        const msg = document.createElement('div');
+        msg.className = 'chat-message coach';
+        msg.innerHTML = '<b>Coach:</b> ';
+        const body = document.createElement('span');
+        msg.appendChild(body);
+        chatLog.appendChild(msg);
+
+        let reply = '';
+
+        return fetch(onFeedback ? '/api/turn/' : '/api/chat/', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify(Object.assign({}, payload, { stream: true }))
+        })
+        .then(res => readNdjson(res, evt => {
+            if (evt.feedback && onFeedback) onFeedback(evt.feedback, msg);
+            if (evt.token) {
+                reply += evt.token;
+                body.textContent = reply;
+                chatLog.scrollTop = chatLog.scrollHeight;
+            }
+            if (evt.done) reply = evt.reply;
+        }))
+        .then(() => {
+            msg.innerHTML = `<b>Coach:</b> ${reply}`;
+            chatLog.scrollTop = chatLog.scrollHeight;
+            speakText(reply);
+            saveChatHistory();
+            return { reply };
+        })
+        .catch(err => {
+            msg.remove();
+            throw err;
+        });
+    }
+
     function speakText(text) {
         if ('speechSynthesis' in window) {
             const utterance = new SpeechSynthesisUtterance(text);
@@ -147,6 +218,13 @@ document.addEventListener('DOMContentLoaded', function() {
         fetch('/api/upload_resume/', { method: 'POST', body: formData })
             .then(res => res.json())
             .then(data => {
+                if (!data.status_url) throw new Error(data.error || 'Upload failed');
+                addMessage('coach', 'Analyzing your resume...');
+                return pollResumeStatus(data.status_url);
+            })
+            .then(data => {
+                if (data.status === 'failed') addMessage('coach', `Could not read your resume: ${data.error}`);
+
                 // 1. Show the analysis panel
                 showResumeAnalysisPanel(data);
 
@@ -155,7 +233,9 @@ document.addEventListener('DOMContentLoaded', function() {
                     method: 'POST',
                     headers: { 'Content-Type': 'application/json' },
                     body: JSON.stringify({
-                        message: `Ask me an interview question based on this resume.`,
+                        message: data.summary
+                            ? `Ask me an interview question based on this resume.\n\n${data.summary}`
+                            : `Ask me an interview question based on this resume.`,
                         resume_context: data,   // pass parsed resume data (optional)
                         field: field,
                         difficulty: selectedDifficulty || ''
@@ -173,6 +253,17 @@ document.addEventListener('DOMContentLoaded', function() {
             .catch(() => addMessage('coach', 'Resume upload or analysis failed.'));
     });
 
+    // The server parses the resume in the background; poll until it is done.
+    function pollResumeStatus(url, attempts = 60) {
+        return fetch(url)
+            .then(res => res.json())
+            .then(data => {
+                if (data.status === 'ready' || data.status === 'failed' || attempts <= 1) return data;
+                return new Promise(resolve => setTimeout(resolve, 1000))
+                    .then(() => pollResumeStatus(url, attempts - 1));
+            });
+    }
+
     function showResumeAnalysisPanel(data) {
         let oldPanel = document.getElementById('resume-analysis-panel');
         if (oldPanel) oldPanel.remove();
@@ -218,20 +309,15 @@ document.addEventListener('DOMContentLoaded', function() {
         const answeredCountElem = document.getElementById('answered-count');
         if (answeredCountElem) answeredCountElem.textContent = answeredCount;
 
-        fetch('/api/chat/', {
-            method: 'POST',
-            headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify({
-                message: text,
-                field: field,
-                difficulty: selectedDifficulty || '',
-                tag: document.getElementById('tag')?.value || ''
-            })
-        })
-        .then(res => res.json())
+        // Reply and feedback come back on one stream, computed concurrently
+        streamChat({
+            message: text,
+            field: field,
+            difficulty: selectedDifficulty || '',
+            tag: document.getElementById('tag')?.value || ''
+        }, showAnswerFeedback)
         .then(data => {
-            if (data.reply) addMessage('coach', data.reply, data.suggestion);
-            else if (data.suggestion) addSuggestion(data.suggestion);
+            if (data.suggestion) addSuggestion(data.suggestion);
 
             // Check suggestion for positive keywords
             if (data.suggestion && /(positive|well|good|correct|excellent|great)/i.test(data.suggestion)) {
@@ -242,38 +328,32 @@ document.addEventListener('DOMContentLoaded', function() {
                 const scoreElem = document.getElementById('score-count');
                 if (scoreElem) scoreElem.textContent = score + ' / 10';
             }
-
-            // Fetch AI feedback
-            return fetch('/api/feedback/', {
-                method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify({ answer: text })
-            });
-        })
-        .then(res => res.json())
-        .then(fb => {
-            if (fb.feedback) {
-                addMessage('coach', '[AI Feedback] ' + fb.feedback);
-
-                // Check feedback for positive keywords
-                if (/(positive|well|good|correct|excellent|great)/i.test(fb.feedback)) {
-                    correctCount++;
-                    score = correctCount;
-
-                    const correctCountElem = document.getElementById('correct-count');
-                    if (correctCountElem) correctCountElem.textContent = correctCount;
-                    const scoreElem = document.getElementById('score-count');
-                    if (scoreElem) scoreElem.textContent = score + ' / 10';
-
-                    // Highlight last user message as correct
-                    const lastUserMsg = Array.from(chatLog.querySelectorAll('.chat-message.user')).pop();
-                    if (lastUserMsg) lastUserMsg.classList.add('correct');
-                }
-            }
         })
         .catch(() => addMessage('coach', 'Error contacting AI coach.'));
     }
 
+    function showAnswerFeedback(fb, replyElem = null) {
+        if (!fb.feedback) return;
+        const msg = addMessage('coach', '[AI Feedback] ' + fb.feedback);
+        // The feedback is on the user's answer: keep it above the reply that is still streaming in
+        if (msg && replyElem) chatLog.insertBefore(msg, replyElem);
+
+        // Check feedback for positive keywords
+        if (/(positive|well|good|correct|excellent|great)/i.test(fb.feedback)) {
+            correctCount++;
+            score = correctCount;
+
+            const correctCountElem = document.getElementById('correct-count');
+            if (correctCountElem) correctCountElem.textContent = correctCount;
+            const scoreElem = document.getElementById('score-count');
+            if (scoreElem) scoreElem.textContent = score + ' / 10';
+
+            // Highlight last user message as correct
+            const lastUserMsg = Array.from(chatLog.querySelectorAll('.chat-message.user')).pop();
+            if (lastUserMsg) lastUserMsg.classList.add('correct');
+        }
+    }
+
     sendBtn.addEventListener('click', sendMessage);
     userInput.addEventListener('keypress', e => { if (e.key === 'Enter') sendMessage(); });
 
@@ -301,7 +381,67 @@ document.addEventListener('DOMContentLoaded', function() {
         userInput.disabled = false;
 
         document.getElementById("mock-timer").textContent = "";
-        fetchMockQuestion("");
+
+        // All questions in one request from the server-side pool; if that comes
+        // back short, generate the rest in one streamed batch.
+        fetch("/api/mock/start/", {
+            method: "POST",
+            headers: { "Content-Type": "application/json" },
+            body: JSON.stringify({
+                field,
+                difficulty: selectedDifficulty || '',
+                tag: document.getElementById('tag')?.value || '',
+                count: MOCK_QUESTION_COUNT
+            })
+        })
+        .then(res => res.json())
+        .then(data => {
+            mockQuestions = data.questions || [];
+            if (mockQuestions.length) showMockQuestion(0);
+            else mockWaitingFor = 0;
+            if (mockQuestions.length < MOCK_QUESTION_COUNT) {
+                streamMockQuestions(MOCK_QUESTION_COUNT - mockQuestions.length);
+            }
+        })
+        .catch(() => {
+            mockWaitingFor = 0;
+            streamMockQuestions(MOCK_QUESTION_COUNT);
+        });
+    }
+
+    // Generate `count` questions in one LLM call; each is added as soon as it
+    // is complete, so the interview can start before the rest are ready.
+    function streamMockQuestions(count) {
+        mockStreaming = true;
+        fetch("/api/mock/questions/", {
+            method: "POST",
+            headers: { "Content-Type": "application/json" },
+            body: JSON.stringify({
+                field,
+                difficulty: selectedDifficulty || '',
+                tag: document.getElementById('tag')?.value || '',
+                count,
+                stream: true
+            })
+        })
+        .then(res => readNdjson(res, evt => {
+            if (!evt.question) return;
+            mockQuestions.push(evt.question);
+            if (mockWaitingFor !== null && mockWaitingFor < mockQuestions.length) {
+                const idx = mockWaitingFor;
+                mockWaitingFor = null;
+                showMockQuestion(idx);
+            }
+        }))
+        .catch(() => {})
+        .then(() => {
+            mockStreaming = false;
+            if (mockWaitingFor === null) return;
+            mockWaitingFor = null;
+            // Nothing came through at all: ask the coach one question at a time
+            if (!mockQuestions.length) fetchMockQuestion("");
+            else endMockInterview();
+        });
     }
 
     function fetchMockQuestion(msg) {
@@ -328,6 +468,11 @@ document.addEventListener('DOMContentLoaded', function() {
 
     function showMockQuestion(idx) {
         if (idx >= mockQuestions.length) {
+            if (mockStreaming) {
+                mockWaitingFor = idx;
+                addMessage("coach", "Preparing the next question...");
+                return;
+            }
             endMockInterview();
             return;
         }
@@ -357,21 +502,12 @@ document.addEventListener('DOMContentLoaded', function() {
         if (timerElem) timerElem.textContent = mockMode ? `Time left: ${mockTimeLeft}s` : "";
     }
 
+    // Answers are scored all at once in endMockInterview
     function submitMockAnswer(answer) {
         if (mockTimer) clearInterval(mockTimer);
         mockAnswers.push(answer);
         mockCurrent++;
-
-        fetch("/api/feedback/", {
-            method: "POST",
-            headers: { "Content-Type": "application/json" },
-            body: JSON.stringify({ answer })
-        })
-        .then(res => res.json())
-        .then(fb => {
-            if (fb.feedback) addMessage("coach", "[AI Feedback] " + fb.feedback);
-            setTimeout(() => showMockQuestion(mockCurrent), 1500);
-        });
+        showMockQuestion(mockCurrent);
     }
 
     function endMockInterview() {
@@ -383,9 +519,29 @@ document.addEventListener('DOMContentLoaded', function() {
         const timerElem = document.getElementById("mock-timer");
         if (timerElem) timerElem.textContent = "Mock interview complete!";
 
+        addMessage("coach", "Scoring your answers...");
+        const items = mockQuestions.map((question, i) => ({ question, answer: mockAnswers[i] || "" }));
+        fetch("/api/mock/feedback/", {
+            method: "POST",
+            headers: { "Content-Type": "application/json" },
+            body: JSON.stringify({ field, items })
+        })
+        .then(res => res.ok ? res.json() : null)
+        .then(result => showMockSummary(result))
+        .catch(() => showMockSummary(null));
+    }
+
+    function showMockSummary(result) {
+        const scored = result && result.answers ? result.answers : [];
         let summary = "<b>Mock Interview Summary:</b><br>";
+        if (result && result.aggregate) {
+            const agg = result.aggregate;
+            summary += `<b>Overall score:</b> ${agg.score}/10 (${agg.answered}/${agg.questions} answered)<br><br>`;
+        }
         for (let i = 0; i < mockQuestions.length; i++) {
-            summary += `<b>Q${i+1}:</b> ${mockQuestions[i]}<br><b>Your answer:</b> ${mockAnswers[i] || ""}<br><br>`;
+            summary += `<b>Q${i+1}:</b> ${mockQuestions[i]}<br><b>Your answer:</b> ${mockAnswers[i] || ""}<br>`;
+            if (scored[i]) summary += `<b>Score:</b> ${scored[i].score}/10 - ${scored[i].feedback}<br>`;
+            summary += "<br>";
         }
         addMessage("coach", summary);
     }